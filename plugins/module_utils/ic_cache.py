@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+import hashlib
+import json
+import os
+import time
+from ibmcloud_python_sdk.config import params
+
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".ansible", "ibmcloud_cache")
+
+
+def _account():
+    # Results depend on the credentials and the region in use, the API key
+    # only ends up hashed in the file name
+    cfg = params() or {}
+    return [cfg.get("key"), cfg.get("region")]
+
+
+def _cache_path(namespace, key):
+    name = hashlib.sha1(json.dumps([_account(), key], sort_keys=True).encode(
+        "utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, namespace, "{}.json".format(name))
+
+
+def _serialize(value):
+    # Same representation as the module result, hits and misses must match
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def cached(namespace, key, ttl, func):
+    """Return the result of an API call, from the cache if fresh enough
+
+    Results are kept as JSON files on the host running the module, usually
+    the controller, so they are shared by every task and playbook run.
+    Entries are specific to the API key and the region. Errors are never
+    cached.
+
+    :param namespace: Cache directory name, usually the module name
+    :type namespace: str
+    :param key: Arguments identifying the call, must be JSON serializable
+    :type key: object
+    :param ttl: Maximum age in seconds of a cached result, 0 disables the
+        cache
+    :type ttl: int
+    :param func: Function performing the call
+    :type func: function
+    :return: Call result and whether it came from the cache
+    :rtype: tuple
+    """
+    path = _cache_path(namespace, key)
+
+    if ttl > 0:
+        try:
+            with open(path) as stream:
+                entry = json.load(stream)
+            if time.time() - entry["time"] < ttl:
+                return entry["data"], True
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            pass
+
+    data = func()
+    if ttl > 0 and "errors" not in data:
+        try:
+            directory = os.path.dirname(path)
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+
+            tmp = "{}.{}.tmp".format(path, os.getpid())
+            with open(tmp, "w") as stream:
+                json.dump({"time": time.time(), "data": data}, stream,
+                          default=_serialize)
+            os.replace(tmp, path)
+        except (IOError, OSError, TypeError, ValueError):
+            pass
+
+    return data, False
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+from ibmcloud_python_sdk.config import params
+from ibmcloud_python_sdk.auth import get_headers as headers
+from ibmcloud_python_sdk.utils.common import query_wrapper as qw
+from ibmcloud_python_sdk.utils.common import resource_deleted
+
+
+class RateLimiter():
+    """Shared limiter spacing API calls issued by concurrent workers
+
+    :param rate: Maximum number of calls per second, 0 disables the limit
+    :type rate: float
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+
+    def acquire(self):
+        """Block until the caller is allowed to issue the next call"""
+        if not self.interval:
+            return
+
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def run_parallel(func, items, workers=10, limiter=None):
+    """Call a function over a list of items with bounded concurrency
+
+    Exceptions raised by the function are returned as SDK-style errors
+    so one failing item doesn't abort the others.
+
+    :param func: Function called with one item
+    :type func: function
+    :param items: Items to process
+    :type items: list
+    :param workers: Maximum number of concurrent calls
+    :type workers: int
+    :param limiter: Rate limiter shared by all the calls
+    :type limiter: RateLimiter, optional
+    :return: List of results, in the same order as items
+    :rtype: list
+    """
+    def _call(item):
+        if limiter:
+            limiter.acquire()
+        try:
+            return func(item)
+        except Exception as error:
+            return {"errors": [{"code": "exception",
+                                "message": str(error)}]}
+
+    if not items:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        return list(executor.map(_call, items))
+
+
+def memoize_lookup(func, known=None):
+    """Wrap an SDK lookup so every reference is resolved only once
+
+    Only successful lookups are cached, errors are always returned
+    as-is so they can be reported.
+
+    :param func: SDK lookup method such as get_vpc or get_image
+    :type func: function
+    :param known: Pre-populated cache, keyed by name or ID
+    :type known: dict, optional
+    :return: Thread-safe memoized function
+    :rtype: function
+    """
+    cache = dict(known or {})
+    lock = threading.Lock()
+
+    def wrapper(*args):
+        key = args if len(args) > 1 else args[0]
+        with lock:
+            if key in cache:
+                return cache[key]
+
+        result = func(*args)
+        if isinstance(result, dict) and "errors" not in result:
+            with lock:
+                cache[key] = result
+
+        return result
+
+    return wrapper
+
+
+def list_resources(resource, key=None, limit=100):
+    """Retrieve every item of a VPC collection, following pagination
+
+    :param resource: Collection path such as instances or
+        security_groups/<id>/network_interfaces
+    :type resource: str
+    :param key: Key holding the items in the response, defaults to the
+        collection path
+    :type key: str, optional
+    :param limit: Page size
+    :type limit: int
+    :return: Dict with the key and all the items as value
+    :rtype: dict
+    """
+    key = key or resource
+    cfg = params()
+    items = []
+    start = None
+
+    while True:
+        path = ("/v1/{}?version={}&generation={}&limit={}".format(
+            resource, cfg["version"], cfg["generation"], limit))
+        if start:
+            path = "{}&start={}".format(path, start)
+
+        data = qw("iaas", "GET", path, headers())["data"]
+        if "errors" in data:
+            return data
+
+        items.extend(data.get(key, []))
+
+        start = None
+        if data.get("next"):
+            query = parse_qs(urlparse(data["next"]["href"]).query)
+            start = query.get("start", [None])[0]
+        if not start:
+            return {key: items}
+
+
+def delete_resource(resource):
+    """Delete a VPC resource
+
+    :param resource: Resource path such as instances/<id>
+    :type resource: str
+    :return: Delete status
+    :rtype: dict
+    """
+    cfg = params()
+    path = ("/v1/{}?version={}&generation={}".format(
+        resource, cfg["version"], cfg["generation"]))
+
+    data = qw("iaas", "DELETE", path, headers())
+    if data["response"].status not in [202, 204]:
+        return data["data"]
+
+    return resource_deleted()
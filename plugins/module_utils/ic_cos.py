@@ -0,0 +1,827 @@
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import run_parallel
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import backoff_delays
+import ibm_boto3
+from botocore.client import Config
+from ibmcloud_python_sdk.config import params
+from ibmcloud_python_sdk.utils.common import resource_created
+from ibmcloud_python_sdk.utils.common import resource_error
+from ibmcloud_python_sdk.utils.common import resource_not_found
+from ibmcloud_python_sdk.utils.object_regions import endpoints
+
+
+MIB = 1024 * 1024
+
+# S3 limits
+MIN_PART_SIZE = 5 * MIB
+MAX_PARTS = 10000
+MAX_DELETE_KEYS = 1000
+
+# Headers kept by copies along with the metadata
+CONTENT_HEADERS = ["ContentType", "ContentEncoding", "ContentLanguage",
+                   "CacheControl", "ContentDisposition"]
+
+
+def endpoint_client(service_instance_id, mode, location):
+    """Create a COS client for the endpoint of a mode and location
+
+    The SDK client always targets the default endpoint of the mode, this
+    one is built the same way for any endpoint of the SDK lookup.
+
+    :param service_instance_id: Service instance ID (CRN)
+    :type service_instance_id: str
+    :param mode: Access mode
+    :type mode: str
+    :param location: Location of the endpoint
+    :type location: str
+    :return: COS client
+    :rtype: ibm_boto3.client
+    """
+    return ibm_boto3.client(
+        "s3",
+        ibm_api_key_id=params()["key"],
+        ibm_service_instance_id=service_instance_id,
+        config=Config(signature_version="oauth"),
+        endpoint_url="https://{}".format(endpoints[mode][location])
+    )
+
+
+def part_size_for(size, part_size):
+    """Return the part size to use for a file, growing the requested one if
+    the file would need more parts than allowed
+
+    :param size: File size in bytes
+    :type size: int
+    :param part_size: Requested part size in bytes
+    :type part_size: int
+    :return: Part size in bytes
+    :rtype: int
+    """
+    part_size = max(part_size, MIN_PART_SIZE)
+    while size > part_size * MAX_PARTS:
+        part_size *= 2
+
+    return part_size
+
+
+def file_checksums(path, part_size, chunk_size=MIB):
+    """Compute the MD5 of a file and its ETag once uploaded in parts
+
+    The file is streamed by chunks, it is never loaded in memory.
+
+    :param path: Path of the file
+    :type path: str
+    :param part_size: Part size in bytes, as returned by part_size_for
+    :type part_size: int
+    :param chunk_size: Size of the chunks read in bytes
+    :type chunk_size: int
+    :return: Size, MD5 and multipart ETag of the file
+    :rtype: dict
+    """
+    whole = hashlib.md5()
+    part = hashlib.md5()
+    digests = []
+    filled = 0
+    size = 0
+
+    with open(path, "rb") as stream:
+        while True:
+            data = stream.read(min(chunk_size, part_size - filled))
+            if not data:
+                break
+
+            whole.update(data)
+            part.update(data)
+            filled += len(data)
+            size += len(data)
+            if filled == part_size:
+                digests.append(part.digest())
+                part = hashlib.md5()
+                filled = 0
+
+    if filled or not digests:
+        digests.append(part.digest())
+
+    return {
+        "size": size,
+        "md5": whole.hexdigest(),
+        "etag": "{}-{}".format(hashlib.md5(b"".join(digests)).hexdigest(),
+                               len(digests)),
+    }
+
+
+def head_object(client, bucket, key):
+    """Retrieve the headers of an object without its content
+
+    :param client: COS client
+    :type client: ibm_boto3.client
+    :param bucket: Bucket name
+    :type bucket: str
+    :param key: Object key
+    :type key: str
+    :return: Object headers
+    :rtype: dict
+    """
+    try:
+        return client.head_object(Bucket=bucket, Key=key)
+
+    except Exception as error:
+        code = getattr(error, "response", {}).get("Error", {}).get("Code")
+        if code in ["404", "NoSuchKey", "NotFound"]:
+            return resource_not_found()
+        return resource_error("unable_to_head_object", str(error))
+
+
+def same_content(head, checksums):
+    """Tell whether an object holds the content described by checksums
+
+    The MD5 stored in the object metadata is used when present, the ETag
+    otherwise, whether the object has been uploaded in one or many parts.
+
+    :param head: Object headers, as returned by head_object
+    :type head: dict
+    :param checksums: Local content checksums, as returned by
+        file_checksums
+    :type checksums: dict
+    :return: Whether the content is the same
+    :rtype: bool
+    """
+    if head.get("ContentLength") != checksums["size"]:
+        return False
+
+    stored = head.get("Metadata", {}).get("md5")
+    if stored:
+        return stored == checksums["md5"]
+
+    return head["ETag"].strip('"') in [checksums["md5"], checksums["etag"]]
+
+
+def iter_objects(client, bucket, prefix="", delimiter=None,
+                 start_after=None, page_size=1000):
+    """Iterate over the pages of a bucket listing
+
+    Pages are retrieved one at a time with ListObjectsV2, so huge buckets
+    can be processed without holding the whole listing in memory.
+
+    :param client: COS client
+    :type client: ibm_boto3.client
+    :param bucket: Bucket name
+    :type bucket: str
+    :param prefix: Only list the keys starting with this prefix
+    :type prefix: str
+    :param delimiter: Group the keys sharing a prefix up to the delimiter
+    :type delimiter: str, optional
+    :param start_after: Only list the keys after this one
+    :type start_after: str, optional
+    :param page_size: Maximum number of keys per page
+    :type page_size: int
+    :return: Generator of pages, each with Contents and CommonPrefixes
+    :rtype: generator
+    """
+    args = {"Bucket": bucket, "Prefix": prefix or "",
+            "PaginationConfig": {"PageSize": page_size}}
+    if delimiter:
+        args["Delimiter"] = delimiter
+    if start_after:
+        args["StartAfter"] = start_after
+
+    paginator = client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(**args):
+        yield page
+
+
+def iter_keys(client, bucket, prefix=""):
+    """Iterate over the keys of a bucket
+
+    :param client: COS client
+    :type client: ibm_boto3.client
+    :param bucket: Bucket name
+    :type bucket: str
+    :param prefix: Only list the keys starting with this prefix
+    :type prefix: str
+    :return: Generator of keys
+    :rtype: generator
+    """
+    for page in iter_objects(client, bucket, prefix):
+        for item in page.get("Contents", []):
+            yield item["Key"]
+
+
+def _delete_batch(client, bucket, batch):
+    result = client.delete_objects(
+        Bucket=bucket,
+        Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True})
+
+    return [{"object": item["Key"], "code": item.get("Code"),
+             "message": item.get("Message")}
+            for item in result.get("Errors", [])]
+
+
+def delete_objects(client, bucket, keys, workers=10):
+    """Delete objects by batches of 1000 keys sent concurrently
+
+    Keys are consumed lazily, at most workers batches are held in memory,
+    so a listing generator such as iter_keys can be deleted as it is read.
+
+    :param client: COS client
+    :type client: ibm_boto3.client
+    :param bucket: Bucket name
+    :type bucket: str
+    :param keys: Keys to delete
+    :type keys: iterable
+    :param workers: Maximum number of batches deleted concurrently
+    :type workers: int
+    :return: Number of objects deleted and the keys which failed
+    :rtype: dict
+    """
+    result = {"deleted": 0, "failed": []}
+
+    def _flush(batches):
+        for batch, errors in zip(batches, run_parallel(
+                lambda batch: _delete_batch(client, bucket, batch),
+                batches, workers)):
+            if isinstance(errors, dict):
+                message = errors["errors"][0]["message"]
+                errors = [{"object": key, "code": "unable_to_delete_objects",
+                           "message": message} for key in batch]
+            result["deleted"] += len(batch) - len(errors)
+            result["failed"].extend(errors)
+
+    batches = [[]]
+    for key in keys:
+        if len(batches[-1]) == MAX_DELETE_KEYS:
+            if len(batches) == workers:
+                _flush(batches)
+                batches = []
+            batches.append([])
+        batches[-1].append(key)
+
+    _flush([batch for batch in batches if batch])
+
+    return result
+
+
+def _content_md5(head):
+    stored = head.get("Metadata", {}).get("md5")
+    if stored:
+        return stored
+
+    etag = head["ETag"].strip('"')
+    return None if "-" in etag else etag
+
+
+def same_object(head, other):
+    """Tell whether two objects hold the same content
+
+    :param head: Object headers, as returned by head_object
+    :type head: dict
+    :param other: Other object headers
+    :type other: dict
+    :return: Whether the content is the same
+    :rtype: bool
+    """
+    if head.get("ContentLength") != other.get("ContentLength"):
+        return False
+
+    if head["ETag"] == other["ETag"]:
+        return True
+
+    md5 = _content_md5(head)
+    return md5 is not None and md5 == _content_md5(other)
+
+
+def copy_object(client, src_bucket, src_key, bucket, key, head, part_size,
+                threshold, workers=10, acl=None):
+    """Copy an object server side, by parallel part copies for large ones
+
+    The content never leaves COS. The copy only succeeds if the source
+    didn't change since head was taken, and its MD5 is kept in the
+    metadata of the copy so it can be compared later whatever the number
+    of parts.
+
+    :param client: COS client
+    :type client: ibm_boto3.client
+    :param src_bucket: Source bucket name
+    :type src_bucket: str
+    :param src_key: Source object key
+    :type src_key: str
+    :param bucket: Destination bucket name
+    :type bucket: str
+    :param key: Destination object key
+    :type key: str
+    :param head: Source object headers, as returned by head_object
+    :type head: dict
+    :param part_size: Part size in bytes
+    :type part_size: int
+    :param threshold: Size in bytes from which parts are copied
+    :type threshold: int
+    :param workers: Maximum number of parts copied concurrently
+    :type workers: int
+    :param acl: The canned ACL to apply to the object
+    :type acl: str, optional
+    :return: Copy status
+    :rtype: dict
+    """
+    size = head["ContentLength"]
+    source = {"Bucket": src_bucket, "Key": src_key}
+    metadata = dict(head.get("Metadata", {}))
+    if _content_md5(head):
+        metadata["md5"] = _content_md5(head)
+    extra = {"ACL": acl} if acl else {}
+
+    # Replacing the metadata drops the content headers, they are set again
+    for header in CONTENT_HEADERS:
+        if head.get(header):
+            extra[header] = head[header]
+
+    try:
+        if size < threshold:
+            client.copy_object(Bucket=bucket, Key=key, CopySource=source,
+                               CopySourceIfMatch=head["ETag"],
+                               Metadata=metadata, MetadataDirective="REPLACE",
+                               **extra)
+            return resource_created({"object": key, "bucket": bucket,
+                                     "status": "copied", "parts": 1})
+
+        part_size = part_size_for(size, part_size)
+        upload_id = client.create_multipart_upload(
+            Bucket=bucket, Key=key, Metadata=metadata, **extra)["UploadId"]
+
+        def _copy(start):
+            number = start // part_size + 1
+            end = min(start + part_size, size) - 1
+            result = client.upload_part_copy(
+                Bucket=bucket, Key=key, UploadId=upload_id,
+                PartNumber=number, CopySource=source,
+                CopySourceIfMatch=head["ETag"],
+                CopySourceRange="bytes={}-{}".format(start, end))
+            return {"PartNumber": number,
+                    "ETag": result["CopyPartResult"]["ETag"]}
+
+        parts = run_parallel(_copy, list(range(0, size, part_size)), workers)
+        errors = [part["errors"][0]["message"] for part in parts
+                  if "errors" in part]
+        if errors:
+            client.abort_multipart_upload(Bucket=bucket, Key=key,
+                                          UploadId=upload_id)
+            return resource_error("unable_to_copy_part", "; ".join(errors))
+
+        client.complete_multipart_upload(
+            Bucket=bucket, Key=key, UploadId=upload_id,
+            MultipartUpload={"Parts": parts})
+
+        return resource_created({"object": key, "bucket": bucket,
+                                 "status": "copied", "parts": len(parts)})
+
+    except Exception as error:
+        return resource_error("unable_to_copy_object", str(error))
+
+
+def _read_part(path, number, part_size):
+    with open(path, "rb") as stream:
+        stream.seek((number - 1) * part_size)
+        return stream.read(part_size)
+
+
+def _pending_upload(client, bucket, key):
+    uploads = client.list_multipart_uploads(Bucket=bucket, Prefix=key)
+    uploads = [upload for upload in uploads.get("Uploads", [])
+               if upload["Key"] == key]
+    if not uploads:
+        return None, {}
+
+    upload_id = max(uploads, key=lambda upload: upload["Initiated"])[
+        "UploadId"]
+
+    parts = {}
+    paginator = client.get_paginator("list_parts")
+    for page in paginator.paginate(Bucket=bucket, Key=key,
+                                   UploadId=upload_id):
+        for part in page.get("Parts", []):
+            parts[part["PartNumber"]] = part
+
+    return upload_id, parts
+
+
+def _record_path(bucket, key):
+    name = hashlib.sha1("{}/{}".format(bucket, key).encode(
+        "utf-8")).hexdigest()
+    return os.path.join(os.path.expanduser("~"), ".ansible", "cos_uploads",
+                        "{}.json".format(name))
+
+
+def _load_record(path):
+    try:
+        with open(path) as stream:
+            return json.load(stream)
+    except (IOError, OSError, ValueError):
+        return {}
+
+
+def _save_record(path, record):
+    try:
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        with open(path, "w") as stream:
+            json.dump(record, stream)
+    except (IOError, OSError):
+        pass
+
+
+def _remove_record(path):
+    try:
+        os.remove(path)
+    except (IOError, OSError):
+        pass
+
+
+def _stale_upload(path, upload_id, committed, record, part_size, count,
+                  md5, workers):
+    # The metadata of a pending upload can't be read back, the md5 it was
+    # created with is recorded locally
+    if md5 and (record.get("upload_id") != upload_id or
+                record.get("md5") != md5):
+        return True
+
+    numbers = [number for number in committed if number <= count]
+    etags = run_parallel(
+        lambda number: '"{}"'.format(hashlib.md5(
+            _read_part(path, number, part_size)).hexdigest()),
+        numbers, workers)
+
+    return any("errors" in etag or committed[number]["ETag"] != etag
+               for number, etag in zip(numbers, etags))
+
+
+def put_file(client, bucket, key, path, acl=None, md5=None):
+    """Upload a file in a single request
+
+    The file is streamed from disk, it is never loaded in memory.
+
+    :param client: COS client
+    :type client: ibm_boto3.client
+    :param bucket: Bucket name
+    :type bucket: str
+    :param key: Object key
+    :type key: str
+    :param path: Path of the file to upload
+    :type path: str
+    :param acl: The canned ACL to apply to the object
+    :type acl: str, optional
+    :param md5: MD5 of the file, stored in the object metadata like
+        multipart_upload does
+    :type md5: str, optional
+    :return: Upload status
+    :rtype: dict
+    """
+    extra = {"ACL": acl} if acl else {}
+    if md5:
+        extra["Metadata"] = {"md5": md5}
+
+    try:
+        with open(path, "rb") as stream:
+            client.put_object(Bucket=bucket, Key=key, Body=stream, **extra)
+
+        return resource_created({"object": key, "bucket": bucket,
+                                 "status": "created", "parts": 1})
+
+    except Exception as error:
+        return resource_error("unable_to_upload_object", str(error))
+
+
+def multipart_upload(client, bucket, key, path, part_size, workers=10,
+                     retries=3, acl=None, md5=None):
+    """Upload a file in parts sent concurrently
+
+    An upload previously interrupted for the same key is resumed, the parts
+    already committed are only read locally to check they didn't change.
+    If the file changed since, or the upload has been created by another
+    host or for another content, it is aborted and a new one is started so
+    the md5 stored in the metadata is always the one of the content.
+
+    :param client: COS client
+    :type client: ibm_boto3.client
+    :param bucket: Bucket name
+    :type bucket: str
+    :param key: Object key
+    :type key: str
+    :param path: Path of the file to upload
+    :type path: str
+    :param part_size: Part size in bytes
+    :type part_size: int
+    :param workers: Maximum number of parts uploaded concurrently
+    :type workers: int
+    :param retries: Number of attempts for each part
+    :type retries: int
+    :param acl: The canned ACL to apply to the object
+    :type acl: str, optional
+    :param md5: MD5 of the file, stored in the object metadata since the
+        ETag of a multipart upload isn't the MD5 of the content
+    :type md5: str, optional
+    :return: Upload status
+    :rtype: dict
+    """
+    size = os.path.getsize(path)
+    part_size = part_size_for(size, part_size)
+    count = max(1, -(-size // part_size))
+
+    try:
+        record_path = _record_path(bucket, key)
+        upload_id, committed = _pending_upload(client, bucket, key)
+        if upload_id and _stale_upload(path, upload_id, committed,
+                                       _load_record(record_path), part_size,
+                                       count, md5, workers):
+            client.abort_multipart_upload(Bucket=bucket, Key=key,
+                                          UploadId=upload_id)
+            upload_id, committed = None, {}
+
+        if not upload_id:
+            extra = {"ACL": acl} if acl else {}
+            if md5:
+                extra["Metadata"] = {"md5": md5}
+            upload_id = client.create_multipart_upload(
+                Bucket=bucket, Key=key, **extra)["UploadId"]
+            _save_record(record_path, {"upload_id": upload_id, "md5": md5})
+
+        def _upload(number):
+            # Committed parts have been checked against the file already
+            part = committed.get(number)
+            if part:
+                return {"PartNumber": number, "ETag": part["ETag"],
+                        "resumed": True}
+
+            data = _read_part(path, number, part_size)
+            delays = backoff_delays()
+            for attempt in range(retries):
+                try:
+                    result = client.upload_part(
+                        Bucket=bucket, Key=key, UploadId=upload_id,
+                        PartNumber=number, Body=data)
+                    return {"PartNumber": number, "ETag": result["ETag"]}
+                except Exception:
+                    if attempt == retries - 1:
+                        raise
+                    time.sleep(next(delays))
+
+        numbers = list(range(1, count + 1))
+        parts = run_parallel(_upload, numbers, workers)
+
+        errors = ["part {}: {}".format(number, part["errors"][0]["message"])
+                  for number, part in zip(numbers, parts) if "errors" in part]
+        if errors:
+            # Keep the upload, the next run resumes from the parts sent
+            return resource_error("unable_to_upload_part", "; ".join(errors))
+
+        resumed = len([part for part in parts if part.get("resumed")])
+        client.complete_multipart_upload(
+            Bucket=bucket, Key=key, UploadId=upload_id,
+            MultipartUpload={"Parts": [
+                {"PartNumber": part["PartNumber"], "ETag": part["ETag"]}
+                for part in parts]})
+        _remove_record(record_path)
+
+        return resource_created({"object": key, "bucket": bucket,
+                                 "status": "created", "parts": count,
+                                 "resumed_parts": resumed})
+
+    except Exception as error:
+        return resource_error("unable_to_upload_object", str(error))
+
+
+def _read_full(stream, size):
+    chunks = []
+    left = size
+    while left:
+        data = stream.read(left)
+        if not data:
+            break
+        chunks.append(data)
+        left -= len(data)
+
+    return b"".join(chunks)
+
+
+def stream_upload(client, bucket, key, stream, part_size, workers=10,
+                  retries=3, acl=None, metadata=None, checksum=None):
+    """Upload a stream of unknown length in parts sent concurrently
+
+    Parts are read from the stream while the previous ones are sent, at
+    most workers parts are held in memory. The content is hashed as it is
+    read and the upload is aborted if it doesn't match checksum.
+
+    :param client: COS client
+    :type client: ibm_boto3.client
+    :param bucket: Bucket name
+    :type bucket: str
+    :param key: Object key
+    :type key: str
+    :param stream: File-like object to read the content from
+    :type stream: file
+    :param part_size: Part size in bytes
+    :type part_size: int
+    :param workers: Maximum number of parts sent concurrently
+    :type workers: int
+    :param retries: Number of attempts for each part
+    :type retries: int
+    :param acl: The canned ACL to apply to the object
+    :type acl: str, optional
+    :param metadata: Metadata to store with the object
+    :type metadata: dict, optional
+    :param checksum: Algorithm and expected hexadecimal digest
+    :type checksum: tuple, optional
+    :return: Upload status, with the size and MD5 of the content
+    :rtype: dict
+    """
+    md5 = hashlib.md5()
+    digest = hashlib.new(checksum[0]) if checksum else None
+    size = [0]
+
+    def _read():
+        data = _read_full(stream, part_size)
+        md5.update(data)
+        if digest:
+            digest.update(data)
+        size[0] += len(data)
+        return data
+
+    def _mismatch():
+        if digest and digest.hexdigest() != checksum[1].lower():
+            return resource_error("checksum_mismatch", "{} is {}".format(
+                checksum[0], digest.hexdigest()))
+        return None
+
+    extra = {"ACL": acl} if acl else {}
+    if metadata:
+        extra["Metadata"] = metadata
+    upload_id = None
+
+    try:
+        data = _read()
+        if len(data) < part_size:
+            error = _mismatch()
+            if error:
+                return error
+
+            client.put_object(Bucket=bucket, Key=key, Body=data, **extra)
+            return resource_created({"object": key, "bucket": bucket,
+                                     "status": "created", "parts": 1,
+                                     "size": size[0],
+                                     "md5": md5.hexdigest()})
+
+        upload_id = client.create_multipart_upload(
+            Bucket=bucket, Key=key, **extra)["UploadId"]
+
+        slots = threading.BoundedSemaphore(workers)
+        failed = []
+
+        def _upload(number, data):
+            try:
+                delays = backoff_delays()
+                for attempt in range(retries):
+                    try:
+                        result = client.upload_part(
+                            Bucket=bucket, Key=key, UploadId=upload_id,
+                            PartNumber=number, Body=data)
+                        return {"PartNumber": number, "ETag": result["ETag"]}
+                    except Exception as error:
+                        if attempt == retries - 1:
+                            failed.append("part {}: {}".format(number,
+                                                               error))
+                            raise
+                        time.sleep(next(delays))
+            finally:
+                slots.release()
+
+        futures = []
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            number = 1
+            while data and not failed:
+                slots.acquire()
+                futures.append(executor.submit(_upload, number, data))
+                data = _read()
+                number += 1
+
+        if failed:
+            error = resource_error("unable_to_upload_part",
+                                   "; ".join(failed))
+        else:
+            error = _mismatch()
+        if error:
+            client.abort_multipart_upload(Bucket=bucket, Key=key,
+                                          UploadId=upload_id)
+            return error
+
+        client.complete_multipart_upload(
+            Bucket=bucket, Key=key, UploadId=upload_id,
+            MultipartUpload={"Parts": [future.result()
+                                       for future in futures]})
+
+        return resource_created({"object": key, "bucket": bucket,
+                                 "status": "created", "parts": len(futures),
+                                 "size": size[0], "md5": md5.hexdigest()})
+
+    except Exception as error:
+        if upload_id:
+            try:
+                client.abort_multipart_upload(Bucket=bucket, Key=key,
+                                              UploadId=upload_id)
+            except Exception:
+                pass
+        return resource_error("unable_to_upload_object", str(error))
+
+
+def _get_range(client, bucket, key, etag, start, end, stream, retries=3):
+    delays = backoff_delays()
+    for attempt in range(retries):
+        try:
+            body = client.get_object(Bucket=bucket, Key=key, IfMatch=etag,
+                                     Range="bytes={}-{}".format(start, end))
+            stream.seek(start)
+            for chunk in iter(lambda: body["Body"].read(MIB), b""):
+                stream.write(chunk)
+            return {"start": start, "end": end}
+        except Exception:
+            if attempt == retries - 1:
+                raise
+            time.sleep(next(delays))
+
+
+def download(client, bucket, key, dest, head, part_size, threshold,
+             workers=10):
+    """Download an object to a file, by parallel ranges for large objects
+
+    The object is streamed to a temporary file next to the destination
+    which replaces it once complete, nothing is held in memory. The ranges
+    are only accepted if the object didn't change since head was taken.
+
+    :param client: COS client
+    :type client: ibm_boto3.client
+    :param bucket: Bucket name
+    :type bucket: str
+    :param key: Object key
+    :type key: str
+    :param dest: Destination path
+    :type dest: str
+    :param head: Object headers, as returned by head_object
+    :type head: dict
+    :param part_size: Size of each range in bytes
+    :type part_size: int
+    :param threshold: Size in bytes from which ranges are used
+    :type threshold: int
+    :param workers: Maximum number of ranges downloaded concurrently
+    :type workers: int
+    :return: Download status
+    :rtype: dict
+    """
+    size = head["ContentLength"]
+    part_size = part_size_for(size, part_size)
+    tmp = "{}.part".format(dest)
+
+    try:
+        with open(tmp, "wb") as stream:
+            stream.truncate(size)
+
+        if size < threshold:
+            ranges = [(0, max(0, size - 1))] if size else []
+        else:
+            ranges = [(start, min(start + part_size, size) - 1)
+                      for start in range(0, size, part_size)]
+
+        def _download(item):
+            with open(tmp, "r+b") as stream:
+                return _get_range(client, bucket, key, head["ETag"],
+                                  item[0], item[1], stream)
+
+        results = run_parallel(_download, ranges, workers)
+        errors = ["bytes {}-{}: {}".format(start, end,
+                                           result["errors"][0]["message"])
+                  for (start, end), result in zip(ranges, results)
+                  if "errors" in result]
+        if errors:
+            os.remove(tmp)
+            return resource_error("unable_to_download_object",
+                                  "; ".join(errors))
+
+        os.replace(tmp, dest)
+
+        return resource_created({"object": key, "bucket": bucket,
+                                 "path": dest, "status": "downloaded",
+                                 "ranges": len(ranges)})
+
+    except Exception as error:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return resource_error("unable_to_download_object", str(error))
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+import time
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import list_resources
+
+
+# Collection, status field, default status and failure statuses
+RESOURCES = {
+    "instance": ("instances", "status", "running", ["failed"]),
+    "volume": ("volumes", "status", "available", ["failed", "unusable"]),
+    "lb": ("load_balancers", "provisioning_status", "active", ["failed"]),
+    "vpn_gateway": ("vpn_gateways", "status", "available", ["failed"]),
+    "image": ("images", "status", "available", ["failed"]),
+    "baremetal": ("bare_metal_servers", "status", "running", ["failed"]),
+}
+
+
+def job_handle(resource_type, resource, status=None):
+    """Build the handle of a resource being provisioned asynchronously
+
+    :param resource_type: Type of the resource, one of RESOURCES
+    :type resource_type: str
+    :param resource: Resource information returned by the API
+    :type resource: dict
+    :param status: Expected status, defaults to the type default status
+    :type status: str, optional
+    :return: Handle to give to ic_job_status
+    :rtype: dict
+    """
+    return {
+        "resource_type": resource_type,
+        "id": resource["id"],
+        "name": resource.get("name"),
+        "status": status or RESOURCES[resource_type][2],
+        "created": int(time.time()),
+    }
+
+
+def job_state(resource_type, item, status):
+    """Compare a resource with the status expected
+
+    :param resource_type: Type of the resource, one of RESOURCES
+    :type resource_type: str
+    :param item: Resource information returned by the API, None when the
+        resource doesn't exist
+    :type item: dict
+    :param status: Expected status, C(deleted) for a deletion
+    :type status: str
+    :return: done, failed, pending or not_found
+    :rtype: str
+    """
+    _, field, _, failures = RESOURCES[resource_type]
+
+    if not item:
+        return "done" if status == "deleted" else "not_found"
+    if item[field] == status:
+        return "done"
+    if item[field] in failures and status not in failures:
+        return "failed"
+    return "pending"
+
+
+def snapshot(resource_types):
+    """Retrieve the collections of several resource types once
+
+    :param resource_types: Types of the resources, from RESOURCES
+    :type resource_types: list
+    :return: Resources by type then by ID, or the first error
+    :rtype: dict
+    """
+    result = {}
+    for resource_type in sorted(set(resource_types)):
+        collection = RESOURCES[resource_type][0]
+        data = list_resources(collection)
+        if "errors" in data:
+            return data
+
+        result[resource_type] = dict((item["id"], item)
+                                     for item in data[collection])
+
+    return result
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+import fcntl
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import backoff_delays
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import wait_until
+
+
+# Statuses during which the load balancer rejects any other change
+PENDING = ["create_pending", "update_pending", "maintenance_pending"]
+
+
+def _timeout(lb, action):
+    return {"errors": [{"code": "timeout",
+                        "message": "timeout {} load balancer {}".format(
+                            action, lb)}]}
+
+
+def _conflict(result):
+    if not isinstance(result, dict) or "errors" not in result:
+        return False
+
+    for error in result["errors"]:
+        text = "{} {}".format(error.get("code", ""),
+                              error.get("message", "")).lower()
+        if "conflict" in text or "pending" in text:
+            return True
+
+    return False
+
+
+@contextmanager
+def lb_lock(lb_id, timeout):
+    """Serialize the changes made on one load balancer by concurrent tasks
+
+    The lock is a file on the host running the modules, usually the
+    controller, so it only serializes the tasks running there.
+
+    :param lb_id: Load balancer ID
+    :type lb_id: str
+    :param timeout: Maximum time to wait for the lock in seconds
+    :type timeout: int
+    :return: Whether the lock has been acquired
+    :rtype: bool
+    """
+    path = os.path.join(tempfile.gettempdir(),
+                        "ansible-ic-lb-{}.lock".format(lb_id))
+    deadline = time.monotonic() + timeout
+    delays = backoff_delays(0.5, 5)
+
+    with open(path, "a") as lock:
+        acquired = False
+        while not acquired:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                acquired = True
+            except (IOError, OSError):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                time.sleep(min(next(delays), remaining))
+
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def lb_mutate(loadbalancer, lb, timeout, func, check=None, present=True):
+    """Apply a change on a load balancer once it accepts changes
+
+    The change is applied under the load balancer lock, after waiting for
+    the load balancer to leave any pending status, and is retried if it is
+    still rejected with a conflict. The lock is held until the load
+    balancer is active again so the next task can go straight ahead.
+
+    When a check function is given, the resource is looked up again under
+    the lock and the change is skipped if a concurrent task already made
+    it.
+
+    :param loadbalancer: SDK load balancer object
+    :type loadbalancer: Loadbalancer
+    :param lb: Load balancer name or ID
+    :type lb: str
+    :param timeout: Maximum time to wait in seconds, for the lock and the
+        load balancer together
+    :type timeout: int
+    :param func: Function without argument applying the change
+    :type func: function
+    :param check: Function without argument looking the resource up
+    :type check: function
+    :param present: Whether the change creates the resource or deletes it
+    :type present: bool
+    :return: Result of the SDK function, the existing resource (or an
+        empty dict once deleted) when the change is skipped, and whether the
+        change has been applied
+    :rtype: tuple
+    """
+    deadline = time.monotonic() + timeout
+
+    def _remaining():
+        return max(0, deadline - time.monotonic())
+
+    lb_info = loadbalancer.get_lb(lb)
+    if "errors" in lb_info:
+        return lb_info, False
+
+    def _settle():
+        return wait_until(lambda: loadbalancer.get_lb_by_id(lb_info["id"]),
+                          lambda info: "errors" in info or
+                          info["provisioning_status"] not in PENDING,
+                          _remaining())
+
+    with lb_lock(lb_info["id"], _remaining()) as acquired:
+        if not acquired:
+            return _timeout(lb, "locking"), False
+
+        if check:
+            current = check()
+            if ("id" in current) == present:
+                return current if present else {}, False
+
+        delays = backoff_delays()
+        while True:
+            info, settled = _settle()
+            if "errors" in info:
+                return info, False
+            if not settled:
+                return _timeout(lb, "waiting for"), False
+
+            result = func()
+            if not _conflict(result) or not _remaining():
+                break
+
+            time.sleep(min(next(delays), _remaining()))
+
+        if "errors" not in result:
+            _settle()
+
+        return result, True
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import wait_until
+
+
+def gateway_members(gateway):
+    """Summarize the members of a VPN gateway
+
+    :param gateway: VPN gateway information
+    :type gateway: dict
+    :return: Role, public IP and status of each member
+    :rtype: list
+    """
+    members = []
+    for member in gateway.get("members", []):
+        members.append({
+            "role": member.get("role"),
+            "public_ip": member.get("public_ip", {}).get("address"),
+            "status": member.get("status"),
+        })
+
+    return members
+
+
+def connection_tunnels(connection):
+    """Summarize the tunnels of a VPN gateway connection
+
+    Policy-based connections don't expose their tunnels, the connection
+    status is returned as the only tunnel.
+
+    :param connection: VPN gateway connection information
+    :type connection: dict
+    :return: Public IP and status of each tunnel
+    :rtype: list
+    """
+    if "tunnels" not in connection:
+        return [{"public_ip": connection.get("peer_address"),
+                 "status": connection.get("status")}]
+
+    tunnels = []
+    for tunnel in connection["tunnels"]:
+        tunnels.append({
+            "public_ip": tunnel.get("public_ip", {}).get("address"),
+            "status": tunnel.get("status"),
+        })
+
+    return tunnels
+
+
+def gateway_payload(gateway, available, timeout):
+    """Build the result of a wait on a VPN gateway
+
+    :param gateway: Last VPN gateway information
+    :type gateway: dict
+    :param available: Whether the gateway is available
+    :type available: bool
+    :param timeout: Time waited in seconds
+    :type timeout: int
+    :return: Gateway information with its members, and the error when it
+        isn't available
+    :rtype: dict
+    """
+    payload = dict(gateway, members=gateway_members(gateway))
+    if available:
+        return payload
+
+    if gateway["status"] == "failed":
+        error = {"code": "failed",
+                 "message": "VPN gateway {} failed".format(gateway["name"])}
+    else:
+        error = {"code": "timeout",
+                 "message": "VPN gateway {} not available after {} seconds,"
+                            " status is {}".format(gateway["name"], timeout,
+                                                   gateway["status"])}
+    payload["errors"] = [error]
+
+    return payload
+
+
+def wait_gateway(vpn, gateway_id, timeout):
+    """Wait for a VPN gateway and all its members to be available
+
+    :param vpn: SDK VPN object
+    :type vpn: Vpn
+    :param gateway_id: VPN gateway ID
+    :type gateway_id: str
+    :param timeout: Maximum time to wait in seconds
+    :type timeout: int
+    :return: Last gateway information and whether it is available
+    :rtype: tuple
+    """
+    def _ready(gateway):
+        if "errors" in gateway or gateway["status"] == "failed":
+            return True
+        return gateway["status"] == "available" and \
+            all(member["status"] == "available"
+                for member in gateway_members(gateway))
+
+    gateway, ready = wait_until(
+        lambda: vpn.get_vpn_gateway_by_id(gateway_id), _ready, timeout)
+
+    return gateway, ready and "errors" not in gateway and \
+        gateway["status"] != "failed"
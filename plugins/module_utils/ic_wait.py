@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+import random
+import time
+
+
+def backoff_delays(delay=2, max_delay=30, factor=1.5, jitter=0.2):
+    """Generate polling intervals, short at first then growing exponentially
+
+    :param delay: First interval in seconds
+    :type delay: float
+    :param max_delay: Maximum interval in seconds
+    :type max_delay: float
+    :param factor: Growth factor applied after each interval
+    :type factor: float
+    :param jitter: Random variation applied to each interval, as a fraction
+    :type jitter: float
+    :return: Infinite generator of intervals in seconds
+    :rtype: generator
+    """
+    while True:
+        yield delay * random.uniform(1 - jitter, 1 + jitter)
+        delay = min(delay * factor, max_delay)
+
+
+def wait_until(fetch, ready, timeout, delay=2, max_delay=30):
+    """Poll a resource until it reaches the expected state
+
+    The ready function is responsible for stopping on errors or failure
+    states, the polling only stops on its own when the timeout expires.
+
+    :param fetch: Function returning the current resource information
+    :type fetch: function
+    :param ready: Function returning True when polling should stop
+    :type ready: function
+    :param timeout: Maximum time to wait in seconds
+    :type timeout: int
+    :param delay: First polling interval in seconds
+    :type delay: float
+    :param max_delay: Maximum polling interval in seconds
+    :type max_delay: float
+    :return: Last resource information and whether ready returned True
+    :rtype: tuple
+    """
+    deadline = time.monotonic() + timeout
+    delays = backoff_delays(delay, max_delay)
+
+    while True:
+        result = fetch()
+        if ready(result):
+            return result, True
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return result, False
+
+        time.sleep(min(next(delays), remaining))
+
+
+def busy(result):
+    """Tell whether an API call has been rejected because the resource or
+    one of its dependents is still being changed
+
+    :param result: Result of an SDK call
+    :type result: dict
+    :return: Whether the call should be tried again later
+    :rtype: bool
+    """
+    if not isinstance(result, dict) or "errors" not in result:
+        return False
+
+    for error in result["errors"]:
+        code = error.get("code", "")
+        if "in_use" in code or "conflict" in code or "pending" in code:
+            return True
+
+    return False
+
+
+def retry_busy(func, timeout, delay=2, max_delay=30):
+    """Call a function until the API stops rejecting it as busy
+
+    :param func: Function without argument issuing the API call
+    :type func: function
+    :param timeout: Maximum time to retry in seconds
+    :type timeout: int
+    :param delay: First retry interval in seconds
+    :type delay: float
+    :param max_delay: Maximum retry interval in seconds
+    :type max_delay: float
+    :return: Result of the last call
+    :rtype: dict
+    """
+    result, _ = wait_until(func, lambda result: not busy(result), timeout,
+                           delay, max_delay)
+    return result
+
+
+def wait_deleted(fetch, timeout, delay=2, max_delay=30):
+    """Poll a resource until it doesn't exist anymore
+
+    Errors other than not_found, such as throttling or server errors, are
+    retried until the timeout.
+
+    :param fetch: Function returning the current resource information
+    :type fetch: function
+    :param timeout: Maximum time to wait in seconds
+    :type timeout: int
+    :param delay: First polling interval in seconds
+    :type delay: float
+    :param max_delay: Maximum polling interval in seconds
+    :type max_delay: float
+    :return: Last resource information, or a timeout error holding it, and
+        whether it is deleted
+    :rtype: tuple
+    """
+    def _deleted(result):
+        if "errors" not in result:
+            return False
+        errors = result["errors"]
+        if isinstance(errors, dict):
+            errors = [errors]
+        return all(error.get("code") == "not_found" for error in errors)
+
+    result, deleted = wait_until(fetch, _deleted, timeout, delay, max_delay)
+    if not deleted:
+        return {"errors": [{"code": "timeout",
+                            "message": "resource still not deleted after {}"
+                                       " seconds".format(timeout)}],
+                "last": result}, False
+
+    return result, True
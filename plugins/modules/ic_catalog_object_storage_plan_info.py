@@ -6,7 +6,9 @@
 
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cache import cached
 from ibmcloud_python_sdk.catalog import catalog_service as sdk
+from ibmcloud_python_sdk.utils.common import resource_not_found
 
 
 ANSIBLE_METADATA = {
@@ -23,15 +25,31 @@ author: Maxim Babushkin (@maxbab)
 version_added: "2.9"
 description:
   - Get a list of existing catalog object storage plans in an account.
+  - When C(cache_ttl) is set, plans are cached on the host running the
+    module for this many seconds and filtered by the module, so repeated
+    lookups don't query the global catalog again whatever the plan or
+    location requested.
 notes:
   - The result contains a list of catalog object storage plans.
+  - C(cached) tells whether the result came from the cache.
 requirements:
   - "ibmcloud-python-sdk"
 options:
   plan:
     description:
       - Restrict results to a plan with name matching.
-  type: str
+    type: str
+  location:
+    description:
+      - Restrict results to the plans available in this location, global
+        plans included.
+    type: str
+  cache_ttl:
+    description:
+      - How long in seconds the plans are kept in the cache. C(0)
+        disables the cache.
+    type: int
+    default: 0
 '''
 
 EXAMPLES = r'''
@@ -41,14 +59,40 @@ EXAMPLES = r'''
 - name: Retrieve catalog object storage specific plan
   ic_catalog_object_storage_plan_info:
     plan: standard
+
+- name: Retrieve the standard plan if available in us-south
+  ic_catalog_object_storage_plan_info:
+    plan: standard
+    location: us-south
 '''
 
 
+def _filter(result, plan, location):
+    resources = []
+    for resource in result.get("resources", []):
+        tags = resource.get("geo_tags", [])
+        if plan and resource.get("name") != plan:
+            continue
+        if location and tags and location not in tags and \
+                "global" not in tags:
+            continue
+        resources.append(resource)
+
+    return dict(result, resources=resources)
+
+
 def run_module():
     module_args = dict(
         plan=dict(
             type='str',
             required=False),
+        location=dict(
+            type='str',
+            required=False),
+        cache_ttl=dict(
+            type='int',
+            default=0,
+            required=False),
     )
 
     module = AnsibleModule(
@@ -59,17 +103,26 @@ def run_module():
     catalog = sdk.CatalogService()
 
     plan = module.params['plan']
+    location = module.params['location']
+    cache_ttl = module.params['cache_ttl']
+
+    # The SDK retrieves every plan to look for one, the whole list is cached
+    # and filtered here instead
+    result, hit = cached(
+        "ic_catalog_object_storage_plan_info", ["plans"], cache_ttl,
+        catalog.get_object_storage_plans)
+    if "errors" in result:
+      module.fail_json(msg=result)
+
+    if plan or location:
+      result = _filter(result, plan, location)
 
     if plan:
-      result = catalog.get_requested_object_storage_plan(plan)
-      if "errors" in result:
-        module.fail_json(msg=result)
-    else:
-      result = catalog.get_object_storage_plans()
-      if "errors" in result:
-        module.fail_json(msg=result)
-
-    module.exit_json(**result)
+      if not result["resources"]:
+        module.fail_json(msg=resource_not_found())
+      result = result["resources"][0]
+
+    module.exit_json(cached=hit, **result)
 
 
 def main():
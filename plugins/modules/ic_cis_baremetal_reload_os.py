@@ -5,7 +5,9 @@
 # (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
 
+import time
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import wait_until
 from ibmcloud_python_sdk.cis.baremetal import hardware as sdk
 
 
@@ -106,6 +108,38 @@ options:
         operating system.
     type: bool
     choices: [true, false]
+  wait:
+    description:
+      - Wait until the reload transaction is completed. The result contains
+        the transaction steps seen while waiting in C(msg.transactions) and
+        the time waited in C(msg.elapsed).
+    type: bool
+    default: false
+  wait_for_idle:
+    description:
+      - If a transaction is already running on the baremetal server, wait
+        for it to finish before reloading the operating system instead of
+        failing.
+    type: bool
+    default: false
+  wait_timeout:
+    description:
+      - How long to wait in seconds, for the reload and for the idle state
+        each.
+    type: int
+    default: 7200
+  wait_delay:
+    description:
+      - First polling interval in seconds, the interval then grows
+        exponentially with jitter. Reloads take more than 30 minutes, there
+        is no point in polling often.
+    type: int
+    default: 60
+  wait_max_delay:
+    description:
+      - Maximum polling interval in seconds.
+    type: int
+    default: 300
 '''
 
 EXAMPLES = r'''
@@ -134,8 +168,98 @@ EXAMPLES = r'''
     enable_lvm: true
     erase_drives: true
     image: 44992
+
+- name: Reload many servers and collect the results later
+  ic_cis_baremetal_reload_os:
+    baremetal: "{{ item }}"
+    wait: true
+    wait_for_idle: true
+  loop: "{{ groups['classic'] }}"
+  async: 10800
+  poll: 0
+  register: reloads
 '''
 
+# Only retrieve what is needed to follow the transactions
+MASK = ("mask[id,hardwareStatus[status],activeTransaction[id,"
+        "elapsedSeconds,averageDuration,transactionStatus[name,"
+        "friendlyName]]]")
+
+
+def _get_transaction(hardware, baremetal_id):
+    try:
+        return hardware.client.call("Hardware_Server", "getObject",
+                                    id=baremetal_id, mask=MASK)
+    except Exception as error:
+        return {"errors": [{"code": "exception", "message": str(error)}]}
+
+
+def _transaction(info):
+    transaction = info.get("activeTransaction")
+    if not transaction:
+        return None
+
+    status = transaction.get("transactionStatus", {})
+    return {
+        "id": transaction.get("id"),
+        "step": status.get("friendlyName") or status.get("name"),
+        "elapsed_seconds": transaction.get("elapsedSeconds"),
+        "average_duration": transaction.get("averageDuration"),
+    }
+
+
+def _idle(info):
+    return not info.get("activeTransaction") and \
+        info.get("hardwareStatus", {}).get("status") == "ACTIVE"
+
+
+def _wait_transactions(module, hardware, baremetal_id, started):
+    start = time.monotonic()
+    steps = []
+    seen = [not started]
+
+    def _ready(info):
+        if "errors" in info:
+            return True
+
+        transaction = _transaction(info)
+        if transaction:
+            seen[0] = True
+            if not steps or steps[-1]["step"] != transaction["step"]:
+                steps.append(dict(transaction, since=int(
+                    time.monotonic() - start)))
+
+        # The reload transaction doesn't show up right away, don't stop
+        # before having seen it
+        return seen[0] and _idle(info)
+
+    info, ready = wait_until(
+        lambda: _get_transaction(hardware, baremetal_id), _ready,
+        module.params['wait_timeout'],
+        delay=module.params['wait_delay'],
+        max_delay=module.params['wait_max_delay'])
+
+    if "errors" in info:
+        module.fail_json(msg=info)
+
+    payload = {"transactions": steps,
+               "elapsed": int(time.monotonic() - start)}
+    if not ready:
+        current = _transaction(info)
+        pending = "{} ({})".format(current["step"], current["id"]) \
+            if current else "none, hardware status {}".format(
+                info.get("hardwareStatus", {}).get("status"))
+        payload["current"] = current
+        payload["errors"] = [{
+            "code": "timeout",
+            "message": "baremetal server {} still busy after {} seconds,"
+                       " pending transaction: {}".format(
+                           module.params['baremetal'], payload["elapsed"],
+                           pending)}]
+        module.fail_json(msg=payload)
+
+    return payload
+
 
 def run_module():
     module_args = dict(
@@ -188,6 +312,26 @@ def run_module():
             type='bool',
             choices=[True, False],
             required=False),
+        wait=dict(
+            type='bool',
+            default=False,
+            required=False),
+        wait_for_idle=dict(
+            type='bool',
+            default=False,
+            required=False),
+        wait_timeout=dict(
+            type='int',
+            default=7200,
+            required=False),
+        wait_delay=dict(
+            type='int',
+            default=60,
+            required=False),
+        wait_max_delay=dict(
+            type='int',
+            default=300,
+            required=False),
     )
 
     module = AnsibleModule(
@@ -212,14 +356,26 @@ def run_module():
     upgrade_bios = module.params['upgrade_bios']
     upgrade_firmware = module.params['upgrade_firmware']
 
-    check = hardware.get_baremetal(baremetal)
+    wait = module.params['wait']
+    wait_for_idle = module.params['wait_for_idle']
 
-    if check["hardwareStatus"]["status"] != "ACTIVE":
-        module.fail_json(changed=False, msg="task already in progress")
-    elif image and item_prices:
+    if image and item_prices:
         module.fail_json(
           changed=False, msg="image and item_prices cannot be used together")
 
+    check = hardware.get_baremetal(baremetal)
+    if "errors" in check:
+        module.fail_json(msg=check)
+
+    if check["hardwareStatus"]["status"] != "ACTIVE" or \
+            check.get("activeTransaction"):
+        if not wait_for_idle:
+            module.fail_json(changed=False, msg={
+                "errors": [{"code": "in_progress",
+                            "message": "task already in progress"}],
+                "transaction": _transaction(check)})
+        _wait_transactions(module, hardware, check["id"], False)
+
     if image:
         item_prices = [image]
 
@@ -242,6 +398,9 @@ def run_module():
     if "errors" in result:
         module.fail_json(msg=result)
 
+    if wait:
+        result.update(_wait_transactions(module, hardware, check["id"], True))
+
     module.exit_json(changed=True, msg=result)
 
 
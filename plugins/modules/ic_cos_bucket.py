@@ -6,6 +6,9 @@
 
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import run_parallel
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import delete_objects
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import iter_keys
 from ibmcloud_python_sdk.cis.storage import bucket as sdk
 
 
@@ -76,6 +79,18 @@ options:
     description:
       - Container for describing the KMS-KP Key CRN.
     type: str
+  force:
+    description:
+      - Delete the objects and abort the pending multipart uploads of the
+        bucket before deleting it, only with C(state=absent). Objects are
+        deleted by batches of 1000 keys sent concurrently.
+    type: bool
+    default: false
+  workers:
+    description:
+      - Maximum number of batches deleted concurrently with C(force).
+    type: int
+    default: 10
   state:
     description:
       - Should the resource be present or absent.
@@ -100,9 +115,36 @@ EXAMPLES = r'''
   ic_cos_bucket:
     bucket: ibmcloud-bucket-baby
     state: absent
+
+- name: Delete a bucket and everything it contains
+  ic_cos_bucket:
+    bucket: ibmcloud-bucket-baby
+    force: true
+    state: absent
 '''
 
 
+def _empty(client, bucket, workers):
+    result = delete_objects(client, bucket, iter_keys(client, bucket),
+                            workers)
+
+    uploads = []
+    paginator = client.get_paginator("list_multipart_uploads")
+    for page in paginator.paginate(Bucket=bucket):
+        uploads.extend(page.get("Uploads", []))
+
+    aborted = run_parallel(
+        lambda upload: client.abort_multipart_upload(
+            Bucket=bucket, Key=upload["Key"], UploadId=upload["UploadId"]),
+        uploads, workers)
+    result["failed"].extend(
+        {"object": upload["Key"], "code": "unable_to_abort_upload",
+         "message": item["errors"][0]["message"]}
+        for upload, item in zip(uploads, aborted) if "errors" in item)
+
+    return result
+
+
 def run_module():
     module_args = dict(
         bucket=dict(
@@ -154,6 +196,14 @@ def run_module():
         ibm_sse_kp_customer_root_key_crn=dict(
             type='str',
             required=False),
+        force=dict(
+            type='bool',
+            default=False,
+            required=False),
+        workers=dict(
+            type='int',
+            default=10,
+            required=False),
         state=dict(
             type='str',
             default='present',
@@ -180,6 +230,8 @@ def run_module():
         "ibm_sse_kp_encryptions_algorithm"]
     ibm_sse_kp_customer_root_key_crn = module.params[
         "ibm_sse_kp_customer_root_key_crn"]
+    force = module.params["force"]
+    workers = module.params["workers"]
     state = module.params["state"]
 
     sdk_bucket = sdk.Bucket(
@@ -192,11 +244,26 @@ def run_module():
 
     if state == "absent":
         if "Name" in check:
+            payload = {"bucket": bucket, "status": "deleted"}
+            if force:
+                try:
+                    emptied = _empty(sdk_bucket.client, bucket, workers)
+                except Exception as error:
+                    module.fail_json(msg={"errors": [{
+                        "code": "unable_to_empty_bucket",
+                        "message": str(error)}]})
+
+                payload["deleted_objects"] = emptied["deleted"]
+                if emptied["failed"]:
+                    payload["status"] = "not_empty"
+                    payload["errors"] = emptied["failed"]
+                    module.fail_json(changed=bool(emptied["deleted"]),
+                                     msg=payload)
+
             result = sdk_bucket.delete_bucket(bucket)
             if "errors" in result:
                 module.fail_json(msg=result)
 
-            payload = {"bucket": bucket, "status": "deleted"}
             module.exit_json(changed=True, msg=payload)
 
         payload = {"bucket": bucket, "status": "not_found"}
@@ -3,7 +3,14 @@
 # GNU General Public License v3.0+
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cache import cached
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import run_parallel
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import endpoint_client
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import iter_objects
+from ibmcloud_python_sdk.cis.storage import object as sdk_object
 from ibmcloud_python_sdk.cis.storage import object_storage as sdk
+from ibmcloud_python_sdk.resource import resource_instance
+from ibmcloud_python_sdk.utils.object_regions import endpoints
 
 ANSIBLE_METADATA = {
     'metadata_version': '1.1',
@@ -19,6 +26,14 @@ author: James Regis (@jregis)
 version_added: "2.9"
 description:
     - Get a list of buckets hosted on IBM Cloud.
+    - When C(bucket) is set, list the objects of the bucket instead. The
+      listing is retrieved page by page and at most C(max_keys) objects
+      are returned in C(msg.objects), use C(msg.next_start_after) as
+      C(start_after) to get the next ones.
+    - With C(all_locations), the buckets of every location endpoint are
+      listed concurrently and merged with their location constraint.
+    - The list of buckets can be cached on the host running the module
+      with C(cache_ttl), the object listings are never cached.
 requirements:
     - "ibmcloud-python-sdk"
 options:
@@ -34,6 +49,60 @@ options:
             -  Name or UUID of the service_instance associated with the cloud
                object storage.
         required: true
+    bucket:
+        description:
+            -  Bucket whose objects are listed.
+        type: str
+    prefix:
+        description:
+            -  Only list the objects whose key starts with this prefix.
+        type: str
+    delimiter:
+        description:
+            -  Group the keys sharing the same prefix up to the delimiter,
+               the groups are returned in C(msg.prefixes) instead of
+               their objects.
+        type: str
+    max_keys:
+        description:
+            -  Maximum number of objects returned.
+        type: int
+        default: 1000
+    start_after:
+        description:
+            -  Only list the objects whose key comes after this one.
+        type: str
+    summarize:
+        description:
+            -  Walk the whole listing and return in C(msg.summary) the
+               number of objects and their total size for each prefix, up
+               to the delimiter or C(/). Objects right under C(prefix) are
+               counted in the C(prefix) entry.
+        type: bool
+        default: false
+    all_locations:
+        description:
+            -  List the buckets of every location instead of C(location).
+               The public endpoints are queried, or the direct ones if
+               C(mode) is a direct mode. C(msg.buckets) holds each bucket
+               with its location constraint and C(msg.locations) the
+               number of buckets per location constraint. The task fails
+               if any location can't be listed, C(msg.errors) then tells
+               which.
+        type: bool
+        default: false
+    workers:
+        description:
+            -  Maximum number of locations queried concurrently with
+               C(all_locations).
+        type: int
+        default: 10
+    cache_ttl:
+        description:
+            -  How long in seconds the list of buckets is kept in the
+               cache. C(0) disables the cache.
+        type: int
+        default: 0
 '''
 
 EXAMPLES = r'''
@@ -42,9 +111,151 @@ EXAMPLES = r'''
     mode: regional
     location: us-south
     service_instance: my-service-instance-baby
+
+# Get all buckets in the zone, at most once an hour
+- ic_cos_info:
+    mode: regional
+    location: us-south
+    service_instance: my-service-instance-baby
+    cache_ttl: 3600
+
+# Get the buckets of every location for a governance report
+- ic_cos_info:
+    mode: regional
+    service_instance: my-service-instance-baby
+    all_locations: true
+
+# List the first objects of a bucket
+- ic_cos_info:
+    mode: regional
+    location: us-south
+    service_instance: my-service-instance-baby
+    bucket: ibmcloud-bucket-baby
+    prefix: backups/
+    max_keys: 100
+
+# Count the objects and their size in each top level directory
+- ic_cos_info:
+    mode: regional
+    location: us-south
+    service_instance: my-service-instance-baby
+    bucket: ibmcloud-bucket-baby
+    summarize: true
+    max_keys: 0
 '''
 
 
+def _object(item):
+    return {
+        "key": item["Key"],
+        "size": item["Size"],
+        "etag": item["ETag"].strip('"'),
+        "last_modified": str(item["LastModified"]),
+    }
+
+
+def _inventory(service_instance_id, mode, workers):
+    direct = mode.startswith("direct_")
+    targets = [(name, location) for name in sorted(endpoints)
+               if name.startswith("direct_") == direct
+               for location in sorted(endpoints[name])]
+
+    # Clients are created here, creating them from the default session in
+    # the workers isn't thread safe
+    clients = []
+    for name, location in targets:
+        try:
+            clients.append(endpoint_client(service_instance_id, name,
+                                           location))
+        except Exception as error:
+            clients.append({"errors": [{"code": "unable_to_create_client",
+                                        "message": str(error)}]})
+
+    def _list(client):
+        if isinstance(client, dict):
+            return client
+        return client.list_buckets_extended()
+
+    results = run_parallel(_list, clients, workers)
+
+    buckets = {}
+    failed = []
+    for (name, location), result in zip(targets, results):
+        if "errors" in result:
+            failed.append({"mode": name, "location": location,
+                           "code": result["errors"][0]["code"],
+                           "message": result["errors"][0]["message"]})
+            continue
+
+        # Endpoints may return the buckets of other locations as well
+        for item in result.get("Buckets", []):
+            buckets.setdefault(item["Name"], {
+                "name": item["Name"],
+                "creation_date": str(item.get("CreationDate")),
+                "location_constraint": item.get("LocationConstraint"),
+            })
+
+    locations = {}
+    for bucket in buckets.values():
+        constraint = bucket["location_constraint"]
+        locations[constraint] = locations.get(constraint, 0) + 1
+
+    result = {"buckets": sorted(buckets.values(),
+                                key=lambda bucket: bucket["name"]),
+              "locations": locations}
+    if failed:
+        result["errors"] = failed
+
+    return result
+
+
+def _list_objects(client, bucket, prefix, delimiter, max_keys, start_after,
+                  summarize):
+    result = {"objects": [], "prefixes": [], "truncated": False}
+    summary = {}
+    prefixes = set()
+
+    # Summaries need every key, the delimiter is then applied locally
+    pages = iter_objects(client, bucket, prefix,
+                         None if summarize else delimiter, start_after)
+    for page in pages:
+        for item in page.get("CommonPrefixes", []):
+            prefixes.add(item["Prefix"])
+
+        for item in page.get("Contents", []):
+            name = item["Key"][len(prefix):]
+            if summarize:
+                # Objects right under the prefix are counted in its own entry
+                separator = delimiter or "/"
+                group = prefix
+                if separator in name:
+                    group += name.split(separator)[0] + separator
+                entry = summary.setdefault(group, {"count": 0, "size": 0})
+                entry["count"] += 1
+                entry["size"] += item["Size"]
+
+                if delimiter and delimiter in name:
+                    prefixes.add(group)
+                    continue
+
+            if len(result["objects"]) < max_keys:
+                result["objects"].append(_object(item))
+            else:
+                result["truncated"] = True
+
+        if result["truncated"] and not summarize:
+            break
+
+    if result["truncated"]:
+        result["next_start_after"] = result["objects"][-1]["key"] \
+            if result["objects"] else start_after
+    result["prefixes"] = sorted(prefixes)
+    if summarize:
+        result["summary"] = summary
+
+    return result
+
+
 def run_module():
     module_args = dict(
         mode=dict(
@@ -67,6 +278,39 @@ def run_module():
         service_instance=dict(
             type='str',
             required=True),
+        bucket=dict(
+            type='str',
+            required=False),
+        prefix=dict(
+            type='str',
+            default='',
+            required=False),
+        delimiter=dict(
+            type='str',
+            required=False),
+        max_keys=dict(
+            type='int',
+            default=1000,
+            required=False),
+        start_after=dict(
+            type='str',
+            required=False),
+        summarize=dict(
+            type='bool',
+            default=False,
+            required=False),
+        all_locations=dict(
+            type='bool',
+            default=False,
+            required=False),
+        workers=dict(
+            type='int',
+            default=10,
+            required=False),
+        cache_ttl=dict(
+            type='int',
+            default=0,
+            required=False),
     )
 
     module = AnsibleModule(
@@ -74,14 +318,53 @@ def run_module():
         supports_check_mode=False
     )
 
-    object_storage = sdk.ObjectStorage()
-
     mode = module.params['mode']
     location = module.params['location']
     service_instance = module.params["service_instance"]
+    bucket = module.params['bucket']
+
+    if bucket:
+        try:
+            client = sdk_object.Object(
+                        mode=mode,
+                        location=location,
+                        service_instance=service_instance
+                    ).client
+            result = _list_objects(client, bucket,
+                                   module.params['prefix'] or "",
+                                   module.params['delimiter'],
+                                   module.params['max_keys'],
+                                   module.params['start_after'],
+                                   module.params['summarize'])
+        except Exception as error:
+            module.fail_json(msg={"errors": [{
+                "code": "unable_to_list_objects", "message": str(error)}]})
+
+        module.exit_json(changed=False, msg=result)
+
+    if module.params['all_locations']:
+        instance = resource_instance.ResourceInstance().get_resource_instance(
+            service_instance)
+        if "errors" in instance:
+            module.fail_json(msg=instance)
+
+        result, _ = cached(
+            "ic_cos_bucket_info", ["all_locations", mode, service_instance],
+            module.params['cache_ttl'],
+            lambda: _inventory(instance["id"], mode,
+                               module.params['workers']))
+        if "errors" in result:
+            module.fail_json(msg=result)
+
+        module.exit_json(changed=False, msg=result)
+
+    object_storage = sdk.ObjectStorage()
 
-    check = object_storage.get_buckets(mode=mode, location=location,
-                                       service_instance=service_instance)
+    check, _ = cached(
+        "ic_cos_bucket_info", [mode, location, service_instance],
+        module.params['cache_ttl'],
+        lambda: object_storage.get_buckets(
+            mode=mode, location=location, service_instance=service_instance))
 
     if "errors" in check:
         for key in check["errors"]:
@@ -92,7 +375,7 @@ def run_module():
                     "The service instance {} doesn't exist".format(
                         service_instance)))
 
-    module.exit_json(changed=True, msg=(check))
+    module.exit_json(changed=False, msg=(check))
 
 
 def main():
@@ -5,7 +5,24 @@
 # (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
 
+import hashlib
+import os
 from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.urls import open_url
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import run_parallel
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import MIB
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import copy_object
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import delete_objects
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import download
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import file_checksums
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import head_object
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import iter_keys
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import multipart_upload
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import part_size_for
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import put_file
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import same_content
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import same_object
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import stream_upload
 from ibmcloud_python_sdk.cis.storage import object as sdk
 
 
@@ -22,7 +39,15 @@ short_description: Manage COS (Cloud Object Storage) objects on IBM Cloud.
 author: James Regis (@jregis)
 version_added: "2.9"
 description:
-  - This module create or delete COS objects.
+  - This module create, download or delete COS objects.
+  - With C(state=absent), many objects can be deleted at once by listing
+    them in C(objects) or by C(prefix), they are deleted by batches of 1000
+    keys sent concurrently.
+  - With C(url), the content is streamed from an HTTP(S) server into a
+    multipart upload without being stored on the controller.
+  - With C(src_bucket), objects are copied server side from another bucket,
+    the content never goes through the controller. Large objects are
+    copied by parts sent concurrently.
   - By default the module will look for an existing service instance associated
     to the Cloud Object Storage.
 requirements:
@@ -43,11 +68,68 @@ options:
       - Path to the file to upload.
       - Mutually exclusive with C(body) argument.
     type: str
+  url:
+    description:
+      - HTTP(S) URL to upload the content from. It is streamed in parts
+        sent concurrently, at most C(max_concurrency) parts are held in
+        memory.
+      - The upload is skipped if the object has been uploaded from the same
+        URL and the server still returns the same C(ETag) or
+        C(Last-Modified) header.
+      - Mutually exclusive with C(path), C(body) and C(dest) arguments.
+    type: str
+  checksum:
+    description:
+      - Expected checksum of the content downloaded from C(url), in the
+        C(<algorithm>:<digest>) format, e.g. C(sha256:9d86...). The upload
+        is aborted if it doesn't match.
+    type: str
+  url_timeout:
+    description:
+      - Timeout in seconds of the C(url) requests.
+    type: int
+    default: 30
+  validate_certs:
+    description:
+      - Validate the SSL certificate of C(url).
+    type: bool
+    default: true
+  dest:
+    description:
+      - Path where to download the object. When set, the object is
+        downloaded instead of uploaded.
+      - The download is skipped if the file already holds the object
+        content.
+      - Mutually exclusive with C(path) and C(body) arguments.
+    type: str
   object:
     description:
       - Name to set once the object is uploaded.
     type: str
-    required: true
+  objects:
+    description:
+      - Keys of the objects to delete with C(state=absent), or to copy
+        with C(src_bucket).
+    type: list
+  prefix:
+    description:
+      - Delete with C(state=absent), or copy with C(src_bucket), all the
+        objects whose key starts with this prefix. An empty string selects
+        every object of the bucket.
+    type: str
+  src_bucket:
+    description:
+      - Bucket to copy the objects from, they keep the same key unless
+        C(src_object) is set. Both buckets must be reachable from the
+        C(mode) and C(location) endpoint.
+      - Objects already holding the source content are not copied again
+        unless C(force) is set.
+    type: str
+  src_object:
+    description:
+      - Key of the source object copied to C(object). Defaults to
+        C(object).
+    type: str
   mode:
     description:
       - Replication mode of the buckets.
@@ -60,6 +142,35 @@ options:
     description:
       - Name or GUID of the service instance.
     type: str
+  multipart_threshold:
+    description:
+      - Size in MiB from which C(path) is uploaded in parts sent
+        concurrently, C(dest) is downloaded by ranges retrieved
+        concurrently, or objects are copied by parts.
+      - An interrupted multipart upload is resumed by the next run, the
+        parts already sent are not sent again.
+    type: int
+    default: 100
+  part_size:
+    description:
+      - Size in MiB of each part of a multipart upload or each range of a
+        download. It is increased if the file would need more than 10000
+        parts.
+    type: int
+    default: 64
+  max_concurrency:
+    description:
+      - Maximum number of parts uploaded, ranges downloaded, objects or
+        parts copied, or batches deleted concurrently.
+    type: int
+    default: 10
+  force:
+    description:
+      - Upload or download the content even if the destination already
+        holds it. By default the object checksum is compared with the local
+        one and the transfer is skipped when they match.
+    type: bool
+    default: false
   state:
     description:
       - Should the resource be present or absent.
@@ -90,13 +201,119 @@ EXAMPLES = r'''
     object: ibmcloud-object-baby
     path: /home/ibmcloud/download/watson.png
 
+- name: Upload a large image with 128 MiB parts, 16 at a time
+  ic_cos_object:
+    bucket: ibmcloud-bucket-baby
+    object: ubuntu-18.04.qcow2
+    path: /home/ibmcloud/download/ubuntu-18.04.qcow2
+    part_size: 128
+    max_concurrency: 16
+
+- name: Import an image straight from its download URL
+  ic_cos_object:
+    bucket: ibmcloud-bucket-baby
+    object: cirros-0.5.1-x86_64.qcow2
+    url: https://download.cirros-cloud.net/0.5.1/cirros-0.5.1-x86_64-disk.img
+    checksum: "sha256:{{ cirros_sha256 }}"
+
+- name: Download a backup
+  ic_cos_object:
+    bucket: ibmcloud-bucket-baby
+    object: backups/db.tar.gz
+    dest: /srv/restore/db.tar.gz
+
+- name: Promote the images from staging to production
+  ic_cos_object:
+    bucket: ibmcloud-bucket-prod-baby
+    src_bucket: ibmcloud-bucket-staging-baby
+    prefix: images/
+
 - name: Delete object from a bucket
   ic_cos_object:
     bucket: ibmcloud-bucket-baby
     object: ibmcloud-object-baby
+    state: absent
+
+- name: Delete the nightly builds
+  ic_cos_object:
+    bucket: ibmcloud-bucket-baby
+    prefix: nightly/
+    state: absent
+
+- name: Empty a bucket before deleting it
+  ic_cos_object:
+    bucket: ibmcloud-bucket-baby
+    prefix: ""
+    max_concurrency: 20
+    state: absent
 '''
 
 
+def _batches(keys, size=1000):
+    batch = []
+    for key in keys:
+        batch.append(key)
+        if len(batch) == size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def _copy(client, src_bucket, src_key, bucket, key, head, force, part_size,
+          threshold, workers, acl):
+    if not force:
+        current = head_object(client, bucket, key)
+        if "errors" not in current and same_object(head, current):
+            return {"object": key, "bucket": bucket, "status": "unchanged"}
+
+    return copy_object(client, src_bucket, src_key, bucket, key, head,
+                       part_size, threshold, workers=workers, acl=acl)
+
+
+def _copy_many(client, src_bucket, bucket, keys, force, part_size,
+               threshold, workers, acl):
+    payload = {"bucket": bucket, "src_bucket": src_bucket, "copied": 0,
+               "unchanged": 0, "errors": []}
+
+    for batch in _batches(keys):
+        heads = run_parallel(lambda key: head_object(client, src_bucket, key),
+                             batch, workers)
+        small = []
+        large = []
+        for key, head in zip(batch, heads):
+            if "errors" in head:
+                payload["errors"].append({"object": key,
+                                          "errors": head["errors"]})
+            elif head["ContentLength"] < threshold:
+                small.append((key, head))
+            else:
+                large.append((key, head))
+
+        # Large objects are copied one at a time, their parts are already
+        # copied concurrently
+        results = run_parallel(
+            lambda item: _copy(client, src_bucket, item[0], bucket, item[0],
+                               item[1], force, part_size, threshold, 1, acl),
+            small, workers) + run_parallel(
+            lambda item: _copy(client, src_bucket, item[0], bucket, item[0],
+                               item[1], force, part_size, threshold, workers,
+                               acl),
+            large, 1)
+
+        for (key, _), result in zip(small + large, results):
+            if "errors" in result:
+                payload["errors"].append({"object": key,
+                                          "errors": result["errors"]})
+            elif result["status"] == "unchanged":
+                payload["unchanged"] += 1
+            else:
+                payload["copied"] += 1
+
+    return payload
+
+
 def run_module():
     module_args = dict(
         body=dict(
@@ -105,9 +322,38 @@ def run_module():
         object=dict(
             type='str',
             required=False),
+        objects=dict(
+            type='list',
+            required=False),
+        prefix=dict(
+            type='str',
+            required=False),
+        src_bucket=dict(
+            type='str',
+            required=False),
+        src_object=dict(
+            type='str',
+            required=False),
         path=dict(
             type='str',
             required=False),
+        url=dict(
+            type='str',
+            required=False),
+        checksum=dict(
+            type='str',
+            required=False),
+        url_timeout=dict(
+            type='int',
+            default=30,
+            required=False),
+        validate_certs=dict(
+            type='bool',
+            default=True,
+            required=False),
+        dest=dict(
+            type='str',
+            required=False),
         bucket=dict(
             type='str',
             required=True),
@@ -139,6 +385,22 @@ def run_module():
         service_instance=dict(
             type='str',
             required=False),
+        multipart_threshold=dict(
+            type='int',
+            default=100,
+            required=False),
+        part_size=dict(
+            type='int',
+            default=64,
+            required=False),
+        max_concurrency=dict(
+            type='int',
+            default=10,
+            required=False),
+        force=dict(
+            type='bool',
+            default=False,
+            required=False),
         state=dict(
             type='str',
             default='present',
@@ -152,13 +414,24 @@ def run_module():
     )
 
     object = module.params['object']
+    objects = module.params['objects']
+    prefix = module.params['prefix']
+    src_bucket = module.params['src_bucket']
+    src_object = module.params['src_object']
     path = module.params['path']
+    url = module.params['url']
+    checksum = module.params['checksum']
+    dest = module.params['dest']
     body = module.params['body']
     acl = module.params['acl']
     bucket = module.params['bucket']
     mode = module.params['mode']
     location = module.params['location']
     service_instance = module.params["service_instance"]
+    multipart_threshold = module.params["multipart_threshold"] * MIB
+    part_size = module.params["part_size"] * MIB
+    max_concurrency = module.params["max_concurrency"]
+    force = module.params["force"]
     state = module.params["state"]
 
     sdk_object = sdk.Object(
@@ -167,11 +440,82 @@ def run_module():
                     service_instance=service_instance
                 )
 
-    if path and body:
-        msg = "path and body are mutually exclusive"
+    if len([arg for arg in (path, body, dest, url) if arg]) > 1:
+        msg = "path, body, dest and url are mutually exclusive"
+        module.fail_json(changed=False, msg=msg)
+
+    if checksum:
+        algorithm, _, digest = checksum.partition(":")
+        if algorithm.lower() not in hashlib.algorithms_available or \
+                not digest:
+            msg = "checksum must be <algorithm>:<digest>"
+            module.fail_json(changed=False, msg=msg)
+        checksum = (algorithm.lower(), digest)
+
+    if objects is not None and prefix is not None:
+        msg = "objects and prefix are mutually exclusive"
         module.fail_json(changed=False, msg=msg)
 
-    if state == "absent":
+    if state == "present" and src_bucket:
+        if path or body or dest or url:
+            msg = "src_bucket is mutually exclusive with path, body, dest " \
+                  "and url"
+            module.fail_json(changed=False, msg=msg)
+
+        if objects is None and prefix is None:
+            src_object = src_object or object
+            head = head_object(sdk_object.client, src_bucket, src_object)
+            if "errors" in head:
+                module.fail_json(msg=head)
+
+            result = _copy(sdk_object.client, src_bucket, src_object, bucket,
+                           object, head, force, part_size,
+                           multipart_threshold, max_concurrency, acl)
+            if "errors" in result:
+                module.fail_json(msg=result)
+
+            module.exit_json(changed=result["status"] != "unchanged",
+                             msg=result)
+
+        keys = objects
+        if keys is None:
+            keys = iter_keys(sdk_object.client, src_bucket, prefix)
+
+        try:
+            payload = _copy_many(sdk_object.client, src_bucket, bucket, keys,
+                                 force, part_size, multipart_threshold,
+                                 max_concurrency, acl)
+        except Exception as error:
+            module.fail_json(msg={"errors": [{
+                "code": "unable_to_list_objects", "message": str(error)}]})
+
+        if payload["errors"]:
+            module.fail_json(changed=bool(payload["copied"]), msg=payload)
+
+        del payload["errors"]
+        module.exit_json(changed=bool(payload["copied"]), msg=payload)
+
+    if state == "absent" and (objects is not None or prefix is not None):
+
+        keys = objects
+        if keys is None:
+            keys = iter_keys(sdk_object.client, bucket, prefix)
+
+        try:
+            result = delete_objects(sdk_object.client, bucket, keys,
+                                    workers=max_concurrency)
+        except Exception as error:
+            module.fail_json(msg={"errors": [{
+                "code": "unable_to_list_objects", "message": str(error)}]})
+
+        payload = {"bucket": bucket, "deleted": result["deleted"],
+                   "status": "deleted"}
+        if result["failed"]:
+            payload["errors"] = result["failed"]
+            module.fail_json(changed=bool(result["deleted"]), msg=payload)
+
+        module.exit_json(changed=bool(result["deleted"]), msg=payload)
+    elif state == "absent":
         check = sdk_object.get_object(bucket, object)
         if "Key" in check:
             result = sdk_object.delete_object(bucket, object)
@@ -183,14 +527,128 @@ def run_module():
 
         payload = {"object": object, "bucket": bucket, "status": "not_found"}
         module.exit_json(changed=False, msg=payload)
+    elif url:
+        try:
+            response = open_url(url, timeout=module.params['url_timeout'],
+                                validate_certs=module.params[
+                                    'validate_certs'])
+        except Exception as error:
+            module.fail_json(msg={"errors": [{
+                "code": "unable_to_open_url", "message": str(error)}]})
+
+        version = response.headers.get("ETag") or \
+            response.headers.get("Last-Modified")
+        length = response.headers.get("Content-Length")
+
+        if version and not force:
+            head = head_object(sdk_object.client, bucket, object)
+            metadata = head.get("Metadata", {})
+            if "errors" not in head and \
+                    metadata.get("source-url") == url and \
+                    metadata.get("source-version") == version and \
+                    (not length or int(length) == head["ContentLength"]):
+                response.close()
+                payload = {"object": object, "bucket": bucket,
+                           "status": "unchanged"}
+                module.exit_json(changed=False, msg=payload)
+
+        if length:
+            part_size = part_size_for(int(length), part_size)
+
+        metadata = {"source-url": url}
+        if version:
+            metadata["source-version"] = version
+
+        try:
+            result = stream_upload(
+                sdk_object.client,
+                bucket,
+                object,
+                response,
+                part_size,
+                workers=max_concurrency,
+                acl=acl,
+                metadata=metadata,
+                checksum=checksum
+            )
+        finally:
+            response.close()
+
+        if "errors" in result:
+            module.fail_json(msg=result)
+
+        module.exit_json(changed=True, msg=result)
+    elif dest:
+        head = head_object(sdk_object.client, bucket, object)
+        if "errors" in head:
+            module.fail_json(msg=head)
+
+        if not force and os.path.isfile(dest) and \
+                os.path.getsize(dest) == head["ContentLength"]:
+            checksums = file_checksums(
+                dest, part_size_for(head["ContentLength"], part_size))
+            if same_content(head, checksums):
+                payload = {"object": object, "bucket": bucket, "path": dest,
+                           "status": "unchanged"}
+                module.exit_json(changed=False, msg=payload)
+
+        result = download(
+            sdk_object.client,
+            bucket,
+            object,
+            dest,
+            head,
+            part_size,
+            multipart_threshold,
+            workers=max_concurrency
+        )
+
+        if "errors" in result:
+            module.fail_json(msg=result)
+
+        module.exit_json(changed=True, msg=result)
     else:
-        result = None
+        checksums = None
         if path:
-            result = sdk_object.upload_file(
-                key=object,
-                bucket=bucket,
-                path=path,
-                acl=acl
+            size = os.path.getsize(path)
+            checksums = file_checksums(path, part_size_for(size, part_size))
+        elif body:
+            md5 = hashlib.md5(body.encode("utf-8")).hexdigest()
+            checksums = {"size": len(body.encode("utf-8")), "md5": md5,
+                         "etag": md5}
+
+        if checksums and not force:
+            head = head_object(sdk_object.client, bucket, object)
+            if "errors" not in head and same_content(head, checksums):
+                payload = {"object": object, "bucket": bucket,
+                           "status": "unchanged"}
+                module.exit_json(changed=False, msg=payload)
+
+        result = None
+        if path and size >= multipart_threshold:
+            result = multipart_upload(
+                sdk_object.client,
+                bucket,
+                object,
+                path,
+                part_size,
+                workers=max_concurrency,
+                acl=acl,
+                md5=checksums["md5"]
+            )
+
+            if "errors" in result:
+                module.fail_json(msg=result)
+        elif path:
+            # The SDK upload_file switches to its own multipart transfer and
+            # stores no checksum, the next run couldn't tell it's unchanged
+            result = put_file(
+                sdk_object.client,
+                bucket,
+                object,
+                path,
+                acl=acl,
+                md5=checksums["md5"]
             )
 
             if "errors" in result:
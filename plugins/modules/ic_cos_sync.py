@@ -0,0 +1,403 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+import fnmatch
+import hashlib
+import json
+import os
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import run_parallel
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import MIB
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import delete_objects
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import file_checksums
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import iter_objects
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import multipart_upload
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import part_size_for
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_cos import put_file
+from ibmcloud_python_sdk.cis.storage import object as sdk
+
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = r'''
+---
+module: ic_cos_sync
+short_description: Synchronize a directory to a COS (Cloud Object Storage)
+                   bucket on IBM Cloud.
+author: Gaëtan Trellu (@goldyfruit)
+version_added: "2.9"
+description:
+  - Upload the files of a local directory which are missing or different in
+    a bucket, and optionally delete the objects which don't exist locally.
+  - The bucket prefix is listed once. Files whose size and modification
+    time didn't change since the last synchronization and whose object
+    ETag is the one recorded in the index are skipped without being read,
+    the others are compared by checksum.
+  - By default the module will look for an existing service instance
+    associated to the Cloud Object Storage.
+requirements:
+  - "ibmcloud-python-sdk"
+options:
+  bucket:
+    description:
+      - Bucket name.
+    type: str
+    required: true
+  src:
+    description:
+      - Local directory to synchronize.
+    type: path
+    required: true
+  prefix:
+    description:
+      - Prefix prepended to the relative path of each file to build the
+        object key, include the trailing slash if any.
+    type: str
+    default: ""
+  include:
+    description:
+      - Only synchronize the files whose relative path matches one of these
+        glob patterns.
+    type: list
+  exclude:
+    description:
+      - Don't synchronize the files whose relative path matches one of
+        these glob patterns.
+    type: list
+  delete:
+    description:
+      - Delete the objects under C(prefix) which don't exist locally.
+        Objects matching C(exclude) or not matching C(include) are kept.
+    type: bool
+    default: false
+  index_file:
+    description:
+      - Path of the index recording the size, modification time and ETag
+        of the files synchronized. Defaults to a file under
+        C(~/.ansible/cos_sync) specific to the bucket, prefix and source.
+    type: path
+  multipart_threshold:
+    description:
+      - Size in MiB from which files are uploaded in parts sent
+        concurrently.
+    type: int
+    default: 100
+  part_size:
+    description:
+      - Size in MiB of each part of a multipart upload.
+    type: int
+    default: 64
+  workers:
+    description:
+      - Maximum number of concurrent transfers.
+    type: int
+    default: 10
+  mode:
+    description:
+      - Replication mode of the buckets.
+    type: str
+  location:
+    description:
+      - Geographic bucket location.
+    type: str
+  service_instance:
+    description:
+      - Name or GUID of the service instance.
+    type: str
+'''
+
+EXAMPLES = r'''
+- name: Publish the static site
+  ic_cos_sync:
+    bucket: ibmcloud-bucket-baby
+    src: /srv/site/public
+    prefix: site/
+    delete: true
+
+- name: Upload the build artifacts except the debug symbols
+  ic_cos_sync:
+    bucket: ibmcloud-bucket-baby
+    src: /srv/build/dist
+    prefix: "builds/{{ build_id }}/"
+    exclude:
+      - "*.debug"
+      - "tmp/*"
+    workers: 32
+'''
+
+
+def _selected(name, include, exclude):
+    if include and not any(fnmatch.fnmatch(name, pattern)
+                           for pattern in include):
+        return False
+
+    return not any(fnmatch.fnmatch(name, pattern) for pattern in exclude)
+
+
+def _local_files(src, include, exclude):
+    files = {}
+    for root, _, names in os.walk(src):
+        for name in names:
+            path = os.path.join(root, name)
+            relative = os.path.relpath(path, src).replace(os.sep, "/")
+            if not _selected(relative, include, exclude):
+                continue
+
+            stat = os.stat(path)
+            files[relative] = {"path": path, "size": stat.st_size,
+                               "mtime": stat.st_mtime}
+
+    return files
+
+
+def _remote_objects(client, bucket, prefix):
+    objects = {}
+    for page in iter_objects(client, bucket, prefix):
+        for item in page.get("Contents", []):
+            objects[item["Key"]] = {"size": item["Size"],
+                                    "etag": item["ETag"].strip('"')}
+
+    return objects
+
+
+def _index_path(bucket, prefix, src):
+    name = hashlib.sha1("{}/{}:{}".format(
+        bucket, prefix, os.path.abspath(src)).encode("utf-8")).hexdigest()
+    return os.path.join(os.path.expanduser("~"), ".ansible", "cos_sync",
+                        "{}.json".format(name))
+
+
+def _load_index(path):
+    try:
+        with open(path) as stream:
+            return json.load(stream)
+    except (IOError, OSError, ValueError):
+        return {}
+
+
+def _save_index(path, index):
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    tmp = "{}.tmp".format(path)
+    with open(tmp, "w") as stream:
+        json.dump(index, stream)
+    os.replace(tmp, path)
+
+
+def run_module():
+    module_args = dict(
+        bucket=dict(
+            type='str',
+            required=True),
+        src=dict(
+            type='path',
+            required=True),
+        prefix=dict(
+            type='str',
+            default='',
+            required=False),
+        include=dict(
+            type='list',
+            required=False),
+        exclude=dict(
+            type='list',
+            required=False),
+        delete=dict(
+            type='bool',
+            default=False,
+            required=False),
+        index_file=dict(
+            type='path',
+            required=False),
+        multipart_threshold=dict(
+            type='int',
+            default=100,
+            required=False),
+        part_size=dict(
+            type='int',
+            default=64,
+            required=False),
+        workers=dict(
+            type='int',
+            default=10,
+            required=False),
+        mode=dict(
+            type='str',
+            choices=['regional', 'direct_regional', 'cross_region',
+                     'direct_us_cross_region', 'direct_eu_cross_region',
+                     'direct_ap_cross_region', 'single_data_center',
+                     'direct_single_data_center'],
+            default='regional',
+            required=False),
+        location=dict(
+            type='str',
+            choices=['us-south', 'us-east', 'eu-united-kingdom', 'eu-germany',
+                     'ap-autralia', 'ap-japan', 'us-cross-region',
+                     'eu-cross-region', 'ap-cross-region', 'us', 'dallas',
+                     'san-jose', 'eu', 'amsterdam', 'frankfurt', 'milan', 'ap',
+                     'tokyo', 'seoul', 'hong-kong', 'chennai', 'melbourne',
+                     'mexico', 'montreal', 'oslo', 'paris', 'sao-paulo',
+                     'seoul', 'singapore', 'toronto'],
+            default='us-south',
+            required=False),
+        service_instance=dict(
+            type='str',
+            required=False),
+    )
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=False
+    )
+
+    bucket = module.params['bucket']
+    src = module.params['src']
+    prefix = module.params['prefix'] or ""
+    include = module.params['include'] or []
+    exclude = module.params['exclude'] or []
+    delete = module.params['delete']
+    multipart_threshold = module.params['multipart_threshold'] * MIB
+    part_size = module.params['part_size'] * MIB
+    workers = module.params['workers']
+    index_file = module.params['index_file'] or _index_path(bucket, prefix,
+                                                            src)
+
+    if not os.path.isdir(src):
+        module.fail_json(msg="{} is not a directory".format(src))
+
+    client = sdk.Object(
+                mode=module.params['mode'],
+                location=module.params['location'],
+                service_instance=module.params['service_instance']
+            ).client
+
+    files = _local_files(src, include, exclude)
+    try:
+        remote = _remote_objects(client, bucket, prefix)
+    except Exception as error:
+        module.fail_json(msg={"errors": [{"code": "unable_to_list_objects",
+                                          "message": str(error)}]})
+    index = _load_index(index_file)
+
+    uploads = []
+    checks = []
+    for name, local in files.items():
+        item = remote.get(prefix + name)
+        entry = index.get(name, {})
+        if not item or item["size"] != local["size"]:
+            uploads.append(name)
+        elif entry.get("size") == local["size"] and \
+                entry.get("mtime") == local["mtime"] and \
+                entry.get("etag") == item["etag"]:
+            continue
+        else:
+            checks.append(name)
+
+    # Files touched since the last run but holding the same content
+    def _checksums(name):
+        local = files[name]
+        return file_checksums(local["path"],
+                              part_size_for(local["size"], part_size))
+
+    for name, checksums in zip(checks, run_parallel(_checksums, checks,
+                                                    workers)):
+        etag = remote[prefix + name]["etag"]
+        if "errors" in checksums or \
+                etag not in [checksums["md5"], checksums["etag"]]:
+            uploads.append(name)
+        else:
+            index[name] = dict(size=files[name]["size"],
+                               mtime=files[name]["mtime"], etag=etag)
+
+    # Objects get the same md5 metadata as the ones uploaded by
+    # ic_cos_object so both modules can compare them
+    def _upload(name):
+        local = files[name]
+        checksums = _checksums(name)
+        if "errors" in checksums:
+            return checksums
+
+        if local["size"] >= multipart_threshold:
+            result = multipart_upload(client, bucket, prefix + name,
+                                      local["path"], part_size, workers,
+                                      md5=checksums["md5"])
+            if "errors" in result:
+                return result
+            return {"etag": checksums["etag"]}
+
+        result = put_file(client, bucket, prefix + name, local["path"],
+                          md5=checksums["md5"])
+        if "errors" in result:
+            return result
+        return {"etag": checksums["md5"]}
+
+    # Large files are sent one at a time, their parts are already sent
+    # concurrently
+    small = [name for name in uploads
+             if files[name]["size"] < multipart_threshold]
+    large = [name for name in uploads
+             if files[name]["size"] >= multipart_threshold]
+    results = run_parallel(_upload, small, workers) + \
+        run_parallel(_upload, large, 1)
+
+    payload = {"uploaded": [], "deleted": [],
+               "unchanged": len(files) - len(uploads)}
+    errors = []
+    for name, result in zip(small + large, results):
+        if "errors" in result:
+            errors.append({"object": prefix + name,
+                           "errors": result["errors"]})
+            continue
+
+        payload["uploaded"].append(prefix + name)
+        index[name] = dict(size=files[name]["size"],
+                           mtime=files[name]["mtime"], etag=result["etag"])
+
+    if delete:
+        keys = [key for key in remote if key[len(prefix):] not in files and
+                _selected(key[len(prefix):], include, exclude)]
+        try:
+            result = delete_objects(client, bucket, keys, workers)
+        except Exception as error:
+            result = {"failed": [{"object": key,
+                                  "code": "unable_to_delete_objects",
+                                  "message": str(error)} for key in keys]}
+
+        failed = set(item["object"] for item in result["failed"])
+        errors.extend({"object": item["object"], "errors": [{
+            "code": item["code"], "message": item["message"]}]}
+            for item in result["failed"])
+        payload["deleted"].extend(key for key in keys if key not in failed)
+
+    try:
+        _save_index(index_file, dict((name, entry)
+                                     for name, entry in index.items()
+                                     if name in files))
+    except (IOError, OSError) as error:
+        errors.append({"index_file": index_file, "errors": [{
+            "code": "unable_to_save_index", "message": str(error)}]})
+
+    changed = bool(payload["uploaded"] or payload["deleted"])
+    if errors:
+        payload["errors"] = errors
+        module.fail_json(changed=changed, msg=payload)
+
+    module.exit_json(changed=changed, msg=payload)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -5,9 +5,9 @@
 # (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
 
-from email.policy import default
-from random import choices
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_job import job_handle
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import wait_until
 from ibmcloud_python_sdk.vpc import baremetal as sdk
 
 
@@ -27,6 +27,8 @@ description:
   - The prototype object is structured in the same way as a retrieved instance,
     and contains the information necessary to provision the new instance. The
     instance is automatically started.
+  - Without C(wait), the creation returns a C(msg.job) handle which can be
+    followed with M(ic_job_status) along with many others.
 requirements:
   - "ibmcloud-python-sdk"
 options:
@@ -171,6 +173,32 @@ options:
     type: boolean
     choice: [true, false]
     default: false
+  wait:
+    description:
+      - Wait until the server reaches the final state of the task, C(running)
+        for C(present), C(poweredon) and C(restart), C(stopped) for
+        C(poweredoff), or deleted for C(absent).
+      - With C(state=absent) a running server is always stopped and waited
+        for before being deleted, this option only controls the wait for
+        the deletion itself.
+    type: bool
+    default: false
+  wait_timeout:
+    description:
+      - How long to wait in seconds for each step.
+    type: int
+    default: 1800
+  wait_delay:
+    description:
+      - First polling interval in seconds, the interval then grows
+        exponentially with jitter.
+    type: int
+    default: 5
+  wait_max_delay:
+    description:
+      - Maximum polling interval in seconds.
+    type: int
+    default: 60
   state:
     description:
       - Should the resource be present or absent.
@@ -223,8 +251,79 @@ EXAMPLES = r'''
     instance: ibmcloud-vsi-baby
     state: absent
     force: true
+    wait: true
+
+- name: Power off baremetal server and wait until it is stopped
+  ic_is_baremetal:
+    instance: ibm-baremetal-baby
+    state: poweredoff
+    wait: true
 '''
 
+# Statuses the server goes through on its own before settling
+TRANSIENT = ["pending", "starting", "stopping", "restarting"]
+
+
+def _wait_server(module, bm_instance, server_id, ready, step):
+    result, done = wait_until(
+        lambda: bm_instance.get_server_by_id(server_id),
+        lambda server: "errors" in server or ready(server),
+        module.params["wait_timeout"],
+        delay=module.params["wait_delay"],
+        max_delay=module.params["wait_max_delay"])
+
+    if not done:
+        module.fail_json(msg={"errors": [{
+            "code": "timeout",
+            "message": "timeout waiting for the server to be {}".format(
+                step)}], "instance": result})
+
+    return result
+
+
+def _wait_status(module, bm_instance, server_id, status):
+    result = _wait_server(
+        module, bm_instance, server_id,
+        lambda server: server["status"] in (status, "failed"), status)
+
+    if "errors" in result:
+        module.fail_json(msg=result)
+    if result["status"] != status:
+        module.fail_json(msg={"errors": [{
+            "code": "failed",
+            "message": "server status is {}".format(result["status"])}],
+            "instance": result})
+
+    return result
+
+
+def _power(module, bm_instance, server, action, status, action_type=None):
+    # Let the server settle before acting on it, actions are rejected
+    # during transitions
+    if server["status"] in TRANSIENT:
+        server = _wait_server(
+            module, bm_instance, server["id"],
+            lambda server: server["status"] not in TRANSIENT, "settled")
+        if "errors" in server:
+            module.fail_json(msg=server)
+
+    if server["status"] == "failed":
+        module.fail_json(msg={"errors": [{
+            "code": "failed", "message": "server status is failed"}],
+            "instance": server})
+
+    if server["status"] == status and action != "restart":
+        return server, False
+
+    result = bm_instance.create_server_action(
+        server=server["id"],
+        action=action,
+        type=action_type)
+    if "errors" in result:
+        module.fail_json(msg=result)
+
+    return server, True
+
 
 def run_module():
     module_args = dict(
@@ -343,10 +442,27 @@ def run_module():
             choices=[True, False],
             required=False,
             default=False),
+        wait=dict(
+            type='bool',
+            default=False,
+            required=False),
+        wait_timeout=dict(
+            type='int',
+            default=1800,
+            required=False),
+        wait_delay=dict(
+            type='int',
+            default=5,
+            required=False),
+        wait_max_delay=dict(
+            type='int',
+            default=60,
+            required=False),
         state=dict(
             type='str',
             default='present',
-            choices=['absent', 'present'],
+            choices=['absent', 'present', 'poweredon', 'poweredoff',
+                     'restart'],
             required=False),
     )
 
@@ -372,78 +488,82 @@ def run_module():
     force = module.params['force']
     state = module.params["state"]
 
+    wait = module.params["wait"]
+
     check = bm_instance.get_server(instance)
 
     if state == "absent":
         if "id" in check:
-            if check["status"] == "running":
-                stop_instance = bm_instance.create_server_action(
-                    server=instance,
-                    action="stop",
-                    type="hard")
-                if "errors" in stop_instance:
-                    module.fail_json(msg=stop_instance)
-
-            # wait until stop and after launch deletation
-            result = bm_instance.delete_server(instance)
-            if "errors" in result:
-                module.fail_json(msg=result)
+            if check["status"] != "deleting":
+                # The server must be stopped before it can be deleted
+                if check["status"] not in ("stopped", "failed"):
+                    check, changed = _power(module, bm_instance, check,
+                                            "stop", "stopped", "hard")
+                    if changed:
+                        _wait_status(module, bm_instance, check["id"],
+                                     "stopped")
+
+                result = bm_instance.delete_server(check["id"])
+                if "errors" in result:
+                    module.fail_json(msg=result)
+
+            if wait:
+                result = _wait_server(module, bm_instance, check["id"],
+                                      lambda server: False, "deleted")
+                if result["errors"][0].get("code") != "not_found":
+                    module.fail_json(msg=result)
 
             payload = {"instance": instance, "status": "deleted"}
             module.exit_json(changed=True, msg=payload)
 
         payload = {"instance": instance, "status": "not_found"}
         module.exit_json(changed=False, msg=payload)
-    else:
-        if "id" in check and state == "poweredon":
-            check_state = bm_instance.get_server(instance)[
-                "status"]
-            if "errors" in check_state:
-                module.fail_json(msg=result)
-            start_instance = bm_instance.create_server_action(
-                server=instance,
-                action="start")
-            if "errors" in start_instance:
-                module.fail_json(msg=start_instance)
-
-        if "id" in check and state == "poweredoff":
-            if force:
-                action_type = "hard"
-            else:
-                action_type = "soft"
-            check_state = bm_instance.get_server(instance)[
-                "status"]
-            if "errors" in check_state:
-                module.fail_json(msg=result)
-            stop_instance = bm_instance.create_server_action(
-                server=instance,
-                action=action_type)
-            if "errors" in stop_instance:
-                module.fail_json(msg=stop_instance)
-
-        if "id" in check and state == "present":
-            module.exit_json(changed=False, msg=check)
-
-        if not id in check:
-            result = bm_instance.create_server(
-                name=instance,
-                keys=keys,
-                profile=profile,
-                network_interfaces=network_interfaces,
-                resource_group=resource_group,
-                user_data=user_data,
-                vpc=vpc,
-                image=image,
-                trusted_platform_module=trusted_platform_module,
-                enable_secure_boot=enable_secure_boot,
-                primary_network_interface=primary_network_interface,
-                zone=zone
-            )
-
-            if "errors" in result:
-                module.fail_json(msg=result)
-
-            module.exit_json(changed=True, msg=result)
+
+    if "id" in check:
+        if state == "poweredoff":
+            action, status = "stop", "stopped"
+        elif state == "restart":
+            action, status = "restart", "running"
+        else:
+            action, status = "start", "running"
+
+        changed = False
+        if state != "present":
+            check, changed = _power(module, bm_instance, check, action,
+                                    status, "hard" if force else "soft")
+
+        if wait:
+            check = _wait_status(module, bm_instance, check["id"], status)
+
+        module.exit_json(changed=changed, msg=check)
+
+    if state not in ("present", "poweredon"):
+        module.fail_json(msg=check)
+
+    result = bm_instance.create_server(
+        name=instance,
+        keys=keys,
+        profile=profile,
+        network_interfaces=network_interfaces,
+        resource_group=resource_group,
+        user_data=user_data,
+        vpc=vpc,
+        image=image,
+        trusted_platform_module=trusted_platform_module,
+        enable_secure_boot=enable_secure_boot,
+        primary_network_interface=primary_network_interface,
+        zone=zone
+    )
+
+    if "errors" in result:
+        module.fail_json(msg=result)
+
+    if wait:
+        result = _wait_status(module, bm_instance, result["id"], "running")
+        module.exit_json(changed=True, msg=result)
+
+    module.exit_json(changed=True,
+                     msg=dict(result, job=job_handle("baremetal", result)))
 
 
 def main():
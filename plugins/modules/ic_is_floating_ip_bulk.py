@@ -0,0 +1,361 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import RateLimiter
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import list_resources
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import memoize_lookup
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import run_parallel
+from ibmcloud_python_sdk.vpc import floating_ip as sdk_fip
+from ibmcloud_python_sdk.vpc import instance as sdk_instance
+
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = r'''
+---
+module: ic_is_floating_ip_bulk
+short_description: Manage VPC floating IPs for many VSI on IBM Cloud.
+author: Gaëtan Trellu (@goldyfruit)
+version_added: "2.9"
+description:
+  - Reserve floating IPs and bind them to a list of VSI network interfaces
+    in one task.
+  - Floating IPs already reserved by this module, named after
+    C(name_prefix), and not bound to anything are reused before new ones
+    are reserved.
+requirements:
+  - "ibmcloud-python-sdk"
+options:
+  targets:
+    description:
+      - Network interfaces which should have a floating IP.
+    type: list
+    suboptions:
+      instance:
+        description:
+          - VSI (Virtual Server Instance) name or ID.
+        type: str
+        required: true
+      interface:
+        description:
+          - Network interface name or ID. If no interface is provided the
+            primary network interface is used.
+        type: str
+  zone:
+    description:
+      - The name of the zone where C(count) floating IPs are reserved.
+    type: str
+  count:
+    description:
+      - Number of unbound floating IPs to keep reserved in C(zone), on top
+        of the ones bound to C(targets).
+    type: int
+    default: 0
+  name_prefix:
+    description:
+      - Prefix used to name the new floating IPs, a number is appended.
+      - Only the unbound floating IPs starting with this prefix, in the
+        zones of C(targets) or in C(zone), are reused or released. If
+        unset, IBM Cloud generates the names and unbound floating IPs are
+        never reused nor released.
+    type: str
+  resource_group:
+    description:
+      - The resource group to use for new floating IPs. If unspecified, the
+        account's default resource group is used.
+      - When set, only the unbound floating IPs of this resource group are
+        reused or released.
+    type: str
+  workers:
+    description:
+      - Maximum number of concurrent API requests.
+    type: int
+    default: 10
+  rate_limit:
+    description:
+      - Maximum number of API requests per second shared by all the
+        workers. C(0) disables the limit.
+    type: float
+    default: 5
+  state:
+    description:
+      - Should the resources be present or absent.
+      - C(absent) releases the floating IPs bound to C(targets) and, when
+        C(name_prefix) is set, the unbound floating IPs matching it in the
+        zones of C(targets) or in C(zone).
+    type: str
+    default: present
+    choices: [present, absent]
+'''
+
+EXAMPLES = r'''
+- name: Bind a floating IP to the primary interface of every green VSI
+  ic_is_floating_ip_bulk:
+    targets:
+      - instance: ibmcloud-vsi-green1-baby
+      - instance: ibmcloud-vsi-green2-baby
+      - instance: ibmcloud-vsi-green3-baby
+        interface: ibmcloud-nic-baby
+    name_prefix: ibmcloud-fip-green-
+
+- name: Keep 50 floating IPs reserved for the next cutover
+  ic_is_floating_ip_bulk:
+    zone: us-south-3
+    count: 50
+    name_prefix: ibmcloud-fip-spare-
+
+- name: Release the floating IPs of the blue VSI
+  ic_is_floating_ip_bulk:
+    targets:
+      - instance: ibmcloud-vsi-blue1-baby
+      - instance: ibmcloud-vsi-blue2-baby
+    state: absent
+'''
+
+
+def _resolve_targets(module, targets):
+    data = list_resources("instances")
+    if "errors" in data:
+        module.fail_json(msg=data)
+
+    known = {}
+    for vsi in data["instances"]:
+        known[vsi["name"]] = vsi
+        known[vsi["id"]] = vsi
+
+    nics = []
+    seen = set()
+    for target in targets:
+        vsi = known.get(target["instance"])
+        if not vsi:
+            module.fail_json(msg={"instance": target["instance"],
+                                  "errors": [{"code": "not_found"}]})
+
+        nic = vsi["primary_network_interface"]
+        if target["interface"]:
+            nic = None
+            for interface in vsi["network_interfaces"]:
+                if target["interface"] in (interface["name"],
+                                           interface["id"]):
+                    nic = interface
+            if not nic:
+                module.fail_json(msg={"instance": target["instance"],
+                                      "interface": target["interface"],
+                                      "errors": [{"code": "not_found"}]})
+
+        # The same interface listed twice only needs one floating IP
+        if nic["id"] in seen:
+            continue
+        seen.add(nic["id"])
+
+        nics.append({"vsi": vsi, "nic": nic, "zone": vsi["zone"]["name"]})
+
+    return nics
+
+
+def _new_names(prefix, taken, count):
+    names = []
+    index = 1
+    while len(names) < count:
+        name = "{}{}".format(prefix, index)
+        if name not in taken:
+            names.append(name)
+        index += 1
+
+    return names
+
+
+def run_module():
+    module_args = dict(
+        targets=dict(
+            type='list',
+            options=dict(
+                instance=dict(
+                    type='str',
+                    required=True),
+                interface=dict(
+                    type='str',
+                    required=False),
+            ),
+            required=False),
+        zone=dict(
+            type='str',
+            required=False),
+        count=dict(
+            type='int',
+            default=0,
+            required=False),
+        name_prefix=dict(
+            type='str',
+            required=False),
+        resource_group=dict(
+            type='str',
+            required=False),
+        workers=dict(
+            type='int',
+            default=10,
+            required=False),
+        rate_limit=dict(
+            type='float',
+            default=5,
+            required=False),
+        state=dict(
+            type='str',
+            default='present',
+            choices=['absent', 'present'],
+            required=False),
+    )
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        required_one_of=[('targets', 'zone')],
+        supports_check_mode=False
+    )
+
+    floating_ip = sdk_fip.Fip()
+    vsi_instance = sdk_instance.Instance()
+
+    targets = module.params["targets"] or []
+    zone = module.params["zone"]
+    count = module.params["count"]
+    name_prefix = module.params["name_prefix"]
+    resource_group = module.params["resource_group"]
+    state = module.params["state"]
+
+    if count and not zone:
+        module.fail_json(msg="zone is required when count is set")
+
+    nics = _resolve_targets(module, targets)
+
+    data = list_resources("floating_ips")
+    if "errors" in data:
+        module.fail_json(msg=data)
+
+    fips = data["floating_ips"]
+    bound = dict((fip["target"]["id"], fip) for fip in fips
+                 if fip.get("target"))
+
+    # Only the floating IPs reserved by this module are reused or
+    # released, the others may belong to someone else
+    zones = set(target["zone"] for target in nics)
+    if zone:
+        zones.add(zone)
+    free = []
+    if name_prefix:
+        free = [fip for fip in fips
+                if not fip.get("target") and
+                fip["name"].startswith(name_prefix) and
+                fip["zone"]["name"] in zones and
+                (not resource_group or resource_group in (
+                    fip.get("resource_group", {}).get("id"),
+                    fip.get("resource_group", {}).get("name")))]
+
+    jobs = []
+    if state == "absent":
+        for target in nics:
+            if target["nic"]["id"] in bound:
+                jobs.append(("released", bound[target["nic"]["id"]], None))
+        for fip in free:
+            jobs.append(("released", fip, None))
+    else:
+        spare = {}
+        for fip in free:
+            spare.setdefault(fip["zone"]["name"], []).append(fip)
+
+        reserve = []
+        for target in nics:
+            if target["nic"]["id"] in bound:
+                continue
+            if spare.get(target["zone"]):
+                jobs.append(("bound", spare[target["zone"]].pop(0), target))
+            else:
+                reserve.append(target)
+
+        missing = max(0, count - len(spare.get(zone, [])))
+
+        names = [None] * (len(reserve) + missing)
+        if name_prefix:
+            names = _new_names(name_prefix,
+                               set(fip["name"] for fip in fips),
+                               len(names))
+
+        for target in reserve:
+            jobs.append(("reserved", {"name": names.pop(0)}, target))
+        for _ in range(missing):
+            jobs.append(("reserved", {"name": names.pop(0)}, None))
+
+    # The SDK looks every resource up before acting on it, serve the
+    # lookups from the listings
+    vsi_instance.get_instance = memoize_lookup(
+        vsi_instance.get_instance,
+        dict((target["vsi"]["id"], target["vsi"]) for target in nics))
+    vsi_instance.get_instance_interface = memoize_lookup(
+        vsi_instance.get_instance_interface,
+        dict(((target["vsi"]["id"], target["nic"]["id"]), target["nic"])
+             for target in nics))
+    floating_ip.get_floating_ip = memoize_lookup(
+        floating_ip.get_floating_ip,
+        dict((fip["id"], fip) for fip in fips))
+    vsi_instance.fip.get_floating_ip = floating_ip.get_floating_ip
+
+    def _apply(job):
+        action, fip, target = job
+        if action == "released":
+            return floating_ip.release_floating_ip(fip["id"])
+        if action == "bound":
+            return vsi_instance.associate_floating_ip(
+                instance=target["vsi"]["id"],
+                interface=target["nic"]["id"],
+                fip=fip["id"])
+
+        return floating_ip.reserve_floating_ip(
+            name=fip["name"],
+            resource_group=resource_group,
+            target=target["nic"]["id"] if target else None,
+            zone=None if target else zone)
+
+    results = run_parallel(_apply, jobs, module.params["workers"],
+                           RateLimiter(module.params["rate_limit"]))
+
+    payload = {"bound": [], "reserved": [], "released": []}
+    errors = []
+    for (action, fip, target), result in zip(jobs, results):
+        item = {"floating_ip": fip.get("name")}
+        if target:
+            item["instance"] = target["vsi"]["name"]
+            item["interface"] = target["nic"]["id"]
+
+        if result and "errors" in result:
+            item["errors"] = result["errors"]
+            errors.append(item)
+            continue
+
+        if action == "released":
+            item["address"] = fip["address"]
+        else:
+            item["floating_ip"] = result.get("name", item["floating_ip"])
+            item["address"] = result.get("address", fip.get("address"))
+        payload[action].append(item)
+
+    if errors:
+        payload["errors"] = errors
+        module.fail_json(msg=payload)
+
+    module.exit_json(changed=bool(jobs), msg=payload)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,8 @@
 
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import retry_busy
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import wait_deleted
 from ibmcloud_python_sdk.vpc import gateway as sdk
 
 
@@ -52,6 +54,18 @@ options:
       - The VPC this public gateway will serve
     type: str
     required: true
+  wait:
+    description:
+      - When deleting, retry the deletion while the public gateway still has
+        dependents being deleted, then wait until the public gateway doesn't
+        exist anymore.
+    type: bool
+    default: false
+  wait_timeout:
+    description:
+      - How long to wait in seconds.
+    type: int
+    default: 600
   state:
     description:
       - Should the resource be present or absent.
@@ -100,6 +114,14 @@ def run_module():
         vpc=dict(
             type='str',
             required=True),
+        wait=dict(
+            type='bool',
+            default=False,
+            required=False),
+        wait_timeout=dict(
+            type='int',
+            default=600,
+            required=False),
         state=dict(
             type='str',
             default='present',
@@ -119,16 +141,31 @@ def run_module():
     floating_ip = module.params["floating_ip"]
     zone = module.params["zone"]
     vpc = module.params["vpc"]
+    wait = module.params["wait"]
+    wait_timeout = module.params["wait_timeout"]
     state = module.params["state"]
 
     check = public_gateway.get_public_gateway(gateway)
 
     if state == "absent":
         if "id" in check:
-            result = public_gateway.delete_public_gateway(gateway)
+            if wait:
+                result = retry_busy(
+                    lambda: public_gateway.delete_public_gateway(check["id"]),
+                    wait_timeout)
+            else:
+                result = public_gateway.delete_public_gateway(gateway)
             if "errors" in result:
                 module.fail_json(msg=result)
 
+            if wait:
+                result, deleted = wait_deleted(
+                    lambda: public_gateway.get_public_gateway_by_id(
+                        check["id"]),
+                    wait_timeout)
+                if not deleted:
+                    module.fail_json(msg=result)
+
             payload = {"public_gateway": gateway, "status": "deleted"}
             module.exit_json(changed=True, msg=payload)
 
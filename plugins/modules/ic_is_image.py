@@ -5,7 +5,10 @@
 # (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
 
+import time
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_job import job_handle
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import wait_until
 from ibmcloud_python_sdk.vpc import image as sdk
 
 
@@ -26,6 +29,8 @@ description:
     The prototype object is structured in the same way as a retrieved image,
     and contains the information necessary to create the new image.
   - A URL to the image file on object storage must be provided.
+  - Without C(wait), the creation returns a C(msg.job) handle which can be
+    followed with M(ic_job_status) along with many others.
 notes:
   - The image should be first uploaded into the Cloud Object Storage (COS).
 requirements:
@@ -53,6 +58,20 @@ options:
     description:
       - The unique name of the operating system.
     type: str
+  wait:
+    description:
+      - Wait until the image is C(available) or C(failed). The result
+        contains the final image document and the status transitions seen
+        while waiting in C(msg.status_history), with the failure reasons if
+        the import failed.
+      - Has no effect when C(state=absent).
+    type: bool
+    default: false
+  wait_timeout:
+    description:
+      - How long to wait in seconds.
+    type: int
+    default: 3600
   state:
     description:
       - Should the resource be present or absent.
@@ -68,6 +87,14 @@ EXAMPLES = r'''
     file: cos://us-south/ibmcloud-bucket-baby/CentOS-8.1.1911.x86_64.qcow2
     operating_system: centos-7-amd64
 
+- name: Create an image and wait until the import is done
+  ic_is_image:
+    image: ibmcloud-image-baby
+    file: cos://us-south/ibmcloud-bucket-baby/CentOS-8.1.1911.x86_64.qcow2
+    operating_system: centos-7-amd64
+    wait: true
+    wait_timeout: 7200
+
 - name: Delete an image
   ic_is_image:
     image: ibmcloud-image-baby
@@ -75,6 +102,44 @@ EXAMPLES = r'''
 '''
 
 
+def _wait_image(module, vsi_image, image):
+    start = time.monotonic()
+    history = []
+
+    def _ready(result):
+        if "errors" in result:
+            return True
+        if not history or history[-1]["status"] != result["status"]:
+            history.append({"status": result["status"],
+                            "elapsed": int(time.monotonic() - start)})
+        return result["status"] in ("available", "failed")
+
+    # Imports take minutes, there is no point in polling every few seconds
+    result, ready = wait_until(
+        lambda: vsi_image.get_image_by_id(image["id"]), _ready,
+        module.params["wait_timeout"], delay=5, max_delay=60)
+
+    if "errors" in result:
+        module.fail_json(msg=result)
+
+    payload = {"image": result, "status_history": history,
+               "elapsed": int(time.monotonic() - start)}
+
+    if not ready:
+        payload["errors"] = [{
+            "code": "timeout",
+            "message": "image is still {} after {} seconds".format(
+                result["status"], module.params["wait_timeout"])}]
+        module.fail_json(msg=payload)
+
+    if result["status"] == "failed":
+        payload["errors"] = result.get("status_reasons") or [{
+            "code": "failed", "message": "image import failed"}]
+        module.fail_json(msg=payload)
+
+    return result, history
+
+
 def run_module():
     module_args = dict(
         image=dict(
@@ -92,6 +157,14 @@ def run_module():
         source_volume=dict(
             type='str',
             required=False),
+        wait=dict(
+            type='bool',
+            default=False,
+            required=False),
+        wait_timeout=dict(
+            type='int',
+            default=3600,
+            required=False),
         state=dict(
             type='str',
             default='present',
@@ -111,6 +184,7 @@ def run_module():
     file = module.params['file']
     operating_system = module.params['operating_system']
     source_volume = module.params['source_volume']
+    wait = module.params['wait']
     state = module.params['state']
 
     check = vsi_image.get_image(image)
@@ -128,6 +202,10 @@ def run_module():
         module.exit_json(changed=False, msg=payload)
     else:
         if "id" in check:
+            if wait:
+                check, history = _wait_image(module, vsi_image, check)
+                module.exit_json(changed=False,
+                                 msg=dict(check, status_history=history))
             module.exit_json(changed=False, msg=check)
 
         result = vsi_image.create_image(
@@ -141,7 +219,13 @@ def run_module():
         if "errors" in result:
             module.fail_json(msg=result)
 
-        module.exit_json(changed=True, msg=result)
+        if wait:
+            result, history = _wait_image(module, vsi_image, result)
+            module.exit_json(changed=True,
+                             msg=dict(result, status_history=history))
+
+        module.exit_json(changed=True,
+                         msg=dict(result, job=job_handle("image", result)))
 
 
 def main():
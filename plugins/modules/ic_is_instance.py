@@ -5,7 +5,13 @@
 # (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
 
+import re
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import RateLimiter
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import list_resources
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import memoize_lookup
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import run_parallel
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import wait_until
 from ibmcloud_python_sdk.vpc import instance as sdk
 
 
@@ -32,8 +38,36 @@ options:
     description:
       - The unique user-defined name for this virtual server instance
         (and default system hostname).
+      - When C(count) or C(exact_count) is used, this is a name pattern
+        which must contain a C(%d) placeholder, e.g. C(worker-%03d), and
+        C(vpc) is required.
     type: str
     required: true
+  count:
+    description:
+      - Fleet mode, make sure at least C(count) instances matching the
+        C(instance) pattern exist. Existing instances are never deleted.
+      - Mutually exclusive with C(exact_count).
+    type: int
+  exact_count:
+    description:
+      - Fleet mode, make sure exactly C(exact_count) instances matching the
+        C(instance) pattern exist. Missing instances are created with the
+        lowest free indexes, surplus instances are deleted starting with
+        the highest indexes.
+      - Mutually exclusive with C(count).
+    type: int
+  workers:
+    description:
+      - Maximum number of concurrent API requests in fleet mode.
+    type: int
+    default: 10
+  rate_limit:
+    description:
+      - Maximum number of API requests per second shared by all the
+        workers in fleet mode. C(0) disables the limit.
+    type: float
+    default: 5
   keys:
     description:
       - The public SSH keys to install on the virtual server instance. Up to 10
@@ -191,6 +225,8 @@ options:
       - The VPC the virtual server instance is to be a part of. If provided,
         must match the VPC tied to the subnets of the instance's network
         interfaces.
+      - Required in fleet mode, only the instances of this VPC are
+        counted, created or deleted.
     type: str
   image:
     description:
@@ -201,12 +237,43 @@ options:
     description:
       - The identity of the zone to provision the virtual server instance in.
     type: str
+  wait:
+    description:
+      - Wait until the instance reaches C(wait_status), or is deleted when
+        C(state=absent). The final instance document is returned.
+      - In fleet mode, all the created or deleted instances are waited for
+        with one instance listing per polling interval.
+    type: bool
+    default: false
+  wait_status:
+    description:
+      - The status to wait for when C(state=present).
+      - C(stopped) can only be waited for on existing instances which are
+        already stopping or stopped, the module never stops an instance.
+        A new instance is always started so the task fails before
+        creating it.
+    type: str
+    default: running
+    choices: [running, stopped]
+  wait_timeout:
+    description:
+      - How long to wait in seconds.
+    type: int
+    default: 600
   state:
     description:
       - Should the resource be present or absent.
+      - In fleet mode, C(absent) deletes every instance matching the
+        C(instance) pattern.
     type: str
     default: present
     choices: [present, absent]
+notes:
+  - In fleet mode, references such as C(vpc), C(image), C(keys),
+    C(resource_group) and the primary network interface C(subnet) are
+    resolved once for the whole batch.
+  - In fleet mode, leave the network interface and volume names unset so
+    IBM Cloud generates a unique name for each instance.
 '''
 
 EXAMPLES = r'''
@@ -229,20 +296,320 @@ EXAMPLES = r'''
         capacity: 50
         profile: ibmcloud-volume-profile-baby
     zone: ibmcloud-zone-baby
+    wait: true
 
 
 - name: Delete instance
   ic_is_instance:
     instance: ibmcloud-vsi-baby
     state: absent
+
+- name: Scale worker pool to 200 VSI
+  ic_is_instance:
+    instance: ibmcloud-worker-%03d
+    exact_count: 200
+    keys:
+      - ibmcloud-key1-baby
+    profile: ibmcloud-vsi-profile-baby
+    vpc: ibmcloud-vpc-baby
+    image: ibmcloud-image-baby
+    primary_network_interface:
+      subnet: ibmcloud-subnet-baby
+    zone: ibmcloud-zone-baby
+    workers: 20
+
+- name: Delete worker pool
+  ic_is_instance:
+    instance: ibmcloud-worker-%03d
+    exact_count: 0
+    vpc: ibmcloud-vpc-baby
 '''
 
 
+def _fleet_regex(pattern):
+    placeholder = re.search(r"%0?\d*d", pattern)
+    if not placeholder:
+        return None
+
+    return re.compile("^{}(\\d+){}$".format(
+        re.escape(pattern[:placeholder.start()]),
+        re.escape(pattern[placeholder.end():])))
+
+
+def _fleet_name(pattern, index):
+    # Only the placeholder is formatted, the rest of the name may contain
+    # a literal %
+    placeholder = re.search(r"%(0?\d*)d", pattern)
+    return "{}{}{}".format(pattern[:placeholder.start()],
+                           format(index, placeholder.group(1) + "d"),
+                           pattern[placeholder.end():])
+
+
+def _resolve_references(vsi_instance, create_args):
+    # The SDK resolves every reference on each create_instance() call,
+    # memoize the lookups so they are done once for the whole fleet.
+    vsi_instance.vpc.get_vpc = memoize_lookup(vsi_instance.vpc.get_vpc)
+    vsi_instance.image.get_image = memoize_lookup(
+        vsi_instance.image.get_image)
+    vsi_instance.subnet.get_subnet = memoize_lookup(
+        vsi_instance.subnet.get_subnet)
+    vsi_instance.keyring.get_key = memoize_lookup(
+        vsi_instance.keyring.get_key)
+    vsi_instance.rg.get_resource_group = memoize_lookup(
+        vsi_instance.rg.get_resource_group)
+
+    lookups = []
+    if create_args["vpc"]:
+        lookups.append((vsi_instance.vpc.get_vpc, create_args["vpc"]))
+    if create_args["image"]:
+        lookups.append((vsi_instance.image.get_image, create_args["image"]))
+    if create_args["resource_group"]:
+        lookups.append((vsi_instance.rg.get_resource_group,
+                        create_args["resource_group"]))
+    for key in create_args["keys"] or []:
+        lookups.append((vsi_instance.keyring.get_key, key))
+    pni = create_args["primary_network_interface"]
+    if pni and pni.get("subnet"):
+        lookups.append((vsi_instance.subnet.get_subnet, pni["subnet"]))
+
+    for lookup, reference in lookups:
+        result = lookup(reference)
+        if "errors" in result:
+            return result
+
+
+def _wait_instance(module, vsi_instance, instance_id):
+    status = module.params["wait_status"]
+    if module.params["state"] == "absent":
+        status = "deleted"
+
+    def _ready(result):
+        if "errors" in result:
+            return True
+        return result["status"] in (status, "failed")
+
+    result, ready = wait_until(
+        lambda: vsi_instance.get_instance_by_id(instance_id), _ready,
+        module.params["wait_timeout"])
+
+    if "errors" in result:
+        if status == "deleted" and \
+                result["errors"][0].get("code") == "not_found":
+            return {"id": instance_id, "status": "deleted"}
+        module.fail_json(msg=result)
+
+    if not ready:
+        module.fail_json(msg={
+            "errors": [{
+                "code": "timeout",
+                "message": "instance did not reach status {} in {}"
+                           " seconds".format(status,
+                                             module.params["wait_timeout"])}],
+            "instance": result})
+
+    if result["status"] != status:
+        module.fail_json(msg={"errors": [{
+            "code": "failed",
+            "message": "instance status is {}".format(result["status"])}],
+            "instance": result})
+
+    return result
+
+
+def _check_wait_status(module, instance=None):
+    # Nothing stops the instance, a new one is started right away and a
+    # running one stays running
+    if not module.params["wait"] or module.params["wait_status"] != "stopped":
+        return
+    if instance and instance["status"] in ("stopping", "stopped"):
+        return
+
+    if instance:
+        module.fail_json(msg="wait_status stopped can only be used when the"
+                             " instance is already stopping, its status is"
+                             " {}".format(instance["status"]))
+    module.fail_json(msg="wait_status stopped cannot be used when the"
+                         " instance has to be created")
+
+
+def _wait_fleet(module, created, deleted):
+    status = module.params["wait_status"]
+
+    def _snapshot():
+        data = list_resources("instances")
+        if "errors" in data:
+            return data
+        return dict((vsi["id"], vsi) for vsi in data["instances"]
+                    if vsi["id"] in created or vsi["id"] in deleted)
+
+    def _ready(snapshot):
+        if "errors" in snapshot:
+            return True
+        for vsi in snapshot.values():
+            if vsi["id"] in deleted or vsi["status"] not in (status,
+                                                             "failed"):
+                return False
+        return True
+
+    snapshot, _ = wait_until(_snapshot, _ready,
+                             module.params["wait_timeout"])
+    if "errors" in snapshot:
+        return snapshot, [snapshot]
+
+    errors = []
+    for vsi in snapshot.values():
+        if vsi["id"] in deleted:
+            errors.append({"instance": vsi["name"], "status": vsi["status"],
+                           "errors": [{"code": "timeout"}]})
+        elif vsi["status"] != status:
+            code = "timeout" if vsi["status"] != "failed" else "failed"
+            errors.append({"instance": vsi["name"], "status": vsi["status"],
+                           "errors": [{"code": code}]})
+
+    return snapshot, errors
+
+
+def _run_fleet(module, vsi_instance, create_args):
+    pattern = module.params["instance"]
+    count = module.params["count"]
+    exact_count = module.params["exact_count"]
+    state = module.params["state"]
+    vpc = create_args["vpc"]
+
+    regex = _fleet_regex(pattern)
+    if not regex:
+        module.fail_json(msg="instance must contain a %d placeholder when"
+                             " count or exact_count is used")
+
+    # Without it, instances matching the pattern in other VPCs would be
+    # counted and possibly deleted
+    if not vpc:
+        module.fail_json(msg="vpc is required when count or exact_count is"
+                             " used")
+
+    data = list_resources("instances")
+    if "errors" in data:
+        module.fail_json(msg=data)
+
+    members = {}
+    for vsi in data["instances"]:
+        match = regex.match(vsi["name"])
+        if not match:
+            continue
+        if vpc not in (vsi["vpc"]["name"], vsi["vpc"]["id"]):
+            continue
+        members[int(match.group(1))] = vsi
+
+    if state == "absent":
+        target = 0
+    elif exact_count is not None:
+        target = exact_count
+    else:
+        target = max(count, len(members))
+
+    surplus = sorted(members, reverse=True)[:max(0, len(members) - target)]
+
+    missing = []
+    index = 1
+    while len(members) + len(missing) < target:
+        if index not in members:
+            missing.append(_fleet_name(pattern, index))
+        index += 1
+
+    limiter = RateLimiter(module.params["rate_limit"])
+    workers = module.params["workers"]
+    errors = []
+
+    deleted = []
+    if surplus:
+        # Deletion looks the instance up first, serve it from the listing
+        vsi_instance.get_instance = memoize_lookup(
+            vsi_instance.get_instance,
+            dict((vsi["id"], vsi) for vsi in members.values()))
+
+        results = run_parallel(
+            lambda index: vsi_instance.delete_instance(members[index]["id"]),
+            surplus, workers, limiter)
+
+        for index, result in zip(surplus, results):
+            if result and "errors" in result:
+                errors.append({"instance": members[index]["name"],
+                               "errors": result["errors"]})
+            else:
+                deleted.append(members.pop(index))
+
+    created = []
+    if missing:
+        _check_wait_status(module)
+
+        failure = _resolve_references(vsi_instance, create_args)
+        if failure:
+            module.fail_json(msg=failure)
+
+        results = run_parallel(
+            lambda name: vsi_instance.create_instance(name=name,
+                                                      **create_args),
+            missing, workers, limiter)
+
+        for name, result in zip(missing, results):
+            if "errors" in result:
+                errors.append({"instance": name, "errors": result["errors"]})
+            else:
+                created.append(result)
+
+    if module.params["wait"] and (created or deleted):
+        snapshot, failures = _wait_fleet(
+            module,
+            set(vsi["id"] for vsi in created),
+            set(vsi["id"] for vsi in deleted))
+        errors.extend(failures)
+        created = [snapshot.get(vsi["id"], vsi) for vsi in created]
+
+    payload = {
+        "instances": [members[index] for index in sorted(members)] + created,
+        "created": [vsi["name"] for vsi in created],
+        "deleted": [vsi["name"] for vsi in deleted],
+    }
+
+    if errors:
+        payload["errors"] = errors
+        module.fail_json(msg=payload)
+
+    module.exit_json(changed=bool(created or deleted), msg=payload)
+
+
 def run_module():
     module_args = dict(
         instance=dict(
             type='str',
             required=True),
+        count=dict(
+            type='int',
+            required=False),
+        exact_count=dict(
+            type='int',
+            required=False),
+        workers=dict(
+            type='int',
+            default=10,
+            required=False),
+        rate_limit=dict(
+            type='float',
+            default=5,
+            required=False),
+        wait=dict(
+            type='bool',
+            default=False,
+            required=False),
+        wait_status=dict(
+            type='str',
+            default='running',
+            choices=['running', 'stopped'],
+            required=False),
+        wait_timeout=dict(
+            type='int',
+            default=600,
+            required=False),
         keys=dict(
             type='list',
             required=False),
@@ -370,6 +737,7 @@ def run_module():
 
     module = AnsibleModule(
         argument_spec=module_args,
+        mutually_exclusive=[('count', 'exact_count')],
         supports_check_mode=False
     )
 
@@ -390,6 +758,25 @@ def run_module():
     primary_network_interface = module.params['primary_network_interface']
     zone = module.params['zone']
     state = module.params["state"]
+    wait = module.params["wait"]
+
+    if module.params["count"] is not None or \
+            module.params["exact_count"] is not None:
+        _run_fleet(module, vsi_instance, dict(
+            keys=keys,
+            profile=profile,
+            network_interfaces=network_interfaces,
+            placement_target=placement_target,
+            volume_attachments=volume_attachments,
+            boot_volume_attachment=boot_volume_attachment,
+            source_template=source_template,
+            resource_group=resource_group,
+            user_data=user_data,
+            vpc=vpc,
+            image=image,
+            primary_network_interface=primary_network_interface,
+            zone=zone
+        ))
 
     check = vsi_instance.get_instance(instance)
 
@@ -399,6 +786,9 @@ def run_module():
             if "errors" in result:
                 module.fail_json(msg=result)
 
+            if wait:
+                _wait_instance(module, vsi_instance, check["id"])
+
             payload = {"instance": instance, "status": "deleted"}
             module.exit_json(changed=True, msg=payload)
 
@@ -406,8 +796,13 @@ def run_module():
         module.exit_json(changed=False, msg=payload)
     else:
         if "id" in check:
+            if wait:
+                _check_wait_status(module, check)
+                check = _wait_instance(module, vsi_instance, check["id"])
             module.exit_json(changed=False, msg=check)
 
+        _check_wait_status(module)
+
         result = vsi_instance.create_instance(
             name=instance,
             keys=keys,
@@ -428,6 +823,9 @@ def run_module():
         if "errors" in result:
             module.fail_json(msg=result)
 
+        if wait:
+            result = _wait_instance(module, vsi_instance, result["id"])
+
         module.exit_json(changed=True, msg=result)
 
 
@@ -6,6 +6,10 @@
 
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import RateLimiter
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import list_resources
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import memoize_lookup
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import run_parallel
 from ibmcloud_python_sdk.vpc import security as sdk_security
 from ibmcloud_python_sdk.vpc import instance as sdk_instance
 
@@ -34,8 +38,8 @@ options:
       - VSI (Virtual Server Instance) where to attach the security group.
         If C(interface) options is not provided then security group will be
         attached to VSI primary network interface.
+      - Required unless bulk mode is used.
     type: str
-    required: true
   interface:
     description:
       - VSI network interface where to attach the security group.
@@ -43,13 +47,56 @@ options:
   group:
     description:
       - The identity of the security group to attach to the interface.
-    required: true
+      - Required unless bulk mode is used.
+    type: str
+  groups:
+    description:
+      - Bulk mode, security groups to attach to (or detach from) every
+        selected VSI.
+      - Names or IDs are resolved within the VPC of each VSI, the task
+        fails if a group doesn't exist in it.
+    type: list
+  instances:
+    description:
+      - Bulk mode, VSI names or IDs to select.
+    type: list
+  vpc:
+    description:
+      - Bulk mode, select the VSI of this VPC (name or ID).
+    type: str
+  name_prefix:
+    description:
+      - Bulk mode, select the VSI whose name starts with this prefix.
+    type: str
+  all_interfaces:
+    description:
+      - Bulk mode, use every network interface of the selected VSI instead
+        of the primary network interface only.
+    type: bool
+    default: false
+  workers:
+    description:
+      - Maximum number of concurrent API requests in bulk mode.
+    type: int
+    default: 10
+  rate_limit:
+    description:
+      - Maximum number of API requests per second shared by all the
+        workers in bulk mode. C(0) disables the limit.
+    type: float
+    default: 5
   state:
     description:
       - Should the resource be present or absent.
     type: str
     default: present
     choices: [present, absent, attach, detach]
+notes:
+  - Bulk mode is enabled by C(groups). VSI are selected by C(instances),
+    C(vpc) and C(name_prefix), the selectors are combined.
+  - Bulk mode retrieves the VSI and the security group targets with a few
+    list calls and only applies the missing attachments (or the existing
+    ones when detaching).
 '''
 
 EXAMPLES = r'''
@@ -76,20 +123,162 @@ EXAMPLES = r'''
     interface: ibmcloud-interface-baby
     group: ibmcloud-sec-group-baby
     state: detach
+
+- name: Attach security groups to every VSI of a VPC starting with worker-
+  ic_is_instance_security_group:
+    groups:
+      - ibmcloud-sec-group-baby
+      - ibmcloud-sec-group-ssh-baby
+    vpc: ibmcloud-vpc-baby
+    name_prefix: worker-
+    workers: 20
 '''
 
 
+def _run_bulk(module, security):
+    groups = module.params["groups"]
+    instances = module.params["instances"]
+    vpc = module.params["vpc"]
+    name_prefix = module.params["name_prefix"]
+    all_interfaces = module.params["all_interfaces"]
+    state = module.params["state"]
+
+    if not (instances or vpc or name_prefix):
+        module.fail_json(msg="one of instances, vpc or name_prefix is"
+                             " required with groups")
+
+    data = list_resources("instances")
+    if "errors" in data:
+        module.fail_json(msg=data)
+
+    nics = {}
+    for vsi in data["instances"]:
+        if instances and vsi["name"] not in instances and \
+                vsi["id"] not in instances:
+            continue
+        if vpc and vpc not in (vsi["vpc"]["name"], vsi["vpc"]["id"]):
+            continue
+        if name_prefix and not vsi["name"].startswith(name_prefix):
+            continue
+
+        interfaces = [vsi["primary_network_interface"]]
+        if all_interfaces:
+            interfaces = vsi["network_interfaces"]
+        for nic in interfaces:
+            nics[nic["id"]] = (vsi["name"], vsi["vpc"]["id"])
+
+    data = list_resources("security_groups")
+    if "errors" in data:
+        module.fail_json(msg=data)
+
+    # Security group names are only unique within a VPC
+    known = {}
+    for sg in data["security_groups"]:
+        known[(sg["vpc"]["id"], sg["name"])] = sg
+        known[(sg["vpc"]["id"], sg["id"])] = sg
+
+    desired = set()
+    for nic, (_, vpc_id) in nics.items():
+        for group in groups:
+            if (vpc_id, group) not in known:
+                module.fail_json(msg={"security_group": group,
+                                      "vpc": vpc_id,
+                                      "errors": [{"code": "not_found"}]})
+            desired.add((known[(vpc_id, group)]["id"], nic))
+
+    existing = set()
+    for sg_id in sorted(set(sg_id for sg_id, _ in desired)):
+        targets = list_resources(
+            "security_groups/{}/network_interfaces".format(sg_id),
+            key="network_interfaces")
+        if "errors" in targets:
+            module.fail_json(msg=targets)
+
+        for nic in targets["network_interfaces"]:
+            existing.add((sg_id, nic["id"]))
+
+    # The SDK looks the security group up before each attachment,
+    # serve it from the listing
+    security.get_security_group = memoize_lookup(
+        security.get_security_group,
+        dict((sg["id"], sg) for sg in data["security_groups"]))
+
+    def _detach(pair):
+        return security.remove_interface_security_group(*pair)
+
+    def _attach(pair):
+        return security.add_interface_security_group(
+            security_group=pair[0], interface=pair[1])
+
+    if state == "absent" or state == "detach":
+        pairs = sorted(desired & existing)
+        action = "detached"
+        func = _detach
+    else:
+        pairs = sorted(desired - existing)
+        action = "attached"
+        func = _attach
+
+    results = run_parallel(func, pairs, module.params["workers"],
+                           RateLimiter(module.params["rate_limit"]))
+
+    names = dict((sg["id"], sg["name"]) for sg in data["security_groups"])
+    changes = []
+    errors = []
+    for (sg_id, nic), result in zip(pairs, results):
+        item = {"security_group": names[sg_id], "instance": nics[nic][0],
+                "interface": nic}
+        if result and "errors" in result:
+            item["errors"] = result["errors"]
+            errors.append(item)
+        else:
+            changes.append(item)
+
+    payload = {action: changes,
+               "instances": len(set(name for name, _ in nics.values())),
+               "interfaces": len(nics)}
+    if errors:
+        payload["errors"] = errors
+        module.fail_json(msg=payload)
+
+    module.exit_json(changed=bool(changes), msg=payload)
+
+
 def run_module():
     module_args = dict(
         instance=dict(
             type='str',
-            required=True),
+            required=False),
         interface=dict(
             type='str',
             required=False),
         group=dict(
             type='str',
-            required=True),
+            required=False),
+        groups=dict(
+            type='list',
+            required=False),
+        instances=dict(
+            type='list',
+            required=False),
+        vpc=dict(
+            type='str',
+            required=False),
+        name_prefix=dict(
+            type='str',
+            required=False),
+        all_interfaces=dict(
+            type='bool',
+            default=False,
+            required=False),
+        workers=dict(
+            type='int',
+            default=10,
+            required=False),
+        rate_limit=dict(
+            type='float',
+            default=5,
+            required=False),
         state=dict(
             type='str',
             default='attach',
@@ -99,12 +288,18 @@ def run_module():
 
     module = AnsibleModule(
         argument_spec=module_args,
+        required_one_of=[('group', 'groups')],
+        mutually_exclusive=[('group', 'groups')],
+        required_by={'group': 'instance'},
         supports_check_mode=False
     )
 
     security = sdk_security.Security()
     instance = sdk_instance.Instance()
 
+    if module.params["groups"]:
+        _run_bulk(module, security)
+
     group = module.params["group"]
     vsi = module.params["instance"]
     interface = module.params["interface"]
@@ -0,0 +1,351 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import RateLimiter
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import list_resources
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import memoize_lookup
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import run_parallel
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import wait_until
+from ibmcloud_python_sdk.vpc import instance as sdk_instance
+from ibmcloud_python_sdk.vpc import volume as sdk_volume
+
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = r'''
+---
+module: ic_is_instance_volume_bulk
+short_description: Manage VPC volumes for many VSI on IBM Cloud.
+author: Gaëtan Trellu (@goldyfruit)
+version_added: "2.9"
+description:
+  - Create the missing volumes and attach them to their VSI in one task.
+  - Volumes are created concurrently, then the module waits until all of
+    them are available with one volume listing per polling interval and
+    attaches them concurrently.
+requirements:
+  - "ibmcloud-python-sdk"
+options:
+  attachments:
+    description:
+      - List of VSI and volume pairs.
+    type: list
+    required: true
+    suboptions:
+      instance:
+        description:
+          - VSI (Virtual Server Instance) name or ID.
+        type: str
+        required: true
+      volume:
+        description:
+          - The unique user-defined name for the volume. The volume is
+            created if it doesn't exist.
+        type: str
+        required: true
+      attachment_name:
+        description:
+          - The user-defined name for this volume attachment.
+        type: str
+      delete_volume_on_instance_delete:
+        description:
+          - If set to true, when deleting the instance the volume will also
+            be deleted.
+        type: bool
+        choices: [true, false]
+      capacity:
+        description:
+          - The capacity of the volume in gigabytes.
+          - Required when the volume has to be created.
+        type: int
+      profile:
+        description:
+          - The profile to use for this volume.
+          - Required when the volume has to be created.
+        type: str
+      iops:
+        description:
+          - The bandwidth for the volume.
+        type: int
+      encryption_key:
+        description:
+          - The key to use for encrypting this volume. If no encryption key
+            is provided, the volume's encryption will be provider-managed.
+        type: str
+      resource_group:
+        description:
+          - The resource group to use. If unspecified, the account's default
+            resource group is used.
+        type: str
+      zone:
+        description:
+          - The location of the volume. Defaults to the zone of the VSI.
+        type: str
+  wait_timeout:
+    description:
+      - How long to wait in seconds for the new volumes to become
+        available.
+    type: int
+    default: 600
+  workers:
+    description:
+      - Maximum number of concurrent API requests.
+    type: int
+    default: 10
+  rate_limit:
+    description:
+      - Maximum number of API requests per second shared by all the
+        workers. C(0) disables the limit.
+    type: float
+    default: 5
+'''
+
+EXAMPLES = r'''
+- name: Create and attach a data volume to every database VSI
+  ic_is_instance_volume_bulk:
+    attachments:
+      - instance: ibmcloud-db1-baby
+        volume: ibmcloud-db1-data-baby
+        capacity: 500
+        profile: 10iops-tier
+      - instance: ibmcloud-db2-baby
+        volume: ibmcloud-db2-data-baby
+        capacity: 500
+        profile: 10iops-tier
+    workers: 20
+
+- name: Attach existing volumes
+  ic_is_instance_volume_bulk:
+    attachments:
+      - instance: ibmcloud-vsi1-baby
+        volume: ibmcloud-volume1-baby
+        attachment_name: ibmcloud-attachment1-baby
+      - instance: ibmcloud-vsi2-baby
+        volume: ibmcloud-volume2-baby
+        attachment_name: ibmcloud-attachment2-baby
+'''
+
+
+def run_module():
+    module_args = dict(
+        attachments=dict(
+            type='list',
+            options=dict(
+                instance=dict(
+                    type='str',
+                    required=True),
+                volume=dict(
+                    type='str',
+                    required=True),
+                attachment_name=dict(
+                    type='str',
+                    required=False),
+                delete_volume_on_instance_delete=dict(
+                    type='bool',
+                    required=False,
+                    choices=[True, False]),
+                capacity=dict(
+                    type='int',
+                    required=False),
+                profile=dict(
+                    type='str',
+                    required=False),
+                iops=dict(
+                    type='int',
+                    required=False),
+                encryption_key=dict(
+                    type='str',
+                    required=False),
+                resource_group=dict(
+                    type='str',
+                    required=False),
+                zone=dict(
+                    type='str',
+                    required=False),
+            ),
+            required=True),
+        wait_timeout=dict(
+            type='int',
+            default=600,
+            required=False),
+        workers=dict(
+            type='int',
+            default=10,
+            required=False),
+        rate_limit=dict(
+            type='float',
+            default=5,
+            required=False),
+    )
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=False
+    )
+
+    vsi_instance = sdk_instance.Instance()
+    volume = sdk_volume.Volume()
+
+    attachments = module.params["attachments"]
+    wait_timeout = module.params["wait_timeout"]
+    workers = module.params["workers"]
+    limiter = RateLimiter(module.params["rate_limit"])
+
+    data = list_resources("instances")
+    if "errors" in data:
+        module.fail_json(msg=data)
+
+    instances = {}
+    for vsi in data["instances"]:
+        instances[vsi["name"]] = vsi
+        instances[vsi["id"]] = vsi
+
+    data = list_resources("volumes")
+    if "errors" in data:
+        module.fail_json(msg=data)
+
+    volumes = dict((vol["name"], vol) for vol in data["volumes"])
+
+    creates = []
+    names = set()
+    for item in attachments:
+        if item["instance"] not in instances:
+            module.fail_json(msg={"instance": item["instance"],
+                                  "errors": [{"code": "not_found"}]})
+        if item["volume"] in volumes or item["volume"] in names:
+            continue
+        if not item["capacity"] or not item["profile"]:
+            module.fail_json(msg="capacity and profile are required to"
+                                 " create volume {}".format(item["volume"]))
+        names.add(item["volume"])
+        creates.append(item)
+
+    errors = []
+
+    results = run_parallel(
+        lambda item: volume.create_volume(
+            name=item["volume"],
+            capacity=item["capacity"],
+            profile=item["profile"],
+            iops=item["iops"],
+            encryption_key=item["encryption_key"],
+            resource_group=item["resource_group"],
+            zone=item["zone"] or instances[item["instance"]]["zone"]["name"]),
+        creates, workers, limiter)
+
+    created = []
+    for item, result in zip(creates, results):
+        if "errors" in result:
+            errors.append({"volume": item["volume"],
+                           "errors": result["errors"]})
+        else:
+            created.append(result["id"])
+            volumes[item["volume"]] = result
+
+    if created:
+        def _snapshot():
+            data = list_resources("volumes")
+            if "errors" in data:
+                return data
+            return dict((vol["id"], vol) for vol in data["volumes"]
+                        if vol["id"] in created)
+
+        def _settled(snapshot):
+            if "errors" in snapshot:
+                return True
+            return all(vol["status"] in ("available", "failed")
+                       for vol in snapshot.values())
+
+        snapshot, settled = wait_until(_snapshot, _settled, wait_timeout)
+        if "errors" in snapshot:
+            module.fail_json(msg=snapshot)
+
+        for vol in snapshot.values():
+            volumes[vol["name"]] = vol
+            if vol["status"] != "available":
+                errors.append({"volume": vol["name"],
+                               "status": vol["status"]})
+
+        if not settled:
+            errors.append({"msg": "timeout waiting for volumes to become"
+                                  " available"})
+
+    if errors:
+        module.fail_json(msg={"created": [vol for vol in volumes.values()
+                                          if vol["id"] in created],
+                              "errors": errors})
+
+    # The SDK looks the instance and the volume up on each call, serve
+    # them from the listings
+    vsi_instance.get_instance = memoize_lookup(
+        vsi_instance.get_instance,
+        dict((vsi["id"], vsi) for vsi in instances.values()))
+    vsi_instance.volume.get_volume = memoize_lookup(
+        vsi_instance.volume.get_volume,
+        dict((vol["id"], vol) for vol in volumes.values()))
+
+    targets = sorted(set(instances[item["instance"]]["id"]
+                         for item in attachments))
+    results = run_parallel(vsi_instance.get_instance_volume_attachments,
+                           targets, workers, limiter)
+
+    attached = set()
+    for vsi_id, result in zip(targets, results):
+        if "errors" in result:
+            module.fail_json(msg=result)
+        for attachment in result["volume_attachments"]:
+            attached.add((vsi_id, attachment["volume"]["id"]))
+
+    attaches = []
+    for item in attachments:
+        pair = (instances[item["instance"]]["id"],
+                volumes[item["volume"]]["id"])
+        if pair not in attached:
+            attached.add(pair)
+            attaches.append(item)
+
+    results = run_parallel(
+        lambda item: vsi_instance.attach_volume(
+            instance=instances[item["instance"]]["id"],
+            volume=volumes[item["volume"]]["id"],
+            delete_volume_on_instance_delete=item[
+                "delete_volume_on_instance_delete"],
+            name=item["attachment_name"]),
+        attaches, workers, limiter)
+
+    payload = {
+        "created": [item["volume"] for item in creates],
+        "attached": [],
+    }
+    for item, result in zip(attaches, results):
+        if "errors" in result:
+            errors.append({"instance": item["instance"],
+                           "volume": item["volume"],
+                           "errors": result["errors"]})
+        else:
+            payload["attached"].append({"instance": item["instance"],
+                                        "volume": item["volume"],
+                                        "attachment": result["id"]})
+
+    if errors:
+        payload["errors"] = errors
+        module.fail_json(msg=payload)
+
+    module.exit_json(changed=bool(creates or attaches), msg=payload)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
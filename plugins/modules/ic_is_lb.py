@@ -6,6 +6,8 @@
 
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_job import job_handle
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import wait_until
 from ibmcloud_python_sdk.vpc import loadbalancer as sdk
 
 
@@ -23,6 +25,8 @@ author: Gaëtan Trellu (@goldyfruit)
 version_added: "2.9"
 description:
   - This module creates and provisions a new load balancer.
+  - Without C(wait), the creation returns a C(msg.job) handle which can be
+    followed with M(ic_job_status) along with many others.
 requirements:
   - "ibmcloud-python-sdk"
 options:
@@ -175,6 +179,19 @@ options:
                 - The user-defined name for this load balancer pool.
               type: str
               required: true
+  wait:
+    description:
+      - Wait for the load balancer to be active. The hostname and the IP
+        addresses are only known once the load balancer is provisioned,
+        they are returned in C(msg.addresses) as C(hostname), C(private_ips)
+        and C(public_ips).
+    type: bool
+    default: false
+  wait_timeout:
+    description:
+      - How long to wait in seconds.
+    type: int
+    default: 900
   state:
     description:
       - Should the resource be present or absent.
@@ -220,6 +237,15 @@ EXAMPLES = r'''
         port: 80
         protocol: http
 
+- name: Create load balancer and wait for its hostname
+  ic_is_lb:
+    lb: ibmcloud-lb-baby
+    is_public: true
+    subnets:
+      - ibmcloud-subnet-baby
+    wait: true
+  register: lb
+
 - name: Delete load balancer
   ic_is_lb:
     lb: ibmcloud-lb-baby
@@ -227,6 +253,40 @@ EXAMPLES = r'''
 '''
 
 
+def _wait(module, loadbalancer, lb, timeout, changed):
+    def _ready(result):
+        return "errors" in result or \
+            result["provisioning_status"] in ["active", "failed"]
+
+    result, ready = wait_until(lambda: loadbalancer.get_lb_by_id(lb["id"]),
+                               _ready, timeout)
+    if "errors" in result:
+        module.fail_json(msg=result)
+
+    payload = dict(result, addresses={
+        "hostname": result.get("hostname"),
+        "private_ips": [ip["address"] for ip in result.get("private_ips", [])],
+        "public_ips": [ip["address"] for ip in result.get("public_ips", [])],
+    })
+
+    status = result["provisioning_status"]
+    if status == "failed":
+        payload["errors"] = [{
+            "code": "failed",
+            "message": "load balancer {} failed".format(result["name"])}]
+        module.fail_json(changed=changed, msg=payload)
+
+    if not ready:
+        payload["errors"] = [{
+            "code": "timeout",
+            "message": "load balancer {} not active after {} seconds,"
+                       " status is {}".format(result["name"], timeout,
+                                              status)}]
+        module.fail_json(changed=changed, msg=payload)
+
+    module.exit_json(changed=changed, msg=payload)
+
+
 def run_module():
     module_args = dict(
         lb=dict(
@@ -343,6 +403,14 @@ def run_module():
         resource_group=dict(
             type='str',
             required=False),
+        wait=dict(
+            type='bool',
+            default=False,
+            required=False),
+        wait_timeout=dict(
+            type='int',
+            default=900,
+            required=False),
         state=dict(
             type='str',
             default='present',
@@ -364,6 +432,8 @@ def run_module():
     is_public = module.params['is_public']
     profile = module.params['profile']
     resource_group = module.params["resource_group"]
+    wait = module.params["wait"]
+    wait_timeout = module.params["wait_timeout"]
     state = module.params["state"]
 
     check = loadbalancer.get_lb(lb)
@@ -381,6 +451,8 @@ def run_module():
         module.exit_json(changed=True, msg=payload)
     else:
         if "id" in check:
+            if wait:
+                _wait(module, loadbalancer, check, wait_timeout, False)
             module.exit_json(changed=False, msg=check)
 
         result = loadbalancer.create_lb(
@@ -396,7 +468,11 @@ def run_module():
         if "errors" in result:
             module.fail_json(msg=result)
 
-        module.exit_json(changed=True, msg=result)
+        if wait:
+            _wait(module, loadbalancer, result, wait_timeout, True)
+
+        module.exit_json(changed=True,
+                         msg=dict(result, job=job_handle("lb", result)))
 
 
 def main():
@@ -6,6 +6,7 @@
 
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_lb import lb_mutate
 from ibmcloud_python_sdk.vpc import loadbalancer as sdk
 
 
@@ -113,6 +114,13 @@ options:
     description:
       - The default pool associated with the listener.
     type: str
+  wait_timeout:
+    description:
+      - How long to wait in seconds for the load balancer to accept the
+        change. Changes made on the same load balancer by concurrent tasks
+        are applied one after the other.
+    type: int
+    default: 600
   state:
     description:
       - Should the resource be present or absent.
@@ -225,6 +233,10 @@ def run_module():
         default_pool=dict(
           type='str',
           required=False),
+        wait_timeout=dict(
+            type='int',
+            default=600,
+            required=False),
         state=dict(
           type='str',
           default='present',
@@ -246,18 +258,26 @@ def run_module():
     port = module.params['port']
     protocol = module.params['protocol']
     default_pool = module.params['default_pool']
+    wait_timeout = module.params["wait_timeout"]
     state = module.params["state"]
 
-    check = loadbalancer.get_lb_listener(lb, port)
+    def _check():
+        return loadbalancer.get_lb_listener(lb, port)
+
+    check = _check()
 
     if state == "absent":
         if "id" in check:
-            result = loadbalancer.delete_listener(lb, port)
+            result, changed = lb_mutate(
+                loadbalancer, lb, wait_timeout,
+                lambda: loadbalancer.delete_listener(lb, port),
+                _check, present=False)
             if "errors" in result:
                 module.fail_json(msg=result)
 
-            payload = {"listener": port, "lb": lb, "status": "deleted"}
-            module.exit_json(changed=True, msg=payload)
+            status = "deleted" if changed else "not_found"
+            payload = {"listener": port, "lb": lb, "status": status}
+            module.exit_json(changed=changed, msg=payload)
 
         payload = {"listener": port, "lb": lb, "status": "not_found"}
         module.exit_json(changed=False, msg=payload)
@@ -265,20 +285,22 @@ def run_module():
         if "id" in check:
             module.exit_json(changed=False, msg=check)
 
-        result = loadbalancer.create_listener(
-            lb=lb,
-            connection_limit=connection_limit,
-            certificate_instance=certificate_instance,
-            policies=policies,
-            port=port,
-            protocol=protocol,
-            default_pool=default_pool
-        )
+        result, changed = lb_mutate(
+            loadbalancer, lb, wait_timeout,
+            lambda: loadbalancer.create_listener(
+                lb=lb,
+                connection_limit=connection_limit,
+                certificate_instance=certificate_instance,
+                policies=policies,
+                port=port,
+                protocol=protocol,
+                default_pool=default_pool
+            ), _check)
 
         if "errors" in result:
             module.fail_json(msg=result)
 
-        module.exit_json(changed=True, msg=result)
+        module.exit_json(changed=changed, msg=result)
 
 
 def main():
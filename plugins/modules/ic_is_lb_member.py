@@ -6,6 +6,7 @@
 
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_lb import lb_mutate
 from ibmcloud_python_sdk.vpc import loadbalancer as sdk
 
 
@@ -60,6 +61,13 @@ options:
       - Weight of the server member. This takes effect only when the load
         balancing algorithm of its belonging pool is weighted_round_robin.
     type: int
+  wait_timeout:
+    description:
+      - How long to wait in seconds for the load balancer to accept the
+        change. Changes made on the same load balancer by concurrent tasks
+        are applied one after the other.
+    type: int
+    default: 600
   state:
     description:
       - Should the resource be present or absent.
@@ -121,6 +129,10 @@ def run_module():
         weight=dict(
             type='int',
             required=False),
+        wait_timeout=dict(
+            type='int',
+            default=600,
+            required=False),
         state=dict(
           type='str',
           default='present',
@@ -140,39 +152,49 @@ def run_module():
     port = module.params['port']
     target = module.params['target']
     weight = module.params['weight']
+    wait_timeout = module.params["wait_timeout"]
     state = module.params["state"]
 
-    check = loadbalancer.get_lb_pool_member(lb, pool, target)
+    def _check():
+        # A member of the same target on another port is another member
+        member = loadbalancer.get_lb_pool_member(lb, pool, target)
+        return member if member.get("port") == port else {}
+
+    check = _check()
 
     if state == "absent":
         if "id" in check:
-            if check["port"] == port:
-                result = loadbalancer.delete_member(lb, pool, target)
-                if "errors" in result:
-                    module.fail_json(msg=result)
+            result, changed = lb_mutate(
+                loadbalancer, lb, wait_timeout,
+                lambda: loadbalancer.delete_member(lb, pool, target),
+                _check, present=False)
+            if "errors" in result:
+                module.fail_json(msg=result)
 
-            payload = {"member": target, "pool": pool, "status": "deleted"}
-            module.exit_json(changed=True, msg=payload)
+            payload = {"member": target, "pool": pool,
+                       "status": "deleted" if changed else "not_found"}
+            module.exit_json(changed=changed, msg=payload)
 
         payload = {"member": target, "pool": pool, "status": "not_found"}
         module.exit_json(changed=False, msg=payload)
     else:
         if "id" in check:
-            if check["port"] == port:
-                module.exit_json(changed=False, msg=check)
-
-        result = loadbalancer.create_member(
-            lb=lb,
-            pool=pool,
-            port=port,
-            target=target,
-            weight=weight
-        )
+            module.exit_json(changed=False, msg=check)
+
+        result, changed = lb_mutate(
+            loadbalancer, lb, wait_timeout,
+            lambda: loadbalancer.create_member(
+                lb=lb,
+                pool=pool,
+                port=port,
+                target=target,
+                weight=weight
+            ), _check)
 
         if "errors" in result:
             module.fail_json(msg=result)
 
-        module.exit_json(changed=True, msg=result)
+        module.exit_json(changed=changed, msg=result)
 
 
 def main():
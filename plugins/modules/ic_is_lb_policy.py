@@ -6,6 +6,7 @@
 
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_lb import lb_mutate
 from ibmcloud_python_sdk.vpc import loadbalancer as sdk
 
 
@@ -94,6 +95,13 @@ options:
         description:
           - The redirect target URL.
         type: str
+  wait_timeout:
+    description:
+      - How long to wait in seconds for the load balancer to accept the
+        change. Changes made on the same load balancer by concurrent tasks
+        are applied one after the other.
+    type: int
+    default: 600
   state:
     description:
       - Should the resource be present or absent.
@@ -178,6 +186,10 @@ def run_module():
                     required=False),
             ),
             required=False),
+        wait_timeout=dict(
+            type='int',
+            default=600,
+            required=False),
         state=dict(
           type='str',
           default='present',
@@ -199,41 +211,50 @@ def run_module():
     priority = module.params['priority']
     rules = module.params['rules']
     target = module.params['target']
+    wait_timeout = module.params["wait_timeout"]
     state = module.params["state"]
 
-    check = loadbalancer.get_lb_listener_policy(lb, listener, policy)
+    def _check():
+        return loadbalancer.get_lb_listener_policy(lb, listener, policy)
+
+    check = _check()
 
     if state == "absent":
         if "id" in check:
-            result = loadbalancer.delete_policy(lb, listener, policy)
+            result, changed = lb_mutate(
+                loadbalancer, lb, wait_timeout,
+                lambda: loadbalancer.delete_policy(lb, listener, policy),
+                _check, present=False)
             if "errors" in result:
                 module.fail_json(msg=result)
 
             payload = {"policy": policy, "listener": listener, "lb": lb,
-                       "status": "deleted"}
-            module.exit_json(changed=True, msg=payload)
+                       "status": "deleted" if changed else "not_found"}
+            module.exit_json(changed=changed, msg=payload)
 
-            payload = {"policy": policy, "listener": listener, "lb": lb,
-                       "status": "not_found"}
+        payload = {"policy": policy, "listener": listener, "lb": lb,
+                   "status": "not_found"}
         module.exit_json(changed=False, msg=payload)
     else:
         if "id" in check:
             module.exit_json(changed=False, msg=check)
 
-        result = loadbalancer.create_policy(
-            lb=lb,
-            listener=listener,
-            action=action,
-            name=policy,
-            priority=priority,
-            rules=rules,
-            target=target
-        )
+        result, changed = lb_mutate(
+            loadbalancer, lb, wait_timeout,
+            lambda: loadbalancer.create_policy(
+                lb=lb,
+                listener=listener,
+                action=action,
+                name=policy,
+                priority=priority,
+                rules=rules,
+                target=target
+            ), _check)
 
         if "errors" in result:
             module.fail_json(msg=result)
 
-        module.exit_json(changed=True, msg=result)
+        module.exit_json(changed=changed, msg=result)
 
 
 def main():
@@ -6,6 +6,7 @@
 
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_lb import lb_mutate
 from ibmcloud_python_sdk.vpc import loadbalancer as sdk
 
 
@@ -124,6 +125,13 @@ options:
       type: str
       required: true
       choices: [http, https, tcp]
+  wait_timeout:
+    description:
+      - How long to wait in seconds for the load balancer to accept the
+        change. Changes made on the same load balancer by concurrent tasks
+        are applied one after the other.
+    type: int
+    default: 600
   state:
     description:
       - Should the resource be present or absent.
@@ -250,6 +258,10 @@ def run_module():
                     choices=['http', 'https', 'tcp']),
             ),
             required=False),
+        wait_timeout=dict(
+            type='int',
+            default=600,
+            required=False),
         state=dict(
             type='str',
             default='present',
@@ -271,39 +283,49 @@ def run_module():
     protocol = module.params['protocol']
     session_persistence = module.params['session_persistence']
     health_monitor = module.params['health_monitor']
+    wait_timeout = module.params["wait_timeout"]
     state = module.params["state"]
 
-    check = loadbalancer.get_lb_pool(lb, pool)
+    def _check():
+        return loadbalancer.get_lb_pool(lb, pool)
+
+    check = _check()
 
     if state == "absent":
         if "id" in check:
-            result = loadbalancer.delete_pool(lb, pool)
+            result, changed = lb_mutate(
+                loadbalancer, lb, wait_timeout,
+                lambda: loadbalancer.delete_pool(lb, pool),
+                _check, present=False)
             if "errors" in result:
                 module.fail_json(msg=result)
 
-            payload = {"pool": pool, "lb": lb, "status": "deleted"}
-            module.exit_json(changed=True, msg=payload)
+            status = "deleted" if changed else "not_found"
+            payload = {"pool": pool, "lb": lb, "status": status}
+            module.exit_json(changed=changed, msg=payload)
 
-            payload = {"pool": pool, "lb": lb, "status": "not_found"}
-            module.exit_json(changed=False, msg=payload)
+        payload = {"pool": pool, "lb": lb, "status": "not_found"}
+        module.exit_json(changed=False, msg=payload)
     else:
         if "id" in check:
             module.exit_json(changed=False, msg=check)
 
-        result = loadbalancer.create_pool(
-            lb=lb,
-            name=pool,
-            algorithm=algorithm,
-            members=members,
-            protocol=protocol,
-            session_persistence=session_persistence,
-            health_monitor=health_monitor
-        )
+        result, changed = lb_mutate(
+            loadbalancer, lb, wait_timeout,
+            lambda: loadbalancer.create_pool(
+                lb=lb,
+                name=pool,
+                algorithm=algorithm,
+                members=members,
+                protocol=protocol,
+                session_persistence=session_persistence,
+                health_monitor=health_monitor
+            ), _check)
 
         if "errors" in result:
             module.fail_json(msg=result)
 
-        module.exit_json(changed=True, msg=result)
+        module.exit_json(changed=changed, msg=result)
 
 
 def main():
@@ -6,6 +6,7 @@
 
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_lb import lb_mutate
 from ibmcloud_python_sdk.vpc import loadbalancer as sdk
 
 
@@ -63,6 +64,13 @@ options:
     description:
       - Value to be matched for rule condition.
     type: str
+  wait_timeout:
+    description:
+      - How long to wait in seconds for the load balancer to accept the
+        change. Changes made on the same load balancer by concurrent tasks
+        are applied one after the other.
+    type: int
+    default: 600
   state:
     description:
       - Should the resource be present or absent.
@@ -120,6 +128,10 @@ def run_module():
         value=dict(
             type='str',
             required=False),
+        wait_timeout=dict(
+            type='int',
+            default=600,
+            required=False),
         state=dict(
           type='str',
           default='present',
@@ -142,21 +154,30 @@ def run_module():
     field = module.params['field']
     type = module.params['type']
     value = module.params['value']
+    wait_timeout = module.params["wait_timeout"]
     state = module.params["state"]
 
     if not rule:
         rule = None
-    check = loadbalancer.get_lb_listener_policy_rule(lb, listener, policy,
-                                                     rule)
+
+    def _check():
+        return loadbalancer.get_lb_listener_policy_rule(lb, listener, policy,
+                                                        rule)
+
+    check = _check()
     if state == "absent":
         if "id" in check:
-            result = loadbalancer.delete_rule(lb, listener, policy, rule)
+            result, changed = lb_mutate(
+                loadbalancer, lb, wait_timeout,
+                lambda: loadbalancer.delete_rule(lb, listener, policy, rule),
+                _check, present=False)
             if "errors" in result:
                 module.fail_json(msg=result)
 
             payload = {"rule": rule, "policy": policy, "listener": listener,
-                       "lb": lb, "status": "deleted"}
-            module.exit_json(changed=True, msg=payload)
+                       "lb": lb,
+                       "status": "deleted" if changed else "not_found"}
+            module.exit_json(changed=changed, msg=payload)
 
         payload = {"rule": rule, "policy": policy, "listener": listener,
                    "lb": lb, "status": "not_found"}
@@ -165,20 +186,22 @@ def run_module():
         if "id" in check:
             module.exit_json(changed=False, msg=check)
 
-        result = loadbalancer.create_rule(
-            lb=lb,
-            listener=listener,
-            policy=policy,
-            condition=condition,
-            field=field,
-            type=type,
-            value=value
-        )
+        result, changed = lb_mutate(
+            loadbalancer, lb, wait_timeout,
+            lambda: loadbalancer.create_rule(
+                lb=lb,
+                listener=listener,
+                policy=policy,
+                condition=condition,
+                field=field,
+                type=type,
+                value=value
+            ), _check)
 
         if "errors" in result:
             module.fail_json(msg=result)
 
-        module.exit_json(changed=True, msg=result)
+        module.exit_json(changed=changed, msg=result)
 
 
 def main():
@@ -6,6 +6,8 @@
 
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import retry_busy
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import wait_deleted
 from ibmcloud_python_sdk.vpc import security as sdk
 
 
@@ -108,6 +110,18 @@ options:
       -  The VPC the security group is to be a part of.
     type: str
     required: true
+  wait:
+    description:
+      - When deleting, retry the deletion while the security group still has
+        dependents being deleted, then wait until the security group doesn't
+        exist anymore.
+    type: bool
+    default: false
+  wait_timeout:
+    description:
+      - How long to wait in seconds.
+    type: int
+    default: 600
   state:
     description:
       - Should the resource be present or absent.
@@ -196,6 +210,14 @@ def run_module():
         vpc=dict(
             type='str',
             required=True),
+        wait=dict(
+            type='bool',
+            default=False,
+            required=False),
+        wait_timeout=dict(
+            type='int',
+            default=600,
+            required=False),
         state=dict(
             type='str',
             default='present',
@@ -214,16 +236,30 @@ def run_module():
     resource_group = module.params["resource_group"]
     rules = module.params["rules"]
     vpc = module.params["vpc"]
+    wait = module.params["wait"]
+    wait_timeout = module.params["wait_timeout"]
     state = module.params["state"]
 
     check = security.get_security_group(group)
 
     if state == "absent":
         if "id" in check:
-            result = security.delete_security_group(group)
+            if wait:
+                result = retry_busy(
+                    lambda: security.delete_security_group(check["id"]),
+                    wait_timeout)
+            else:
+                result = security.delete_security_group(group)
             if "errors" in result:
                 module.fail_json(msg=result)
 
+            if wait:
+                result, deleted = wait_deleted(
+                    lambda: security.get_security_group_by_id(check["id"]),
+                    wait_timeout)
+                if not deleted:
+                    module.fail_json(msg=result)
+
             payload = {"security_group": group, "status": "deleted"}
             module.exit_json(changed=True, msg=payload)
 
@@ -6,6 +6,8 @@
 
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import retry_busy
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import wait_deleted
 from ibmcloud_python_sdk.vpc import subnet as sdk
 
 
@@ -85,6 +87,17 @@ options:
       - The VPC the subnet is to be a part of.
     type: str
     required: true
+  wait:
+    description:
+      - When deleting, retry the deletion while the subnet still has dependents
+        being deleted, then wait until the subnet doesn't exist anymore.
+    type: bool
+    default: false
+  wait_timeout:
+    description:
+      - How long to wait in seconds.
+    type: int
+    default: 600
   state:
     description:
       - Should the resource be present or absent.
@@ -141,6 +154,14 @@ def run_module():
         vpc=dict(
             type='str',
             required=True),
+        wait=dict(
+            type='bool',
+            default=False,
+            required=False),
+        wait_timeout=dict(
+            type='int',
+            default=600,
+            required=False),
         state=dict(
             type='str',
             default='present',
@@ -164,16 +185,30 @@ def run_module():
     total_ipv4_address_count = module.params["total_ipv4_address_count"]
     zone = module.params["zone"]
     vpc = module.params["vpc"]
+    wait = module.params["wait"]
+    wait_timeout = module.params["wait_timeout"]
     state = module.params["state"]
 
     check = vsi_subnet.get_subnet(subnet)
 
     if state == "absent":
         if "id" in check:
-            result = vsi_subnet.delete_subnet(subnet)
+            if wait:
+                result = retry_busy(
+                    lambda: vsi_subnet.delete_subnet(check["id"]),
+                    wait_timeout)
+            else:
+                result = vsi_subnet.delete_subnet(subnet)
             if "errors" in result:
                 module.fail_json(msg=result)
 
+            if wait:
+                result, deleted = wait_deleted(
+                    lambda: vsi_subnet.get_subnet_by_id(check["id"]),
+                    wait_timeout)
+                if not deleted:
+                    module.fail_json(msg=result)
+
             payload = {"subnet": subnet, "status": "deleted"}
             module.exit_json(changed=True, msg=payload)
 
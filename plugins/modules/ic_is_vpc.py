@@ -6,6 +6,8 @@
 
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import retry_busy
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import wait_deleted
 from ibmcloud_python_sdk.vpc import vpc as sdk
 
 
@@ -56,6 +58,17 @@ options:
     type: bool
     default: false
     choices: [true, false]
+  wait:
+    description:
+      - When deleting, retry the deletion while the VPC still has dependents
+        being deleted, then wait until the VPC doesn't exist anymore.
+    type: bool
+    default: false
+  wait_timeout:
+    description:
+      - How long to wait in seconds.
+    type: int
+    default: 600
   state:
     description:
       - Should the resource be present or absent.
@@ -99,6 +112,14 @@ def run_module():
             default=False,
             choices=[True, False],
             required=False),
+        wait=dict(
+            type='bool',
+            default=False,
+            required=False),
+        wait_timeout=dict(
+            type='int',
+            default=600,
+            required=False),
         state=dict(
             type='str',
             default='present',
@@ -117,16 +138,30 @@ def run_module():
     resource_group = module.params["resource_group"]
     address_prefix_mgmt = module.params['address_prefix_management']
     classic_access = module.params['classic_access']
+    wait = module.params['wait']
+    wait_timeout = module.params['wait_timeout']
     state = module.params['state']
 
     check = vpc.get_vpc(name)
 
     if state == "absent":
         if "id" in check:
-            result = vpc.delete_vpc(name)
+            if wait:
+                result = retry_busy(
+                    lambda: vpc.delete_vpc(check["id"]),
+                    wait_timeout)
+            else:
+                result = vpc.delete_vpc(name)
             if "errors" in result:
                 module.fail_json(msg=result)
 
+            if wait:
+                result, deleted = wait_deleted(
+                    lambda: vpc.get_vpc_by_id(check["id"]),
+                    wait_timeout)
+                if not deleted:
+                    module.fail_json(msg=result)
+
             payload = {"vpc": name, "status": "deleted"}
             module.exit_json(changed=True, msg=payload)
 
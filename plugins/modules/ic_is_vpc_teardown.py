@@ -0,0 +1,307 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+import time
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import RateLimiter
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import delete_resource
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import list_resources
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import run_parallel
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import backoff_delays
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import busy
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import wait_until
+from ibmcloud_python_sdk.vpc import vpc as sdk
+
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = r'''
+---
+module: ic_is_vpc_teardown
+short_description: Delete a VPC and everything it contains on IBM Cloud.
+author: Gaëtan Trellu (@goldyfruit)
+version_added: "2.9"
+description:
+  - Delete a VPC with all its dependents.
+  - The dependents are listed once, then deleted level by level in this
+    order, the resources of one level are deleted concurrently and the
+    module waits for them to be gone before moving to the next level.
+  - Instances, bare metal servers, load balancers, VPN gateways and
+    endpoint gateways.
+  - Floating IPs bound to the instances and bare metal servers.
+  - Subnets.
+  - Public gateways, security groups, network ACLs and routing tables,
+    which can't be deleted while subnets are attached to them.
+  - The VPC itself.
+requirements:
+  - "ibmcloud-python-sdk"
+options:
+  vpc:
+    description:
+      - VPC name or ID.
+    type: str
+    required: true
+  release_floating_ips:
+    description:
+      - Release the floating IPs bound to the instances and bare metal
+        servers of the VPC. If disabled, they are kept unbound.
+    type: bool
+    default: true
+  wait_timeout:
+    description:
+      - How long to wait in seconds for each level to be deleted.
+    type: int
+    default: 900
+  workers:
+    description:
+      - Maximum number of concurrent API requests.
+    type: int
+    default: 10
+  rate_limit:
+    description:
+      - Maximum number of API requests per second shared by all the
+        workers. C(0) disables the limit.
+    type: float
+    default: 5
+notes:
+  - Everything inside the VPC is deleted, including instances and their
+    volumes set to be deleted with them.
+'''
+
+EXAMPLES = r'''
+- name: Delete the test environment
+  ic_is_vpc_teardown:
+    vpc: ibmcloud-vpc-baby
+
+- name: Delete the test environment but keep the floating IPs
+  ic_is_vpc_teardown:
+    vpc: ibmcloud-vpc-baby
+    release_floating_ips: false
+    workers: 20
+'''
+
+
+def _dependents(module, vpc_info, release_floating_ips):
+    collections = {}
+    for collection in ["instances", "bare_metal_servers", "load_balancers",
+                       "vpn_gateways", "endpoint_gateways", "floating_ips",
+                       "subnets", "public_gateways", "security_groups",
+                       "network_acls"]:
+        data = list_resources(collection)
+        if "errors" in data:
+            module.fail_json(msg=data)
+        collections[collection] = data[collection]
+
+    vpc_id = vpc_info["id"]
+    routing_tables = "vpcs/{}/routing_tables".format(vpc_id)
+    data = list_resources(routing_tables, key="routing_tables")
+    if "errors" in data:
+        module.fail_json(msg=data)
+    collections[routing_tables] = data["routing_tables"]
+
+    subnets = [item for item in collections["subnets"]
+               if item["vpc"]["id"] == vpc_id]
+    subnet_ids = set(item["id"] for item in subnets)
+
+    instances = [item for item in collections["instances"]
+                 if item["vpc"]["id"] == vpc_id]
+    bare_metal_servers = [item for item in collections["bare_metal_servers"]
+                          if item["vpc"]["id"] == vpc_id]
+    nic_ids = set(nic["id"] for item in instances + bare_metal_servers
+                  for nic in item.get("network_interfaces", []))
+
+    load_balancers = [item for item in collections["load_balancers"]
+                      if any(subnet["id"] in subnet_ids
+                             for subnet in item.get("subnets", []))]
+    vpn_gateways = [item for item in collections["vpn_gateways"]
+                    if item["subnet"]["id"] in subnet_ids]
+    endpoint_gateways = [item for item in collections["endpoint_gateways"]
+                         if item["vpc"]["id"] == vpc_id]
+
+    floating_ips = []
+    if release_floating_ips:
+        floating_ips = [item for item in collections["floating_ips"]
+                        if item.get("target", {}).get("id") in nic_ids]
+
+    public_gateways = [item for item in collections["public_gateways"]
+                       if item["vpc"]["id"] == vpc_id]
+
+    # The default security group and network ACL go with the VPC
+    security_groups = [
+        item for item in collections["security_groups"]
+        if item["vpc"]["id"] == vpc_id and
+        item["id"] != vpc_info["default_security_group"]["id"]]
+    network_acls = [
+        item for item in collections["network_acls"]
+        if item["vpc"]["id"] == vpc_id and
+        item["id"] != vpc_info["default_network_acl"]["id"]]
+    custom_routing_tables = [item for item in collections[routing_tables]
+                             if not item.get("is_default")]
+
+    levels = [
+        [("instances", instances), ("bare_metal_servers", bare_metal_servers),
+         ("load_balancers", load_balancers), ("vpn_gateways", vpn_gateways),
+         ("endpoint_gateways", endpoint_gateways)],
+        [("floating_ips", floating_ips)],
+        [("subnets", subnets)],
+        [("public_gateways", public_gateways),
+         ("security_groups", security_groups),
+         ("network_acls", network_acls),
+         (routing_tables, custom_routing_tables)],
+        [("vpcs", [vpc_info])],
+    ]
+
+    return [[{"type": collection, "id": item["id"], "name": item["name"]}
+             for collection, items in level for item in items]
+            for level in levels]
+
+
+def _existing(items):
+    ids = set(item["id"] for item in items)
+    found = []
+    for collection in sorted(set(item["type"] for item in items)):
+        # Nested collections such as vpcs/<id>/routing_tables
+        key = collection.split("/")[-1]
+        data = list_resources(collection, key=key)
+        if "errors" in data:
+            return data
+        found.extend(item for item in data[key] if item["id"] in ids)
+
+    return {"items": found}
+
+
+def _delete_level(level, timeout, workers, limiter):
+    deadline = time.monotonic() + timeout
+    delays = backoff_delays()
+    pending = level
+    errors = []
+
+    while pending:
+        results = run_parallel(
+            lambda item: delete_resource("{}/{}".format(item["type"],
+                                                        item["id"])),
+            pending, workers, limiter)
+
+        deleted = []
+        retry = []
+        for item, result in zip(pending, results):
+            if busy(result):
+                retry.append(item)
+            elif "errors" in result and not all(
+                    error["code"] == "not_found"
+                    for error in result["errors"]):
+                errors.append(dict(item, errors=result["errors"]))
+            else:
+                deleted.append(item)
+
+        if deleted:
+            # Listing errors such as throttling are retried until the
+            # deadline
+            snapshot, gone = wait_until(
+                lambda: _existing(deleted),
+                lambda data: "errors" not in data and not data["items"],
+                max(0, deadline - time.monotonic()))
+            if not gone:
+                timeout_error = {
+                    "code": "timeout",
+                    "message": "still not deleted after {} seconds".format(
+                        timeout)}
+                if "errors" in snapshot:
+                    timeout_error["last"] = snapshot["errors"]
+                left = set(item["id"] for item in snapshot.get(
+                    "items", deleted))
+                errors.extend(dict(item, errors=[timeout_error])
+                              for item in deleted if item["id"] in left)
+
+        remaining = deadline - time.monotonic()
+        if retry and remaining <= 0:
+            errors.extend(dict(item, errors=[{
+                "code": "timeout",
+                "message": "still busy after {} seconds".format(timeout)}])
+                for item in retry)
+            break
+
+        # Dependents from the previous levels may still be going away
+        pending = retry
+        if pending:
+            time.sleep(min(next(delays), remaining))
+
+    return errors
+
+
+def run_module():
+    module_args = dict(
+        vpc=dict(
+            type='str',
+            required=True),
+        release_floating_ips=dict(
+            type='bool',
+            default=True,
+            required=False),
+        wait_timeout=dict(
+            type='int',
+            default=900,
+            required=False),
+        workers=dict(
+            type='int',
+            default=10,
+            required=False),
+        rate_limit=dict(
+            type='float',
+            default=5,
+            required=False),
+    )
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=False
+    )
+
+    vpc = sdk.Vpc()
+
+    name = module.params['vpc']
+    wait_timeout = module.params['wait_timeout']
+    workers = module.params['workers']
+    limiter = RateLimiter(module.params['rate_limit'])
+
+    vpc_info = vpc.get_vpc(name)
+    if "errors" in vpc_info:
+        for error in vpc_info["errors"]:
+            if error["code"] == "not_found":
+                payload = {"vpc": name, "status": "not_found"}
+                module.exit_json(changed=False, msg=payload)
+        module.fail_json(msg=vpc_info)
+
+    levels = _dependents(module, vpc_info,
+                         module.params['release_floating_ips'])
+
+    payload = {"vpc": name, "deleted": {}}
+    for level in levels:
+        errors = _delete_level(level, wait_timeout, workers, limiter)
+        if errors:
+            payload["errors"] = errors
+            module.fail_json(changed=bool(payload["deleted"]), msg=payload)
+
+        for item in level:
+            collection = item["type"].split("/")[-1]
+            payload["deleted"].setdefault(collection, []).append(
+                item["name"])
+
+    payload["status"] = "deleted"
+    module.exit_json(changed=True, msg=payload)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
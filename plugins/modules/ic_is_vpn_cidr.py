@@ -5,7 +5,11 @@
 # (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
 
+import ipaddress
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import RateLimiter
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import memoize_lookup
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import run_parallel
 from ibmcloud_python_sdk.vpc import vpn as sdk
 
 
@@ -47,8 +51,40 @@ options:
   cidr:
     description:
       - Restrict results to specific CIDR.
+      - Mutually exclusive with C(cidrs).
     type: str
-    required: true
+  cidrs:
+    description:
+      - List of CIDRs to add or remove in one task. The current CIDRs of
+        the connection are retrieved once and compared with this list.
+      - Mutually exclusive with C(cidr).
+    type: list
+  purge:
+    description:
+      - Remove the CIDRs of the connection which are not in C(cidrs).
+      - The CIDRs are only removed once all the new ones have been added,
+        they are kept and reported as C(skipped) if an addition failed.
+    type: bool
+    default: false
+  collapse:
+    description:
+      - Collapse adjacent or overlapping prefixes of C(cidrs) before
+        applying them.
+      - Nothing is changed when the existing CIDRs already cover the same
+        addresses, even if they are not collapsed.
+    type: bool
+    default: true
+  workers:
+    description:
+      - Maximum number of concurrent API requests with C(cidrs).
+    type: int
+    default: 10
+  rate_limit:
+    description:
+      - Maximum number of API requests per second shared by all the
+        workers with C(cidrs). C(0) disables the limit.
+    type: float
+    default: 5
   state:
     description:
       - Should the resource be present or absent.
@@ -87,9 +123,132 @@ EXAMPLES = r'''
     target: local
     cidr: 172.0.0.0/24
     state: absent
+
+- name: Set the exact list of peer CIDRs of a VPN connection
+  ic_is_vpn_cidr:
+    gateway: ibmcloud-vpn-gateway-baby
+    connection: ibmcloud-vpn-connection-baby
+    target: peer
+    cidrs:
+      - 10.0.0.0/24
+      - 10.0.1.0/24
+      - 10.1.0.0/16
+    purge: true
 '''
 
 
+def _collapse(networks):
+    return set(str(net) for version in (4, 6)
+               for net in ipaddress.collapse_addresses(
+                   [n for n in networks if n.version == version]))
+
+
+def _run_cidrs(module, vpn):
+    gateway = module.params['gateway']
+    connection = module.params['connection']
+    target = module.params['target']
+    state = module.params['state']
+
+    try:
+        networks = [ipaddress.ip_network(cidr, strict=False)
+                    for cidr in module.params['cidrs']]
+    except ValueError as error:
+        module.fail_json(msg=str(error))
+
+    desired = set(str(net) for net in networks)
+
+    # Each SDK call looks the gateway and the connection up, do it once
+    vpn.get_vpn_gateway = memoize_lookup(vpn.get_vpn_gateway)
+    vpn.get_vpn_gateway_connection = memoize_lookup(
+        vpn.get_vpn_gateway_connection)
+
+    if target == "local":
+        data = vpn.get_vpn_gateway_local_cidrs(gateway, connection)
+    else:
+        data = vpn.get_vpn_gateway_peer_cidrs(gateway, connection)
+    if "errors" in data:
+        module.fail_json(msg=data)
+
+    existing = [ipaddress.ip_network(cidr, strict=False)
+                for cidr in data["{}_cidrs".format(target)]]
+    current = set(str(net) for net in existing)
+
+    # Only rewrite the prefixes when the covered addresses change, the
+    # existing prefixes are kept as they are otherwise
+    if module.params['collapse'] and state == "present":
+        coverage = _collapse(existing)
+        if module.params['purge']:
+            if _collapse(networks) == coverage:
+                desired = current
+            else:
+                desired = _collapse(networks)
+        elif _collapse(existing + networks) == coverage:
+            desired = current
+        else:
+            desired = _collapse(networks)
+
+    if state == "absent":
+        to_add = set()
+        to_remove = desired & current
+    else:
+        to_add = desired - current
+        to_remove = current - desired if module.params['purge'] else set()
+
+    def _apply(job):
+        action, cidr = job
+        prefix_address, prefix_length = cidr.split('/')
+        if action == "add":
+            if target == "local":
+                return vpn.add_local_cidr_connection(
+                    gateway=gateway, connection=connection,
+                    prefix_address=prefix_address,
+                    prefix_length=prefix_length)
+            return vpn.add_peer_cidr_connection(
+                gateway=gateway, connection=connection,
+                prefix_address=prefix_address, prefix_length=prefix_length)
+
+        if target == "local":
+            return vpn.remove_local_cidr(gateway, connection,
+                                         prefix_address, prefix_length)
+        return vpn.remove_peer_cidr(gateway, connection,
+                                    prefix_address, prefix_length)
+
+    # Add the new prefixes before removing the old ones so the traffic
+    # covered by both is never dropped, nothing is removed if an addition
+    # failed
+    limiter = RateLimiter(module.params['rate_limit'])
+    jobs = [("add", cidr) for cidr in sorted(to_add)]
+    results = run_parallel(_apply, jobs, module.params['workers'], limiter)
+    skipped = any(result and "errors" in result for result in results)
+    if not skipped:
+        removals = [("remove", cidr) for cidr in sorted(to_remove)]
+        jobs += removals
+        results += run_parallel(_apply, removals, module.params['workers'],
+                                limiter)
+
+    added = set()
+    removed = set()
+    errors = []
+    for (action, cidr), result in zip(jobs, results):
+        if result and "errors" in result:
+            errors.append({"cidr": cidr, "errors": result["errors"]})
+        elif action == "add":
+            added.add(cidr)
+        else:
+            removed.add(cidr)
+
+    payload = {"target": target, "connection": connection,
+               "added": sorted(added), "removed": sorted(removed),
+               "cidrs": sorted((current | added) - removed)}
+    if errors:
+        if skipped:
+            payload["skipped"] = sorted(to_remove)
+        payload["errors"] = errors
+        module.fail_json(msg=payload)
+
+    module.exit_json(changed=bool(added or removed), msg=payload)
+
+
 def run_module():
     module_args = dict(
         gateway=dict(
@@ -104,7 +263,26 @@ def run_module():
             choices=['local', 'peer']),
         cidr=dict(
             type='str',
-            required=True),
+            required=False),
+        cidrs=dict(
+            type='list',
+            required=False),
+        purge=dict(
+            type='bool',
+            default=False,
+            required=False),
+        collapse=dict(
+            type='bool',
+            default=True,
+            required=False),
+        workers=dict(
+            type='int',
+            default=10,
+            required=False),
+        rate_limit=dict(
+            type='float',
+            default=5,
+            required=False),
         state=dict(
           type='str',
           default='present',
@@ -114,11 +292,16 @@ def run_module():
 
     module = AnsibleModule(
         argument_spec=module_args,
+        required_one_of=[('cidr', 'cidrs')],
+        mutually_exclusive=[('cidr', 'cidrs')],
         supports_check_mode=False
     )
 
     vpn = sdk.Vpn()
 
+    if module.params['cidrs'] is not None:
+        _run_cidrs(module, vpn)
+
     gateway = module.params['gateway']
     connection = module.params['connection']
     target = module.params['target']
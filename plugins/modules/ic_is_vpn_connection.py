@@ -6,6 +6,11 @@
 
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import memoize_lookup
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_vpn import connection_tunnels
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_vpn import gateway_payload
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_vpn import wait_gateway
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import wait_until
 from ibmcloud_python_sdk.vpc import vpn as sdk
 
 
@@ -89,6 +94,20 @@ options:
     description:
       - The preshared key.
     type: str
+  wait:
+    description:
+      - Wait for the VPN gateway to be available before creating the
+        connection, then wait for the connection to be up. The status of
+        each tunnel is returned in C(msg.tunnels).
+      - The connection only comes up once the peer is configured.
+    type: bool
+    default: false
+  wait_timeout:
+    description:
+      - How long to wait in seconds, for the gateway and for the connection
+        each.
+    type: int
+    default: 600
   state:
     description:
       - Should the resource be present or absent.
@@ -109,6 +128,19 @@ EXAMPLES = r'''
       - 10.0.0.0/24
     psk: "@!Il0v3IBMCl0udB4by!@"
 
+- name: Create VPN connection and wait for the tunnels to be up
+  ic_is_vpn_connection:
+    gateway: ibmcloud-vpn-gateway-baby
+    connection: ibmcloud-vpn-connection-baby
+    local_cidrs:
+      - 192.168.0.0/24
+    peer_address: 10.123.12.123
+    peer_cidrs:
+      - 10.0.0.0/24
+    psk: "@!Il0v3IBMCl0udB4by!@"
+    wait: true
+    wait_timeout: 900
+
 - name: Create VPN connection with custom policies and dead peer configuration
   ic_is_vpn_connection:
     gateway: ibmcloud-vpn-gateway-baby
@@ -134,6 +166,32 @@ EXAMPLES = r'''
 '''
 
 
+def _wait(module, vpn, gateway, connection, timeout, changed):
+    # The SDK looks the gateway up on each poll, resolve it only once
+    vpn.get_vpn_gateway = memoize_lookup(vpn.get_vpn_gateway)
+
+    def _ready(result):
+        return "errors" in result or result["status"] == "up"
+
+    result, ready = wait_until(
+        lambda: vpn.get_vpn_gateway_connection_by_id(gateway,
+                                                     connection["id"]),
+        _ready, timeout)
+    if "errors" in result:
+        module.fail_json(msg=result)
+
+    payload = dict(result, tunnels=connection_tunnels(result))
+    if not ready:
+        payload["errors"] = [{
+            "code": "timeout",
+            "message": "VPN connection {} not up after {} seconds, status"
+                       " is {}".format(result["name"], timeout,
+                                       result["status"])}]
+        module.fail_json(changed=changed, msg=payload)
+
+    module.exit_json(changed=changed, msg=payload)
+
+
 def run_module():
     module_args = dict(
         gateway=dict(
@@ -183,6 +241,14 @@ def run_module():
             type='str',
             required=False,
             no_log=True),
+        wait=dict(
+            type='bool',
+            default=False,
+            required=False),
+        wait_timeout=dict(
+            type='int',
+            default=600,
+            required=False),
         state=dict(
             type='str',
             default='present',
@@ -207,6 +273,8 @@ def run_module():
     peer_address = module.params['peer_address']
     peer_cidrs = module.params['peer_cidrs']
     psk = module.params['psk']
+    wait = module.params['wait']
+    wait_timeout = module.params['wait_timeout']
     state = module.params["state"]
 
     check = vpn.get_vpn_gateway_connection(gateway, connection)
@@ -226,8 +294,23 @@ def run_module():
         module.exit_json(changed=False, msg=payload)
     else:
         if "id" in check:
+            if wait:
+                _wait(module, vpn, gateway, check, wait_timeout, False)
             module.exit_json(changed=False, msg=check)
 
+        if wait:
+            gateway_info = vpn.get_vpn_gateway(gateway)
+            if "errors" in gateway_info:
+                module.fail_json(msg=gateway_info)
+
+            gateway_info, available = wait_gateway(vpn, gateway_info["id"],
+                                                   wait_timeout)
+            if "errors" in gateway_info:
+                module.fail_json(msg=gateway_info)
+            if not available:
+                module.fail_json(msg=gateway_payload(gateway_info, available,
+                                                     wait_timeout))
+
         result = vpn.create_connection(
             gateway=gateway,
             name=connection,
@@ -244,6 +327,9 @@ def run_module():
         if "errors" in result:
             module.fail_json(msg=result)
 
+        if wait:
+            _wait(module, vpn, gateway, result, wait_timeout, True)
+
         module.exit_json(changed=True, msg=result)
 
 
@@ -6,6 +6,8 @@
 
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_vpn import gateway_payload
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_vpn import wait_gateway
 from ibmcloud_python_sdk.vpc import vpn as sdk
 
 
@@ -39,6 +41,17 @@ options:
     description:
       - The resource group to use.
     type: str
+  wait:
+    description:
+      - Wait for the VPN gateway and its members to be available. The
+        status of each member is returned in C(msg.members).
+    type: bool
+    default: false
+  wait_timeout:
+    description:
+      - How long to wait in seconds.
+    type: int
+    default: 600
   state:
     description:
       - Should the resource be present or absent.
@@ -53,6 +66,12 @@ EXAMPLES = r'''
     gateway: ibmcloud-vpn-gateway-baby
     subnet: ibmcloud-subnet-baby
 
+- name: Create VPN gateway and wait for it to be available
+  ic_is_vpn_gateway:
+    gateway: ibmcloud-vpn-gateway-baby
+    subnet: ibmcloud-subnet-baby
+    wait: true
+
 - name: Delete VPN gateway
 - ic_is_vpn_gateway:
     gateway: ibmcloud-vpn-gateway-baby
@@ -60,6 +79,18 @@ EXAMPLES = r'''
 '''
 
 
+def _wait(module, vpn, gateway, timeout, changed):
+    result, available = wait_gateway(vpn, gateway["id"], timeout)
+    if "errors" in result:
+        module.fail_json(msg=result)
+
+    payload = gateway_payload(result, available, timeout)
+    if not available:
+        module.fail_json(changed=changed, msg=payload)
+
+    module.exit_json(changed=changed, msg=payload)
+
+
 def run_module():
     module_args = dict(
         gateway=dict(
@@ -71,6 +102,14 @@ def run_module():
         resource_group=dict(
             type='str',
             required=False),
+        wait=dict(
+            type='bool',
+            default=False,
+            required=False),
+        wait_timeout=dict(
+            type='int',
+            default=600,
+            required=False),
         state=dict(
             type='str',
             default='present',
@@ -88,6 +127,8 @@ def run_module():
     gateway = module.params['gateway']
     subnet = module.params['subnet']
     resource_group = module.params['resource_group']
+    wait = module.params['wait']
+    wait_timeout = module.params['wait_timeout']
     state = module.params["state"]
 
     check = vpn.get_vpn_gateway(gateway)
@@ -105,6 +146,8 @@ def run_module():
         module.exit_json(changed=False, msg=payload)
     else:
         if "id" in check:
+            if wait:
+                _wait(module, vpn, check, wait_timeout, False)
             module.exit_json(changed=False, msg=check)
 
         result = vpn.create_gateway(
@@ -116,6 +159,9 @@ def run_module():
         if "errors" in result:
             module.fail_json(msg=result)
 
+        if wait:
+            _wait(module, vpn, result, wait_timeout, True)
+
         module.exit_json(changed=True, msg=result)
 
 
@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+import time
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_job import RESOURCES
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_job import job_state
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_job import snapshot
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import wait_until
+
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = r'''
+---
+module: ic_job_status
+short_description: Follow asynchronous VPC provisioning jobs on IBM Cloud.
+author: Gaëtan Trellu (@goldyfruit)
+version_added: "2.9"
+description:
+  - Check the job handles returned by the creation modules such as
+    M(ic_is_image), M(ic_is_lb) or M(ic_is_baremetal).
+  - Every collection involved is retrieved once per pass whatever the
+    number of jobs.
+requirements:
+  - "ibmcloud-python-sdk"
+options:
+  jobs:
+    description:
+      - Job handles, as returned in C(msg.job) by the creation modules.
+    type: list
+    required: true
+    suboptions:
+      resource_type:
+        description:
+          - Type of the resource.
+        type: str
+        required: true
+        choices: [instance, volume, lb, vpn_gateway, image, baremetal]
+      id:
+        description:
+          - ID of the resource.
+        type: str
+        required: true
+      name:
+        description:
+          - Name of the resource, only used in the result.
+        type: str
+      status:
+        description:
+          - The status expected when the job is done, C(deleted) waits
+            until the resource doesn't exist anymore.
+        type: str
+      created:
+        description:
+          - Time the job was started, in seconds since the epoch. Defaults
+            to the time this task started.
+        type: int
+  wait:
+    description:
+      - Poll until every job is done or failed. Without it a single pass is
+        made and C(finished) tells whether all the jobs are over.
+    type: bool
+    default: false
+  wait_timeout:
+    description:
+      - How long to wait in seconds.
+    type: int
+    default: 3600
+  max_delay:
+    description:
+      - Maximum time in seconds between two passes.
+    type: int
+    default: 60
+  not_found_grace:
+    description:
+      - How long in seconds after its job started a resource which isn't
+        listed yet is still considered pending. Listings are eventually
+        consistent, a resource just created may be missing for a while.
+    type: int
+    default: 120
+notes:
+  - The task fails if any job failed, or if C(wait) is set and some jobs
+    are still running once C(wait_timeout) expired.
+  - A resource which isn't listed once C(not_found_grace) expired, while
+    its job doesn't wait for C(deleted), counts as a failed job.
+'''
+
+EXAMPLES = r'''
+- name: Import many images without waiting
+  ic_is_image:
+    image: "{{ item.name }}"
+    file: "{{ item.file }}"
+    operating_system: ubuntu-18-04-amd64
+  loop: "{{ images }}"
+  register: imports
+
+- name: Wait for all the imports at once
+  ic_job_status:
+    jobs: "{{ imports.results | selectattr('msg.job', 'defined') |
+              map(attribute='msg.job') | list }}"
+    wait: true
+
+- name: Check the jobs from a polling loop
+  ic_job_status:
+    jobs: "{{ imports.results | selectattr('msg.job', 'defined') |
+              map(attribute='msg.job') | list }}"
+  register: jobs
+  until: jobs.msg.finished
+  retries: 60
+  delay: 60
+'''
+
+
+def _check(jobs, resources, started, grace):
+    result = []
+    for job in jobs:
+        _, field, status, _ = RESOURCES[job["resource_type"]]
+        status = job["status"] or status
+
+        item = resources[job["resource_type"]].get(job["id"])
+        current = item[field] if item else "not_found"
+        state = job_state(job["resource_type"], item, status)
+        # A resource just created may not be listed yet, past the grace
+        # period it is gone and won't come back
+        if state == "not_found":
+            since = job["created"] or started
+            state = "failed" if time.time() - since >= grace else "pending"
+
+        result.append({
+            "resource_type": job["resource_type"],
+            "id": job["id"],
+            "name": job["name"] or (item or {}).get("name"),
+            "status": status,
+            "current": current,
+            "done": state == "done",
+            "failed": state == "failed",
+        })
+
+    return result
+
+
+def run_module():
+    module_args = dict(
+        jobs=dict(
+            type='list',
+            options=dict(
+                resource_type=dict(
+                    type='str',
+                    choices=list(RESOURCES),
+                    required=True),
+                id=dict(
+                    type='str',
+                    required=True),
+                name=dict(
+                    type='str',
+                    required=False),
+                status=dict(
+                    type='str',
+                    required=False),
+                created=dict(
+                    type='int',
+                    required=False),
+            ),
+            required=True),
+        wait=dict(
+            type='bool',
+            default=False,
+            required=False),
+        wait_timeout=dict(
+            type='int',
+            default=3600,
+            required=False),
+        max_delay=dict(
+            type='int',
+            default=60,
+            required=False),
+        not_found_grace=dict(
+            type='int',
+            default=120,
+            required=False),
+    )
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=False
+    )
+
+    jobs = module.params['jobs']
+    started = time.time()
+    grace = module.params['not_found_grace']
+
+    def _finished(resources):
+        if "errors" in resources:
+            return True
+        return all(job["done"] or job["failed"]
+                   for job in _check(jobs, resources, started, grace))
+
+    resource_types = [job["resource_type"] for job in jobs]
+    resources, _ = wait_until(
+        lambda: snapshot(resource_types), _finished,
+        module.params['wait_timeout'] if module.params['wait'] else 0,
+        max_delay=module.params['max_delay'])
+    if "errors" in resources:
+        module.fail_json(msg=resources)
+
+    result = _check(jobs, resources, started, grace)
+    payload = {
+        "jobs": result,
+        "done": len([job for job in result if job["done"]]),
+        "failures": len([job for job in result if job["failed"]]),
+        "pending": len([job for job in result
+                        if not job["done"] and not job["failed"]]),
+    }
+    payload["finished"] = not payload["pending"]
+    finished = payload["finished"]
+
+    if payload["failures"] or (module.params['wait'] and not finished):
+        payload["errors"] = [{
+            "code": "failed" if payload["failures"] else "timeout",
+            "message": "{} job(s) failed and {} still running".format(
+                payload["failures"], payload["pending"])}]
+        module.fail_json(msg=payload)
+
+    module.exit_json(changed=False, msg=payload)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_common import list_resources
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_job import RESOURCES
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_job import job_state
+from ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils.ic_wait import wait_until
+
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = r'''
+---
+module: ic_wait_for
+short_description: Wait for many VPC resources on IBM Cloud.
+author: Gaëtan Trellu (@goldyfruit)
+version_added: "2.9"
+description:
+  - Wait until a list of VPC resources reach the expected status.
+  - The whole collection is retrieved once per polling interval and every
+    resource is checked against this snapshot, the interval grows
+    exponentially with jitter.
+requirements:
+  - "ibmcloud-python-sdk"
+options:
+  resource_type:
+    description:
+      - Type of the resources to wait for.
+    type: str
+    required: true
+    choices: [instance, volume, lb, vpn_gateway, image, baremetal]
+  resources:
+    description:
+      - Names or IDs of the resources to wait for.
+      - Names are only unique within a VPC, every resource with the name
+        is waited for.
+    type: list
+    required: true
+  status:
+    description:
+      - The status to wait for, C(deleted) waits until the resources don't
+        exist anymore.
+      - Defaults to C(running) for instances and bare metal servers,
+        C(active) for load balancers and C(available) for the others.
+      - For load balancers this is the C(provisioning_status).
+    type: str
+  wait_timeout:
+    description:
+      - How long to wait in seconds.
+    type: int
+    default: 600
+  max_delay:
+    description:
+      - Maximum time in seconds between two polls.
+    type: int
+    default: 30
+notes:
+  - The result contains the last known document of every resource found,
+    the C(pending) resources which didn't reach the status in time and the
+    C(failures) resources which reached a failure status.
+'''
+
+EXAMPLES = r'''
+- name: Wait for the worker pool to be running
+  ic_wait_for:
+    resource_type: instance
+    resources: "{{ workers.msg.created }}"
+    wait_timeout: 1200
+
+- name: Wait for load balancer to be deleted
+  ic_wait_for:
+    resource_type: lb
+    resources:
+      - ibmcloud-lb-baby
+    status: deleted
+'''
+
+
+def run_module():
+    module_args = dict(
+        resource_type=dict(
+            type='str',
+            choices=list(RESOURCES),
+            required=True),
+        resources=dict(
+            type='list',
+            required=True),
+        status=dict(
+            type='str',
+            required=False),
+        wait_timeout=dict(
+            type='int',
+            default=600,
+            required=False),
+        max_delay=dict(
+            type='int',
+            default=30,
+            required=False),
+    )
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=False
+    )
+
+    resource_type = module.params['resource_type']
+    resources = module.params['resources']
+
+    collection, field, status, _ = RESOURCES[resource_type]
+    status = module.params['status'] or status
+
+    def _snapshot():
+        data = list_resources(collection)
+        if "errors" in data:
+            return data
+
+        # Resources are kept by ID, several may share the same name
+        found = {}
+        for item in data[collection]:
+            for key in set((item["id"], item["name"])):
+                if key in resources:
+                    found.setdefault(key, {})[item["id"]] = item
+        return found
+
+    def _states(snapshot, key):
+        items = list(snapshot.get(key, {}).values()) or [None]
+        return [(item, job_state(resource_type, item, status))
+                for item in items]
+
+    def _ready(snapshot):
+        if "errors" in snapshot:
+            return True
+        # Resources not found yet may still be created under their name
+        return all(state in ("done", "failed") for key in resources
+                   for _, state in _states(snapshot, key))
+
+    snapshot, _ = wait_until(_snapshot, _ready,
+                             module.params['wait_timeout'],
+                             max_delay=module.params['max_delay'])
+    if "errors" in snapshot:
+        module.fail_json(msg=snapshot)
+
+    result = {"resources": [], "pending": [], "failures": []}
+    seen = set()
+    for key in resources:
+        for item, state in _states(snapshot, key):
+            if state == "not_found":
+                result["pending"].append({"resource": key,
+                                          "status": "not_found"})
+                continue
+            if not item or item["id"] in seen:
+                continue
+
+            seen.add(item["id"])
+            result["resources"].append(item)
+            entry = {"resource": key, "id": item["id"],
+                     "status": item[field]}
+            if state == "failed":
+                result["failures"].append(entry)
+            elif state == "pending":
+                result["pending"].append(entry)
+
+    if result["pending"] or result["failures"]:
+        result["errors"] = [{
+            "code": "failed" if result["failures"] else "timeout",
+            "message": "{} resource(s) failed and {} didn't reach status {}"
+                       " in time".format(len(result["failures"]),
+                                         len(result["pending"]), status)}]
+        module.fail_json(msg=result)
+
+    module.exit_json(changed=False, msg=result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
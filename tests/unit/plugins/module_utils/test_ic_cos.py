@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+import hashlib
+
+import pytest
+
+ic_cos = pytest.importorskip(
+    "ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils."
+    "ic_cos")
+
+
+class FakeClient():
+    """Minimal COS client keeping multipart uploads in memory"""
+
+    def __init__(self):
+        self.uploads = {}
+        self.objects = {}
+        self.sent = []
+        self.fail = set()
+        self.count = 0
+
+    def list_multipart_uploads(self, Bucket, Prefix):
+        return {"Uploads": [
+            {"Key": key, "UploadId": upload_id, "Initiated": 1}
+            for upload_id, (key, _, _) in self.uploads.items()
+            if key.startswith(Prefix)]}
+
+    def get_paginator(self, name):
+        client = self
+
+        class Paginator():
+            def paginate(self, Bucket, Key, UploadId):
+                yield {"Parts": [
+                    {"PartNumber": number, "ETag": etag}
+                    for number, (etag, _) in
+                    client.uploads[UploadId][2].items()]}
+
+        return Paginator()
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        self.count += 1
+        upload_id = "upload-{}".format(self.count)
+        self.uploads[upload_id] = (Key, kwargs.get("Metadata", {}), {})
+        return {"UploadId": upload_id}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        del self.uploads[UploadId]
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        if PartNumber in self.fail:
+            raise IOError("part {} failed".format(PartNumber))
+
+        self.sent.append(PartNumber)
+        etag = '"{}"'.format(hashlib.md5(Body).hexdigest())
+        self.uploads[UploadId][2][PartNumber] = (etag, Body)
+        return {"ETag": etag}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId,
+                                  MultipartUpload):
+        key, metadata, parts = self.uploads.pop(UploadId)
+        self.objects[key] = {
+            "Body": b"".join(parts[part["PartNumber"]][1]
+                             for part in MultipartUpload["Parts"]),
+            "Metadata": metadata,
+        }
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(ic_cos, "MIN_PART_SIZE", 4)
+    monkeypatch.setattr(ic_cos, "backoff_delays", lambda: iter([0] * 10))
+    return tmp_path
+
+
+def _upload(client, path, retries=1):
+    md5 = hashlib.md5(path.read_bytes()).hexdigest()
+    return ic_cos.multipart_upload(client, "bucket", "key", str(path), 4,
+                                   workers=2, retries=retries, md5=md5)
+
+
+def test_resume_unchanged_file(home):
+    path = home / "file"
+    path.write_bytes(b"aaaabbbbcccc")
+    client = FakeClient()
+    client.fail = {3}
+
+    assert "errors" in _upload(client, path)
+
+    client.fail = set()
+    client.sent = []
+    result = _upload(client, path)
+
+    assert result["resumed_parts"] == 2
+    assert client.sent == [3]
+    assert client.objects["key"]["Metadata"]["md5"] == \
+        hashlib.md5(b"aaaabbbbcccc").hexdigest()
+
+
+def test_resume_after_file_changed(home):
+    path = home / "file"
+    path.write_bytes(b"aaaabbbbcccc")
+    client = FakeClient()
+    client.fail = {3}
+
+    assert "errors" in _upload(client, path)
+
+    # Same committed parts, only the part which wasn't sent changed
+    path.write_bytes(b"aaaabbbbdddd")
+    client.fail = set()
+    client.sent = []
+    result = _upload(client, path)
+
+    assert result["resumed_parts"] == 0
+    assert sorted(client.sent) == [1, 2, 3]
+    assert not client.uploads
+    assert client.objects["key"]["Body"] == b"aaaabbbbdddd"
+    assert client.objects["key"]["Metadata"]["md5"] == \
+        hashlib.md5(b"aaaabbbbdddd").hexdigest()
+
+
+def test_resume_after_committed_part_changed(home):
+    path = home / "file"
+    path.write_bytes(b"aaaabbbbcccc")
+    client = FakeClient()
+    client.fail = {3}
+
+    assert "errors" in _upload(client, path)
+
+    path.write_bytes(b"xxxxbbbbcccc")
+    client.fail = set()
+    result = ic_cos.multipart_upload(client, "bucket", "key", str(path), 4,
+                                     workers=2, retries=1)
+
+    assert result["resumed_parts"] == 0
+    assert client.objects["key"]["Body"] == b"xxxxbbbbcccc"
+
+
+class CopyClient(FakeClient):
+    """Fake client recording the arguments of the copy requests"""
+
+    def copy_object(self, **kwargs):
+        self.copied = kwargs
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        self.copied = kwargs
+        return FakeClient.create_multipart_upload(self, Bucket, Key,
+                                                  **kwargs)
+
+    def upload_part_copy(self, **kwargs):
+        return {"CopyPartResult": {"ETag": '"etag"'}}
+
+    def complete_multipart_upload(self, **kwargs):
+        pass
+
+
+@pytest.mark.parametrize("size", [8, 64])
+def test_copy_keeps_content_headers(size):
+    client = CopyClient()
+    head = {"ContentLength": size, "ETag": '"0123"', "Metadata": {"a": "b"},
+            "ContentType": "application/x-qemu-disk",
+            "CacheControl": "no-cache"}
+
+    result = ic_cos.copy_object(client, "staging", "key", "prod", "key",
+                                head, 16, 32)
+
+    assert "errors" not in result
+    assert client.copied["ContentType"] == "application/x-qemu-disk"
+    assert client.copied["CacheControl"] == "no-cache"
+    assert client.copied["Metadata"] == {"a": "b", "md5": "0123"}
+    assert "ContentEncoding" not in client.copied
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+import tempfile
+
+import pytest
+
+ic_lb = pytest.importorskip(
+    "ansible_collections.goldyfruit.ibmcloud_automation.plugins.module_utils."
+    "ic_lb")
+
+
+class FakeLoadbalancer():
+    """Minimal load balancer always accepting changes"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_lb(self, lb):
+        return {"id": "r006-lb"}
+
+    def get_lb_by_id(self, lb_id):
+        return {"id": lb_id, "provisioning_status": "active"}
+
+    def change(self):
+        self.calls.append("change")
+        return {"id": "r006-member"}
+
+
+@pytest.fixture
+def loadbalancer(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    return FakeLoadbalancer()
+
+
+def test_create_missing(loadbalancer):
+    result, changed = ic_lb.lb_mutate(
+        loadbalancer, "lb", 10, loadbalancer.change,
+        lambda: {"errors": [{"code": "not_found"}]})
+
+    assert changed
+    assert result == {"id": "r006-member"}
+    assert loadbalancer.calls == ["change"]
+
+
+def test_create_skipped_when_existing(loadbalancer):
+    result, changed = ic_lb.lb_mutate(
+        loadbalancer, "lb", 10, loadbalancer.change,
+        lambda: {"id": "r006-other"})
+
+    assert not changed
+    assert result == {"id": "r006-other"}
+    assert loadbalancer.calls == []
+
+
+def test_delete_existing(loadbalancer):
+    result, changed = ic_lb.lb_mutate(
+        loadbalancer, "lb", 10, loadbalancer.change,
+        lambda: {"id": "r006-member"}, present=False)
+
+    assert changed
+    assert loadbalancer.calls == ["change"]
+
+
+def test_delete_skipped_when_missing(loadbalancer):
+    result, changed = ic_lb.lb_mutate(
+        loadbalancer, "lb", 10, loadbalancer.change,
+        lambda: {"errors": [{"code": "not_found"}]}, present=False)
+
+    assert not changed
+    assert result == {}
+    assert loadbalancer.calls == []
+
+
+def test_without_check(loadbalancer):
+    result, changed = ic_lb.lb_mutate(
+        loadbalancer, "lb", 10, loadbalancer.change)
+
+    assert changed
+    assert loadbalancer.calls == ["change"]